@@ -1,48 +1,92 @@
 import os
 import json
 import uuid
-import io
 import asyncio
-import threading
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from typing import Optional
 
 import boto3
 from dotenv import load_dotenv
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Header, Response, Query
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Header, Response, Query, Request, WebSocket
 from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from supabase import create_client, Client
 
 # ASR provider selection (environment variable)
-def get_asr_provider():
-    """Get ASR provider based on environment variable
+def get_asr_provider(provider_name: Optional[str] = None):
+    """Get ASR provider based on environment variable (or by name, for pending async jobs)
 
     Supported providers:
     - speechmatics (default): High accuracy speaker diarization
     - deepgram: Fast processing
-    """
-    provider_name = os.getenv("ASR_PROVIDER", "speechmatics").lower()
+    - google: Google Cloud Speech-to-Text (BatchRecognize for long audio with GOOGLE_SPEECH_GCS_BUCKET)
+    - stub: Local stub server (stub_asr_server.py) for development
 
-    if provider_name == "deepgram":
-        from services.asr_provider import DeepgramASRService
-        return DeepgramASRService()
-    elif provider_name == "speechmatics":
-        from services.asr_providers.speechmatics_provider import SpeechmaticsASRService
-        return SpeechmaticsASRService()
-    else:
-        raise ValueError(f"Unknown ASR provider: {provider_name}. Supported: deepgram, speechmatics")
+    Instances are shared process-wide (pooled connections), see asr_registry.
+    """
+    return asr_registry.get(provider_name)
 
 from services.llm_providers import get_current_llm, LLMFactory, CURRENT_PROVIDER, CURRENT_MODEL
 from services.llm_models import get_model_catalog
 from services.plan_rules import build_display_rows
+from services.job_queue import JobQueue, JobQueueFull, JobContext
+from services.phase_io import get_phase_io_stats, with_content_versions
+from services.llm_cache import LLMResponseCache
+from services.session_events import session_event_bus
+from services.audio_source import get_audio_source_stats
+from services.audio_preprocess import get_preprocess_stats
+from services.segmented_asr import get_segmented_stats
+from services.asr_cache import get_asr_cache_stats
+from services.asr_jobs import ASR_ASYNC_JOBS, ASRJobMonitor, verify_callback_signature
+from services.asr_providers.registry import asr_registry
+from services.realtime_drafts import (
+    REALTIME_DRAFT_REFINE,
+    count_draft,
+    delete_realtime_draft,
+    draft_session_columns,
+    draft_version,
+    fetch_realtime_draft,
+    get_realtime_draft_stats,
+    load_realtime_draft,
+    parse_draft_id,
+    transcript_draft,
+)
+from services.recording_stream import RecordingUploadChannel, get_recording_stream_stats, is_uuid, recording_s3_key
+from services.s3_multipart import MultipartUpload, aupload_stream, get_multipart_stats
+from services.realtime_transcription import (
+    REALTIME_TRANSCRIBE_MODEL,
+    RealtimeChannel,
+    is_invalid_chunk_error,
+    realtime_transcriber,
+)
 
 # Load environment variables
 load_dotenv()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Start pipeline job workers and re-claim jobs abandoned by a previous process
+    if job_queue:
+        job_queue.start()
+    # Finalize async ASR jobs (shared poller; callbacks arrive at /api/asr/callback)
+    if asr_job_monitor:
+        asr_job_monitor.start()
+    yield
+    if asr_job_monitor:
+        await asr_job_monitor.stop()
+    # Close pooled ASR clients while the job loop still runs (its clients close there)
+    await asr_registry.aclose()
+    await realtime_transcriber.aclose()
+    if job_queue:
+        job_queue.stop()
+
+
 # Initialize FastAPI
-app = FastAPI(title="WatchMe Business API", version="1.0.0")
+app = FastAPI(title="WatchMe Business API", version="1.0.0", lifespan=lifespan)
 
 # CORS settings
 app.add_middleware(
@@ -68,7 +112,6 @@ S3_BUCKET = os.getenv("S3_BUCKET", "watchme-business")
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")  # Use service_role key for backend
 API_TOKEN = os.getenv("API_TOKEN", "watchme-b2b-poc-2025")
-REALTIME_TRANSCRIBE_MODEL = os.getenv("REALTIME_TRANSCRIBE_MODEL", "gpt-4o-mini-transcribe")
 SQS_TRANSCRIPTION_QUEUE_URL = os.getenv(
     "SQS_TRANSCRIPTION_QUEUE_URL",
     "https://sqs.ap-southeast-2.amazonaws.com/754724220380/business-transcription-completed-queue.fifo"
@@ -78,9 +121,46 @@ SQS_ANALYSIS_QUEUE_URL = os.getenv(
     "https://sqs.ap-southeast-2.amazonaws.com/754724220380/business-analysis-completed-queue.fifo"
 )
 
+# Pipeline job queue settings (per-process)
+# All job types run as coroutines on one shared event loop (no thread per job)
+JOB_CONCURRENCY_TRANSCRIBE = int(os.getenv("JOB_CONCURRENCY_TRANSCRIBE", "2"))
+JOB_CONCURRENCY_ANALYZE = int(os.getenv("JOB_CONCURRENCY_ANALYZE", "8"))
+JOB_CONCURRENCY_STRUCTURE_FACTS = int(os.getenv("JOB_CONCURRENCY_STRUCTURE_FACTS", "8"))
+JOB_CONCURRENCY_ASSESS = int(os.getenv("JOB_CONCURRENCY_ASSESS", "8"))
+JOB_QUEUE_MAX_PENDING = int(os.getenv("JOB_QUEUE_MAX_PENDING", "20"))
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "120"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+
+# LLM response cache settings
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_MAX_MEMORY_MB = int(os.getenv("LLM_CACHE_MAX_MEMORY_MB", "32"))
+LLM_CACHE_TTL_DAYS = int(os.getenv("LLM_CACHE_TTL_DAYS", "30"))
+
+# Session events (SSE) settings
+SSE_KEEPALIVE_SECONDS = int(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
+# Events are published in the process running the job; with several workers a
+# cheap status read catches transitions that happened in another process
+SSE_RECONCILE_SECONDS = int(os.getenv("SSE_RECONCILE_SECONDS", "30"))
+
 # Initialize services
 s3_client = boto3.client('s3', region_name=AWS_REGION)
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY) if SUPABASE_URL and SUPABASE_KEY else None
+job_queue: Optional[JobQueue] = JobQueue(
+    supabase,
+    max_pending=JOB_QUEUE_MAX_PENDING,
+    lease_seconds=JOB_LEASE_SECONDS,
+    max_attempts=JOB_MAX_ATTEMPTS
+) if supabase else None
+llm_cache: Optional[LLMResponseCache] = LLMResponseCache(
+    supabase,
+    max_memory_bytes=LLM_CACHE_MAX_MEMORY_MB * 1024 * 1024,
+    ttl_days=LLM_CACHE_TTL_DAYS
+) if LLM_CACHE_ENABLED else None
+asr_job_monitor: Optional[ASRJobMonitor] = ASRJobMonitor(
+    supabase,
+    get_asr_provider,
+    SQS_TRANSCRIPTION_QUEUE_URL
+) if supabase and ASR_ASYNC_JOBS else None
 
 # Pydantic models
 class UploadResponse(BaseModel):
@@ -88,6 +168,16 @@ class UploadResponse(BaseModel):
     session_id: str
     s3_path: str
     message: str
+    analysis_started: bool = False   # True when the session was created from a realtime draft
+
+class RecordingFinalizeRequest(BaseModel):
+    draft_id: str                    # Recording streamed over /ws/recordings/stream
+    facility_id: str
+    subject_id: str
+    support_plan_id: Optional[str] = None
+    staff_id: Optional[str] = None
+    attendees: Optional[dict] = None
+    duration_seconds: Optional[int] = None
 
 class TranscribeRequest(BaseModel):
     session_id: str
@@ -119,6 +209,7 @@ class AnalyzeRequest(BaseModel):
     provider: Optional[str] = None   # LLM provider ("openai", "gemini")
     model: Optional[str] = None      # Model name (e.g., "gpt-4o", "gpt-5.2-2025-12-11")
     custom_prompt: Optional[str] = None
+    use_cache: bool = True           # If False, always call the LLM (bypass response cache)
 
 
 class PromptUpdate(BaseModel):
@@ -236,6 +327,179 @@ def resolve_llm_service(request: AnalyzeRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to initialize LLM: {str(e)}")
 
+
+def build_llm_job_payload(request: AnalyzeRequest) -> dict:
+    """Validate LLM settings and return them as a serializable job payload."""
+    resolve_llm_service(request)
+    return {
+        'provider': (request.provider or CURRENT_PROVIDER).lower(),
+        'model': request.model or CURRENT_MODEL,
+        'use_custom_prompt': request.use_custom_prompt,
+        'use_cache': request.use_cache,
+    }
+
+
+def submit_pipeline_job(job_type: str, session_id: str, payload: dict, started_message: str) -> Response:
+    """Queue a pipeline job and return the 202 Accepted response."""
+    try:
+        job, created = job_queue.submit(job_type, session_id, payload)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+
+    message = started_message if created else f"{started_message} (already in progress)"
+    print(f"{message} for session: {session_id} (job: {job['id']})")
+
+    return Response(
+        status_code=202,
+        content=json.dumps({"status": "processing", "message": message, "job_id": job['id']}),
+        media_type="application/json"
+    )
+
+
+# ==================== PIPELINE JOB HANDLERS ====================
+
+async def run_transcribe_job(job: JobContext):
+    from services.background_tasks import atranscribe_background
+
+    await atranscribe_background(
+        job.session_id,
+        job.payload['s3_audio_path'],
+        s3_client,
+        S3_BUCKET,
+        supabase,
+        get_asr_provider(),
+        SQS_TRANSCRIPTION_QUEUE_URL,
+        job=job,
+        refine_draft=job.payload.get('refine_draft', False)
+    )
+
+
+def create_job_llm_service(payload: dict):
+    """Create the LLM provider for a job, wrapped with the response cache unless opted out."""
+    llm_service = LLMFactory.create(payload['provider'], payload['model'])
+    if llm_cache and payload.get('use_cache', True):
+        return llm_cache.wrap(llm_service)
+    return llm_service
+
+
+async def run_analyze_job(job: JobContext):
+    from services.background_tasks import aanalyze_background
+
+    payload = job.payload
+    await aanalyze_background(
+        job.session_id,
+        supabase,
+        create_job_llm_service(payload),
+        SQS_ANALYSIS_QUEUE_URL,
+        payload.get('use_custom_prompt', False),
+        payload.get('auto_chain', True),
+        job=job
+    )
+
+
+async def run_structure_facts_job(job: JobContext):
+    from services.background_tasks import astructure_facts_background
+
+    payload = job.payload
+    await astructure_facts_background(
+        job.session_id,
+        supabase,
+        create_job_llm_service(payload),
+        payload.get('use_custom_prompt', False)
+    )
+
+
+async def run_assess_job(job: JobContext):
+    from services.background_tasks import aassess_background
+
+    payload = job.payload
+    await aassess_background(
+        job.session_id,
+        supabase,
+        create_job_llm_service(payload),
+        payload.get('use_custom_prompt', False)
+    )
+
+
+def mark_job_abandoned(job: dict):
+    """Surface an abandoned job on the session (status 'failed' only for the standard route)."""
+    update_data = {
+        'error_message': f"{job['job_type']} job abandoned after {job.get('attempts')} attempts",
+        'updated_at': datetime.now().isoformat()
+    }
+    if job['job_type'] in ('transcribe', 'analyze'):
+        update_data['status'] = 'failed'
+    supabase.table('business_interview_sessions').update(update_data).eq('id', job['session_id']).execute()
+
+
+def build_session_data(
+    session_id: str,
+    facility_id: str,
+    subject_id: str,
+    s3_path: str,
+    duration_seconds: Optional[int] = None,
+    support_plan_id: Optional[str] = None,
+    staff_id: Optional[str] = None
+) -> dict:
+    """business_interview_sessions row of a new recording (status: uploaded)"""
+    session_data = {
+        'id': session_id,
+        'facility_id': facility_id,
+        'subject_id': subject_id,
+        's3_audio_path': s3_path,
+        'status': 'uploaded',
+        'duration_seconds': duration_seconds or 0,
+        'recorded_at': datetime.now(timezone.utc).isoformat()
+    }
+
+    # Add support_plan_id if provided
+    if support_plan_id:
+        session_data['support_plan_id'] = support_plan_id
+
+    # Add staff_id if provided (from authenticated user)
+    if staff_id:
+        session_data['staff_id'] = staff_id
+
+    return session_data
+
+
+def start_draft_analysis(session_id: str) -> bool:
+    """
+    Queue the analyze job of a session created from a realtime draft (blocking)
+
+    If the job cannot be queued, the session goes back to 'uploaded' so the
+    batch route (S3 event -> /api/transcribe -> SQS -> /api/analyze) handles it.
+    """
+    try:
+        if not job_queue:
+            raise RuntimeError("Job queue not configured")
+        payload = build_llm_job_payload(AnalyzeRequest(session_id=session_id))
+        payload['auto_chain'] = True
+        job, _ = job_queue.submit('analyze', session_id, payload)
+    except Exception as e:
+        detail = e.detail if isinstance(e, HTTPException) else str(e)
+        print(f"[RealtimeDraft] Could not start analysis for session {session_id}, using batch ASR: {detail}")
+        count_draft('errors')
+        supabase.table('business_interview_sessions').update(with_content_versions({
+            'transcription': None,
+            'transcription_metadata': None,
+            'status': 'uploaded',
+            'updated_at': datetime.now().isoformat()
+        })).eq('id', session_id).execute()
+        return False
+
+    count_draft('used')
+    print(f"[RealtimeDraft] Analysis started from realtime draft for session: {session_id} (job: {job['id']})")
+    return True
+
+
+if job_queue:
+    job_queue.register('transcribe', run_transcribe_job, JOB_CONCURRENCY_TRANSCRIBE, mark_job_abandoned)
+    job_queue.register('analyze', run_analyze_job, JOB_CONCURRENCY_ANALYZE, mark_job_abandoned)
+    job_queue.register('structure_facts', run_structure_facts_job, JOB_CONCURRENCY_STRUCTURE_FACTS, mark_job_abandoned)
+    job_queue.register('assess', run_assess_job, JOB_CONCURRENCY_ASSESS, mark_job_abandoned)
+
+
 @app.get("/health")
 async def health_check():
     return {
@@ -264,6 +528,7 @@ async def upload_audio(
     staff_id: Optional[str] = Form(None),
     attendees: Optional[str] = Form(None),
     duration_seconds: Optional[int] = Form(None),
+    draft_id: Optional[str] = Form(None),
     x_api_token: str = Header(None, alias="X-API-Token")
 ):
     # Validate token
@@ -277,39 +542,19 @@ async def upload_audio(
     try:
         # Generate session ID and S3 path
         session_id = str(uuid.uuid4())
-        timestamp = datetime.now().strftime('%Y-%m-%d')
-        s3_path = f"recordings/{facility_id}/{subject_id}/{timestamp}/{session_id}.webm"
+        s3_path = recording_s3_key(facility_id, subject_id, session_id)
 
-        # Read file content
-        file_content = await audio.read()
+        analysis_started = False
 
-        # Upload to S3
-        s3_client.put_object(
-            Bucket=S3_BUCKET,
-            Key=s3_path,
-            Body=file_content,
-            ContentType=audio.content_type
-        )
+        # Stream the (spooled) file to S3 part by part in threads: the loop keeps
+        # serving other requests and memory stays at a few parts per upload
+        await aupload_stream(s3_client, S3_BUCKET, s3_path, audio.read, audio.content_type)
 
         # Save to database
         if supabase:
-            session_data = {
-                'id': session_id,
-                'facility_id': facility_id,
-                'subject_id': subject_id,
-                's3_audio_path': s3_path,
-                'status': 'uploaded',
-                'duration_seconds': duration_seconds or 0,
-                'recorded_at': datetime.now(timezone.utc).isoformat()
-            }
-
-            # Add support_plan_id if provided
-            if support_plan_id:
-                session_data['support_plan_id'] = support_plan_id
-
-            # Add staff_id if provided (from authenticated user)
-            if staff_id:
-                session_data['staff_id'] = staff_id
+            session_data = build_session_data(
+                session_id, facility_id, subject_id, s3_path, duration_seconds, support_plan_id, staff_id
+            )
 
             # Add attendees if provided (JSON string)
             if attendees:
@@ -318,18 +563,161 @@ async def upload_audio(
                 except json.JSONDecodeError:
                     raise HTTPException(status_code=400, detail="Invalid attendees JSON")
 
-            supabase.table('business_interview_sessions').insert(session_data).execute()
+            # Transcribed during recording (services/realtime_drafts.py): analyze without waiting for batch ASR
+            draft_id = parse_draft_id(draft_id)
+            draft = await asyncio.to_thread(load_realtime_draft, supabase, draft_id) if draft_id else None
+            if draft:
+                session_data.update(draft_session_columns(draft))
+
+            await asyncio.to_thread(
+                lambda: supabase.table('business_interview_sessions').insert(session_data).execute()
+            )
+
+            if draft:
+                analysis_started = await asyncio.to_thread(start_draft_analysis, session_id)
+                await asyncio.to_thread(delete_realtime_draft, supabase, draft_id)
 
         return UploadResponse(
             success=True,
             session_id=session_id,
             s3_path=s3_path,
-            message="Audio uploaded successfully"
+            message="Audio uploaded; analysis started from the realtime transcript" if analysis_started
+            else "Audio uploaded successfully",
+            analysis_started=analysis_started
         )
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
+
+@app.websocket("/ws/recordings/stream")
+async def stream_recording(
+    websocket: WebSocket,
+    token: Optional[str] = Query(None),
+    draft_id: Optional[str] = Query(None),
+    facility_id: Optional[str] = Query(None),
+    subject_id: Optional[str] = Query(None),
+    content_type: Optional[str] = Query("audio/webm")
+):
+    """
+    Stream a recording into S3 while it is recorded (protocol:
+    services/recording_stream.py); POST /api/recordings/finalize then creates
+    the session without a second upload. Token as ?token= (browser WebSocket).
+    """
+    if token != API_TOKEN:
+        await websocket.close(code=1008, reason="Invalid API token")
+        return
+    if not supabase:
+        await websocket.close(code=1011, reason="Database not configured")
+        return
+    # The ids become part of the S3 key
+    if not all(is_uuid(value) for value in (draft_id, facility_id, subject_id)):
+        await websocket.close(code=1008, reason="draft_id, facility_id and subject_id must be UUIDs")
+        return
+    if not (content_type or '').startswith('audio/'):
+        await websocket.close(code=1008, reason="Recording must be audio format")
+        return
+
+    draft_id = str(uuid.UUID(draft_id))
+    await websocket.accept()
+    await RecordingUploadChannel(
+        websocket,
+        s3_client,
+        S3_BUCKET,
+        supabase,
+        draft_id,
+        recording_s3_key(facility_id, subject_id, draft_id),
+        content_type
+    ).run()
+
+
+@app.post("/api/recordings/finalize", response_model=UploadResponse)
+async def finalize_recording(
+    request: RecordingFinalizeRequest,
+    x_api_token: str = Header(None, alias="X-API-Token")
+):
+    """
+    Create the session of a recording streamed over /ws/recordings/stream
+
+    Completes the multipart upload into the recording key (session id = draft
+    id) and, with a realtime transcript draft, starts analysis at once like
+    /api/upload. 409 when the recording was not stored completely: the client
+    uploads it with /api/upload instead. Retrying after success returns the
+    session.
+    """
+    if x_api_token != API_TOKEN:
+        raise HTTPException(status_code=401, detail="Invalid API token")
+
+    if not supabase:
+        raise HTTPException(status_code=500, detail="Database not configured")
+
+    if not is_uuid(request.draft_id):
+        raise HTTPException(status_code=400, detail="Invalid draft_id")
+    session_id = str(uuid.UUID(request.draft_id))
+
+    existing = await asyncio.to_thread(
+        lambda: supabase.table('business_interview_sessions').select('id, s3_audio_path').eq('id', session_id).execute()
+    )
+    if existing.data:
+        return UploadResponse(
+            success=True,
+            session_id=session_id,
+            s3_path=existing.data[0]['s3_audio_path'],
+            message="Recording already finalized"
+        )
+
+    draft = await asyncio.to_thread(fetch_realtime_draft, supabase, session_id)
+    upload_state = (draft or {}).get('recording_upload') or {}
+    if not upload_state.get('complete'):
+        raise HTTPException(status_code=409, detail="Recording was not stored; upload it with /api/upload")
+
+    s3_path = upload_state['key']
+    if not s3_path.startswith(f"recordings/{request.facility_id}/{request.subject_id}/"):
+        raise HTTPException(status_code=400, detail="Recording belongs to another facility or subject")
+
+    try:
+        session_data = build_session_data(
+            session_id,
+            request.facility_id,
+            request.subject_id,
+            s3_path,
+            request.duration_seconds,
+            request.support_plan_id,
+            request.staff_id
+        )
+        if request.attendees is not None:
+            session_data['attendees'] = request.attendees
+        transcript = transcript_draft(draft)
+        if transcript:
+            session_data.update(draft_session_columns(transcript))
+
+        # Session row first: completing the upload fires the S3 event, whose Lambda looks it up
+        await asyncio.to_thread(
+            lambda: supabase.table('business_interview_sessions').insert(session_data).execute()
+        )
+        try:
+            await asyncio.to_thread(MultipartUpload.from_state(s3_client, S3_BUCKET, upload_state).complete)
+        except Exception:
+            await asyncio.to_thread(
+                lambda: supabase.table('business_interview_sessions').delete().eq('id', session_id).execute()
+            )
+            raise
+
+        analysis_started = await asyncio.to_thread(start_draft_analysis, session_id) if transcript else False
+        await asyncio.to_thread(delete_realtime_draft, supabase, session_id)
+
+        return UploadResponse(
+            success=True,
+            session_id=session_id,
+            s3_path=s3_path,
+            message="Recording finalized; analysis started from the realtime transcript" if analysis_started
+            else "Recording finalized",
+            analysis_started=analysis_started
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Finalize failed: {str(e)}")
+
 @app.post("/api/transcribe")
 async def transcribe_audio(
     request: TranscribeRequest,
@@ -371,32 +759,22 @@ async def transcribe_audio(
         if not s3_audio_path:
             raise HTTPException(status_code=400, detail="No audio file path found")
 
-        # Start background task
-        from services.background_tasks import transcribe_background
-
-        asr_service = get_asr_provider()
-
-        thread = threading.Thread(
-            target=transcribe_background,
-            args=(
-                request.session_id,
-                s3_audio_path,
-                s3_client,
-                S3_BUCKET,
-                supabase,
-                asr_service,
-                SQS_TRANSCRIPTION_QUEUE_URL
-            )
-        )
-        thread.daemon = True
-        thread.start()
-
-        print(f"Started background transcription for session: {request.session_id}")
-
-        return Response(
-            status_code=202,
-            content='{"status": "processing", "message": "Transcription started"}',
-            media_type="application/json"
+        # Transcribed from a realtime draft and already analyzing: batch ASR only refines the transcription
+        refine_draft = draft_version(session) is not None
+        if refine_draft and not REALTIME_DRAFT_REFINE:
+            return {"status": "skipped", "message": "Session was transcribed from a realtime draft"}
+
+        # Validate ASR provider settings before queueing
+        get_asr_provider()
+
+        payload = {'s3_audio_path': s3_audio_path}
+        if refine_draft:
+            payload['refine_draft'] = True
+        return submit_pipeline_job(
+            'transcribe',
+            request.session_id,
+            payload,
+            "Draft refinement started" if refine_draft else "Transcription started"
         )
 
     except HTTPException:
@@ -404,6 +782,41 @@ async def transcribe_audio(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to start transcription: {str(e)}")
 
+@app.post("/api/asr/callback/{session_id}")
+async def asr_job_callback(
+    session_id: str,
+    request: Request,
+    sig: str = Query(None)
+):
+    """
+    Completion callback of an async ASR job (called by the ASR provider)
+
+    Authenticated by the per-session signature embedded in the callback URL.
+    """
+    if not verify_callback_signature(session_id, sig):
+        raise HTTPException(status_code=401, detail="Invalid callback signature")
+    if not asr_job_monitor:
+        raise HTTPException(status_code=503, detail="Async ASR jobs are not enabled")
+
+    try:
+        payload = await request.json()
+    except ValueError:
+        payload = {}
+    if not isinstance(payload, dict):
+        payload = {}
+    query = {key: value for key, value in request.query_params.items() if key != 'sig'}
+
+    try:
+        outcome = await asr_job_monitor.handle_callback(session_id, payload, query)
+    except Exception as e:
+        # Non-2xx makes the provider retry the callback; the poller is the fallback
+        print(f"[ASRJobs] Callback for session {session_id} failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to finalize transcription: {str(e)}")
+
+    print(f"[ASRJobs] Callback for session {session_id}: {outcome}")
+    return {"status": outcome}
+
+
 @app.post("/api/transcribe/realtime", response_model=RealtimeTranscribeResponse)
 async def transcribe_realtime_chunk(
     audio: UploadFile = File(...),
@@ -414,6 +827,9 @@ async def transcribe_realtime_chunk(
 ):
     """
     Lightweight near-realtime transcription endpoint for recording UX.
+
+    One chunk per request; the recording screen uses /ws/transcribe/realtime
+    and falls back to this endpoint when the WebSocket is unavailable.
     """
     if x_api_token != API_TOKEN:
         raise HTTPException(status_code=401, detail="Invalid API token")
@@ -421,8 +837,7 @@ async def transcribe_realtime_chunk(
     if not audio.content_type or not audio.content_type.startswith('audio/'):
         raise HTTPException(status_code=400, detail="File must be audio format")
 
-    openai_api_key = os.getenv("OPENAI_API_KEY")
-    if not openai_api_key:
+    if not realtime_transcriber.configured:
         raise HTTPException(status_code=500, detail="OPENAI_API_KEY environment variable not set")
 
     try:
@@ -436,26 +851,13 @@ async def transcribe_realtime_chunk(
                 message="Empty audio chunk"
             )
 
-        def _transcribe() -> str:
-            from openai import OpenAI
-
-            client = OpenAI(api_key=openai_api_key)
-            file_obj = io.BytesIO(file_content)
-            file_obj.name = audio.filename or "chunk.webm"
-
-            request_data = {
-                "model": REALTIME_TRANSCRIBE_MODEL,
-                "file": file_obj,
-            }
-            if language:
-                request_data["language"] = language
-            if prompt and prompt.strip():
-                request_data["prompt"] = prompt.strip()
-
-            response = client.audio.transcriptions.create(**request_data)
-            return (response.text or "").strip()
-
-        text = await asyncio.to_thread(_transcribe)
+        # Shared pooled client (services/realtime_transcription.py)
+        text = await realtime_transcriber.transcribe(
+            file_content,
+            audio.filename or "chunk.webm",
+            language,
+            prompt
+        )
 
         return RealtimeTranscribeResponse(
             success=True,
@@ -471,8 +873,7 @@ async def transcribe_realtime_chunk(
         print(f"Realtime transcription error: {error_text}")
 
         # Keep recording UX resilient: skip invalid realtime chunks instead of failing hard.
-        lowered = error_text.lower()
-        if "corrupted or unsupported" in lowered or "invalid_value" in lowered:
+        if is_invalid_chunk_error(e):
             return RealtimeTranscribeResponse(
                 success=True,
                 text="",
@@ -483,6 +884,41 @@ async def transcribe_realtime_chunk(
 
         raise HTTPException(status_code=500, detail=f"Realtime transcription failed: {error_text}")
 
+
+@app.websocket("/ws/transcribe/realtime")
+async def transcribe_realtime_stream(
+    websocket: WebSocket,
+    token: Optional[str] = Query(None),
+    language: Optional[str] = Query("ja"),
+    prompt: Optional[str] = Query(None),
+    draft_id: Optional[str] = Query(None)
+):
+    """
+    Realtime transcription over one WebSocket per recording
+
+    Binary frames are audio chunks; transcripts come back in chunk order with
+    up to REALTIME_CHUNKS_IN_FLIGHT chunks in flight (protocol:
+    services/realtime_transcription.py). Browsers cannot set headers on a
+    WebSocket, so the token is passed as ?token=. With ?draft_id= the
+    transcript is kept as a session draft for /api/upload (realtime_drafts.py).
+    """
+    if token != API_TOKEN:
+        await websocket.close(code=1008, reason="Invalid API token")
+        return
+    if not realtime_transcriber.configured:
+        await websocket.close(code=1011, reason="OPENAI_API_KEY environment variable not set")
+        return
+
+    await websocket.accept()
+    await RealtimeChannel(
+        websocket,
+        realtime_transcriber,
+        language,
+        prompt,
+        draft_id=parse_draft_id(draft_id),
+        supabase=supabase
+    ).run()
+
 @app.post("/api/analyze")
 async def analyze_interview(
     request: AnalyzeRequest,
@@ -527,32 +963,10 @@ async def analyze_interview(
                 'updated_at': datetime.now().isoformat()
             }).eq('id', request.session_id).execute()
 
-        # Start background task
-        from services.background_tasks import analyze_background
-
-        llm_service = resolve_llm_service(request)
+        payload = build_llm_job_payload(request)
+        payload['auto_chain'] = request.auto_chain
 
-        thread = threading.Thread(
-            target=analyze_background,
-            args=(
-                request.session_id,
-                supabase,
-                llm_service,
-                SQS_ANALYSIS_QUEUE_URL,
-                request.use_custom_prompt,
-                request.auto_chain
-            )
-        )
-        thread.daemon = True
-        thread.start()
-
-        print(f"Started background analysis for session: {request.session_id}")
-
-        return Response(
-            status_code=202,
-            content='{"status": "processing", "message": "Analysis started"}',
-            media_type="application/json"
-        )
+        return submit_pipeline_job('analyze', request.session_id, payload, "Analysis started")
 
     except HTTPException:
         raise
@@ -630,29 +1044,11 @@ async def structure_facts(
                 detail="fact_extraction_result_v1 is invalid. Please run /api/analyze first."
             )
 
-        # Start background task
-        from services.background_tasks import structure_facts_background
-
-        llm_service = resolve_llm_service(request)
-
-        thread = threading.Thread(
-            target=structure_facts_background,
-            args=(
-                request.session_id,
-                supabase,
-                llm_service,
-                request.use_custom_prompt
-            )
-        )
-        thread.daemon = True
-        thread.start()
-
-        print(f"Started background fact structuring for session: {request.session_id}")
-
-        return Response(
-            status_code=202,
-            content='{"status": "processing", "message": "Fact structuring started"}',
-            media_type="application/json"
+        return submit_pipeline_job(
+            'structure_facts',
+            request.session_id,
+            build_llm_job_payload(request),
+            "Fact structuring started"
         )
 
     except HTTPException:
@@ -720,29 +1116,11 @@ async def assess(
                 detail="annotated_facts_v1 is invalid. Please run /api/structure-facts first."
             )
 
-        # Start background task
-        from services.background_tasks import assess_background
-
-        llm_service = resolve_llm_service(request)
-
-        thread = threading.Thread(
-            target=assess_background,
-            args=(
-                request.session_id,
-                supabase,
-                llm_service,
-                request.use_custom_prompt
-            )
-        )
-        thread.daemon = True
-        thread.start()
-
-        print(f"Started background assessment for session: {request.session_id}")
-
-        return Response(
-            status_code=202,
-            content='{"status": "processing", "message": "Assessment started"}',
-            media_type="application/json"
+        return submit_pipeline_job(
+            'assess',
+            request.session_id,
+            build_llm_job_payload(request),
+            "Assessment started"
         )
 
     except HTTPException:
@@ -750,6 +1128,63 @@ async def assess(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to start assessment: {str(e)}")
 
+@app.get("/api/jobs/stats")
+async def get_job_stats(
+    x_api_token: str = Header(None, alias="X-API-Token")
+):
+    """Queue depth, running jobs and counters of the pipeline job queue (this process)"""
+    if x_api_token != API_TOKEN:
+        raise HTTPException(status_code=401, detail="Invalid API token")
+
+    if not job_queue:
+        raise HTTPException(status_code=500, detail="Database not configured")
+
+    return job_queue.stats()
+
+
+@app.get("/api/metrics")
+async def get_metrics(
+    x_api_token: str = Header(None, alias="X-API-Token")
+):
+    """Process-local pipeline metrics (DB round trips per phase, job queue, LLM cache, audio downloads, ASR jobs)"""
+    if x_api_token != API_TOKEN:
+        raise HTTPException(status_code=401, detail="Invalid API token")
+
+    return {
+        'phase_io': get_phase_io_stats(),
+        'jobs': job_queue.stats() if job_queue else None,
+        'llm_cache': llm_cache.stats() if llm_cache else None,
+        'session_events': session_event_bus.stats(),
+        'audio_source': get_audio_source_stats(),
+        'audio_preprocess': get_preprocess_stats(),
+        'asr_segments': get_segmented_stats(),
+        'asr_cache': get_asr_cache_stats(),
+        'asr_jobs': asr_job_monitor.stats() if asr_job_monitor else None,
+        'asr_clients': asr_registry.stats(),
+        'realtime': realtime_transcriber.stats(),
+        'realtime_drafts': get_realtime_draft_stats(),
+        'recording_stream': get_recording_stream_stats(),
+        's3_multipart': get_multipart_stats(),
+    }
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(
+    job_id: str,
+    x_api_token: str = Header(None, alias="X-API-Token")
+):
+    if x_api_token != API_TOKEN:
+        raise HTTPException(status_code=401, detail="Invalid API token")
+
+    if not job_queue:
+        raise HTTPException(status_code=500, detail="Database not configured")
+
+    job = job_queue.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
 @app.get("/api/sessions")
 async def get_sessions(
     x_api_token: str = Header(None, alias="X-API-Token"),
@@ -801,6 +1236,175 @@ async def get_session(
     except Exception as e:
         raise HTTPException(status_code=404, detail=f"Session not found: {str(e)}")
 
+SESSION_SNAPSHOT_COLUMNS = (
+    'id, status, error_message, updated_at, '
+    'transcription_version, fact_extraction_version, fact_structuring_version, assessment_version'
+)
+
+
+def format_sse(event: str, data: dict, event_id: Optional[str] = None) -> str:
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    id_line = f"id: {event_id}\n" if event_id else ""
+    return f"{id_line}event: {event}\ndata: {payload}\n\n"
+
+
+async def fetch_session_snapshot(session_id: str) -> Optional[dict]:
+    result = await asyncio.to_thread(
+        supabase.table('business_interview_sessions')
+        .select(SESSION_SNAPSHOT_COLUMNS)
+        .eq('id', session_id)
+        .limit(1)
+        .execute
+    )
+    if not result.data:
+        return None
+    snapshot = result.data[0]
+    snapshot['session_id'] = snapshot.pop('id')
+    return snapshot
+
+
+@app.get("/api/sessions/{session_id}/events")
+async def stream_session_events(
+    session_id: str,
+    request: Request,
+    token: Optional[str] = Query(None),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    x_api_token: str = Header(None, alias="X-API-Token")
+):
+    """
+    Server-Sent Events of status / phase transitions for one session
+
+    Events: snapshot, status, phase_started, phase_progress, phase_completed,
+    phase_failed. EventSource cannot send headers, so the token may be passed
+    as ?token=. Reconnects resume from Last-Event-ID (or get a new snapshot).
+    """
+    if (x_api_token or token) != API_TOKEN:
+        raise HTTPException(status_code=401, detail="Invalid API token")
+
+    if not supabase:
+        raise HTTPException(status_code=500, detail="Database not configured")
+
+    subscriber, replay, cursor_id = session_event_bus.subscribe(session_id, last_event_id)
+    try:
+        snapshot = await fetch_session_snapshot(session_id)
+    except Exception:
+        session_event_bus.unsubscribe(session_id, subscriber)
+        raise
+    if not snapshot:
+        session_event_bus.unsubscribe(session_id, subscriber)
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    async def event_stream():
+        last_updated_at = snapshot.get('updated_at')
+        last_reconcile = time.monotonic()
+        try:
+            yield "retry: 3000\n\n"
+            if replay is None:
+                yield format_sse('snapshot', snapshot, cursor_id)
+            else:
+                for event in replay:
+                    yield event.to_sse()
+
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if time.monotonic() - last_reconcile >= SSE_RECONCILE_SECONDS:
+                        last_reconcile = time.monotonic()
+                        current = await fetch_session_snapshot(session_id)
+                        if current and current.get('updated_at') != last_updated_at:
+                            last_updated_at = current.get('updated_at')
+                            # No id: keeps the client's Last-Event-ID on the last bus event
+                            yield format_sse('snapshot', current)
+                            continue
+                    yield ": keep-alive\n\n"
+                    continue
+
+                if event is None:
+                    # Client fell too far behind; it reconnects with Last-Event-ID
+                    break
+                yield event.to_sse()
+        finally:
+            session_event_bus.unsubscribe(session_id, subscriber)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+SESSION_STATUS_COLUMNS = (
+    'id, status, error_message, updated_at, '
+    'transcription_version, fact_extraction_version, fact_structuring_version, assessment_version, '
+    'model_used_phase1, model_used_phase2, model_used_phase3'
+)
+
+
+@app.get("/api/sessions/{session_id}/status")
+async def get_session_status(
+    session_id: str,
+    x_api_token: str = Header(None, alias="X-API-Token")
+):
+    """
+    Lightweight session status for polling (a few hundred bytes)
+
+    versions.<phase> changes on every write of that result; compare it with
+    the previous value instead of downloading and diffing the results.
+    """
+    if x_api_token != API_TOKEN:
+        raise HTTPException(status_code=401, detail="Invalid API token")
+
+    if not supabase:
+        raise HTTPException(status_code=500, detail="Database not configured")
+
+    result = await asyncio.to_thread(
+        supabase.table('business_interview_sessions')
+        .select(SESSION_STATUS_COLUMNS)
+        .eq('id', session_id)
+        .limit(1)
+        .execute
+    )
+    if not result.data:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    row = result.data[0]
+    return {
+        "session_id": row['id'],
+        "status": row['status'],
+        "error_message": row.get('error_message'),
+        "updated_at": row.get('updated_at'),
+        "versions": {
+            "transcription": row.get('transcription_version'),
+            "fact_extraction": row.get('fact_extraction_version'),
+            "fact_structuring": row.get('fact_structuring_version'),
+            "assessment": row.get('assessment_version'),
+        },
+        "models": {
+            "phase1": row.get('model_used_phase1'),
+            "phase2": row.get('model_used_phase2'),
+            "phase3": row.get('model_used_phase3'),
+        }
+    }
+
+@app.get("/api/sessions/{session_id}/progress")
+async def get_session_progress(
+    session_id: str,
+    x_api_token: str = Header(None, alias="X-API-Token")
+):
+    """Streaming progress of Phase 1-3 (partial output, tokens so far, elapsed time)"""
+    if x_api_token != API_TOKEN:
+        raise HTTPException(status_code=401, detail="Invalid API token")
+
+    if not supabase:
+        raise HTTPException(status_code=500, detail="Database not configured")
+
+    result = supabase.table('business_phase_progress')\
+        .select('*')\
+        .eq('session_id', session_id)\
+        .execute()
+
+    return {"session_id": session_id, "phases": {row['phase']: row for row in result.data or []}}
+
 @app.get("/api/sessions/{session_id}/audio-url")
 async def get_session_audio_url(
     session_id: str,
@@ -1006,10 +1610,10 @@ async def update_transcription(
 
         # Update transcription in database
         result = supabase.table('business_interview_sessions')\
-            .update({
+            .update(with_content_versions({
                 'transcription': update.transcription.strip(),
                 'updated_at': datetime.now().isoformat()
-            })\
+            }))\
             .eq('id', session_id)\
             .execute()
 
@@ -1358,7 +1962,7 @@ async def create_manual_session(
             session_data['transcription'] = transcription
 
         result = supabase.table('business_interview_sessions')\
-            .insert(session_data)\
+            .insert(with_content_versions(session_data))\
             .execute()
 
         if not result.data:
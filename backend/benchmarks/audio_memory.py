@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Peak memory of the S3 -> ASR audio path by recording size
+
+Compares the previous path (Body.read() -> BytesIO -> provider read())
+with the spooled path (services/audio_source.py: chunked copy into a
+SpooledTemporaryFile, provider streams it in 64 KB reads as httpx / aiohttp
+do). S3 is replaced by an in-process body that produces the bytes on demand,
+so only the job's own allocations are measured (tracemalloc peak).
+
+Usage (from backend/):
+    python benchmarks/audio_memory.py
+    python benchmarks/audio_memory.py --sizes 16 64 256 --spool-mb 8
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from services.audio_source import open_s3_audio  # noqa: E402
+
+MB = 1024 * 1024
+UPLOAD_READ_BYTES = 64 * 1024
+
+
+class FakeBody:
+    """botocore StreamingBody stand-in producing `size` bytes"""
+
+    def __init__(self, size: int):
+        self.remaining = size
+
+    def read(self, amt=None):
+        if amt is None:
+            amt = self.remaining
+        amt = min(amt, self.remaining)
+        self.remaining -= amt
+        return b'\x1a' * amt
+
+    def close(self):
+        pass
+
+
+class FakeS3Client:
+    def __init__(self, size: int):
+        self.size = size
+
+    def get_object(self, Bucket, Key):
+        return {'Body': FakeBody(self.size)}
+
+
+def upload_read_all(audio_file) -> int:
+    """Provider that reads the whole file (previous Deepgram / Google path)"""
+    audio_file.seek(0)
+    return len(audio_file.read())
+
+
+def upload_streamed(audio_file) -> int:
+    """Provider that streams the file object (httpx content= / aiohttp payload)"""
+    audio_file.seek(0)
+    sent = 0
+    while True:
+        chunk = audio_file.read(UPLOAD_READ_BYTES)
+        if not chunk:
+            return sent
+        sent += len(chunk)
+
+
+def run_buffered(size: int) -> int:
+    body = FakeS3Client(size).get_object(Bucket='bench', Key='bench.webm')['Body']
+    audio_content = body.read()
+    audio_file = io.BytesIO(audio_content)
+    return upload_read_all(audio_file)
+
+
+def run_spooled(size: int, spool_bytes: int) -> int:
+    with open_s3_audio(FakeS3Client(size), 'bench', 'recordings/bench.webm', max_memory_bytes=spool_bytes) as audio_file:
+        return upload_streamed(audio_file)
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    sent = fn(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return sent, peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[4, 16, 64, 256], help='recording sizes (MB)')
+    parser.add_argument('--spool-mb', type=int, default=8, help='in-memory spool limit (MB)')
+    args = parser.parse_args()
+
+    print(f"{'size':>8} | {'buffered peak':>14} {'time':>7} | {'spooled peak':>13} {'time':>7}")
+    print('-' * 60)
+    for size_mb in args.sizes:
+        size = size_mb * MB
+        sent_b, peak_b, time_b = measure(run_buffered, size)
+        sent_s, peak_s, time_s = measure(run_spooled, size, args.spool_mb * MB)
+        assert sent_b == sent_s == size
+        print(
+            f"{size_mb:>6}MB | {peak_b / MB:>12.1f}MB {time_b:>6.2f}s | "
+            f"{peak_s / MB:>11.1f}MB {time_s:>6.2f}s"
+        )
+
+
+if __name__ == '__main__':
+    main()
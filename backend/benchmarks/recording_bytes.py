@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Bytes the recording screen sends per minute of recording
+
+The browser runs two MediaRecorders on the same microphone: the continuous
+one (the recording file, streamed to S3 in slices over /ws/recordings/stream)
+and the realtime one (a standalone 2.5 s file per chunk, transcribed over
+/ws/transcribe/realtime). Concatenated realtime chunks are not a valid
+recording, so the audio crosses the network twice; this measures how much.
+
+Both recorders are reproduced with ffmpeg (WebM / Opus, as Chrome records)
+on a synthetic signal: the continuous recording in one file, the realtime
+chunks as separate files. Opus bitrates are caps (VBR), so noise keeps the
+encoder near them, like speech with background noise does.
+
+Usage (from backend/, needs ffmpeg or FFMPEG_BINARY):
+    python benchmarks/recording_bytes.py
+    python benchmarks/recording_bytes.py --recording-kbps 128 --realtime-kbps 24 --seconds 120
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from services.audio_preprocess import FFMPEG_BINARY  # noqa: E402
+
+MB = 1024 * 1024
+CHUNK_SECONDS = 2.5
+SOURCE = "anoisesrc=color=pink:amplitude=0.2:sample_rate=48000"
+
+
+def encode(path: str, seconds: float, kbps: int) -> int:
+    """WebM / Opus file of `seconds` at `kbps`; returns its size"""
+    subprocess.run(
+        [FFMPEG_BINARY, '-nostdin', '-hide_banner', '-loglevel', 'error', '-y',
+         '-f', 'lavfi', '-t', str(seconds), '-i', SOURCE,
+         '-ac', '1', '-c:a', 'libopus', '-b:a', f'{kbps}k', '-f', 'webm', path],
+        check=True
+    )
+    return os.path.getsize(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--seconds', type=int, default=60, help='recording length')
+    parser.add_argument('--recording-kbps', type=int, default=128, help='continuous recorder bitrate (browser default)')
+    parser.add_argument('--realtime-kbps', type=int, nargs='+', default=[128, 24], help='realtime recorder bitrates')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        recording = encode(os.path.join(workdir, 'recording.webm'), args.seconds, args.recording_kbps)
+        chunks = int(args.seconds / CHUNK_SECONDS)
+        realtime = {}
+        for kbps in args.realtime_kbps:
+            # Every chunk is its own file (header included), like each realtime MediaRecorder
+            chunk_size = encode(os.path.join(workdir, f'chunk-{kbps}.webm'), CHUNK_SECONDS, kbps)
+            realtime[kbps] = chunk_size * chunks
+
+    per_minute = 60 / args.seconds
+    print(f"{args.seconds}s recording at {args.recording_kbps} kbps, {chunks} realtime chunks of {CHUNK_SECONDS}s")
+    print(f"{'realtime chunks':>16} | {'recording':>10} {'chunks':>9} {'sent':>9} | {'duplicated':>10}")
+    print('-' * 66)
+    for kbps, chunk_bytes in realtime.items():
+        sent = recording + chunk_bytes
+        print(
+            f"{kbps:>12} kbps | {recording * per_minute / MB:>8.2f}MB {chunk_bytes * per_minute / MB:>7.2f}MB "
+            f"{sent * per_minute / MB:>7.2f}MB | {chunk_bytes / recording * 100:>9.0f}%"
+        )
+    print("(MB per minute of recording; duplicated = realtime chunk bytes / recording bytes)")
+
+
+if __name__ == '__main__':
+    main()
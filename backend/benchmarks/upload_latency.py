@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Latency of other requests while /api/upload receives large recordings
+
+Compares the previous upload path (await audio.read() of the whole file,
+then a blocking put_object on the event loop) with the streamed path
+(services/s3_multipart.py aupload_stream: fixed-size parts uploaded in
+threads). S3 is replaced by an in-process client that blocks for the
+transfer time of each request (boto3 is blocking), and a probe coroutine
+measures how late a tiny request on the same loop gets served (event loop
+lag) while the uploads run. Memory is the tracemalloc peak of all uploads.
+
+Usage (from backend/):
+    python benchmarks/upload_latency.py
+    python benchmarks/upload_latency.py --sizes 32 128 --uploads 8 --mbps 50
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from services.s3_multipart import S3_PART_SIZE, S3_UPLOAD_CONCURRENCY, aupload_stream  # noqa: E402
+
+MB = 1024 * 1024
+PROBE_INTERVAL = 0.005
+
+
+class FakeS3Client:
+    """boto3 stand-in: each request blocks for its transfer time at `mbps`"""
+
+    def __init__(self, mbps: float):
+        self.bytes_per_second = mbps * MB
+
+    def _transfer(self, body: bytes) -> None:
+        time.sleep(len(body) / self.bytes_per_second)
+
+    def put_object(self, Bucket, Key, Body, ContentType=None):
+        self._transfer(Body)
+        return {}
+
+    def create_multipart_upload(self, Bucket, Key, ContentType=None):
+        return {'UploadId': Key}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self._transfer(Body)
+        return {'ETag': f'"{PartNumber}"'}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        return {}
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        return {}
+
+
+class FakeUploadFile:
+    """starlette UploadFile stand-in producing `size` bytes"""
+
+    def __init__(self, size: int):
+        self.remaining = size
+        self.content_type = 'audio/webm'
+
+    async def read(self, size: int = -1) -> bytes:
+        # A rolled-over spool file is read in the threadpool: other tasks run meanwhile
+        await asyncio.sleep(0)
+        if size < 0:
+            size = self.remaining
+        size = min(size, self.remaining)
+        self.remaining -= size
+        return b'\x1a' * size
+
+
+async def upload_buffered(s3_client, key: str, audio: FakeUploadFile, part_size: int, concurrency: int) -> int:
+    file_content = await audio.read()
+    s3_client.put_object(Bucket='bench', Key=key, Body=file_content, ContentType=audio.content_type)
+    return len(file_content)
+
+
+async def upload_streamed(s3_client, key: str, audio: FakeUploadFile, part_size: int, concurrency: int) -> int:
+    return await aupload_stream(s3_client, 'bench', key, audio.read, audio.content_type, part_size, concurrency)
+
+
+async def probe(lags: list, done: asyncio.Event) -> None:
+    """A tiny request every PROBE_INTERVAL; records how late it ran"""
+    while not done.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - start - PROBE_INTERVAL)
+
+
+async def run(upload, size: int, uploads: int, mbps: float, part_size: int, concurrency: int):
+    s3_client = FakeS3Client(mbps)
+    lags: list = []
+    done = asyncio.Event()
+    probe_task = asyncio.create_task(probe(lags, done))
+    await asyncio.sleep(0)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    sent = await asyncio.gather(*(
+        upload(s3_client, f'recordings/bench-{i}.webm', FakeUploadFile(size), part_size, concurrency)
+        for i in range(uploads)
+    ))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    done.set()
+    await probe_task
+    assert sent == [size] * uploads
+    lags.sort()
+    p95 = lags[min(len(lags) - 1, int(len(lags) * 0.95))]
+    return elapsed, statistics.median(lags), p95, lags[-1], peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[32, 128, 256], help='recording sizes (MB)')
+    parser.add_argument('--uploads', type=int, default=4, help='concurrent uploads')
+    parser.add_argument('--mbps', type=float, default=100, help='S3 throughput per request (MB/s)')
+    parser.add_argument('--part-mb', type=int, default=S3_PART_SIZE // MB, help='part size (MB)')
+    parser.add_argument('--concurrency', type=int, default=S3_UPLOAD_CONCURRENCY, help='parts in flight per upload')
+    args = parser.parse_args()
+
+    print(f"{args.uploads} concurrent uploads, {args.mbps:g} MB/s per S3 request, "
+          f"{args.part_mb} MB parts x {args.concurrency}")
+    print(f"{'size':>8} {'path':>9} | {'total':>7} | {'probe p50':>9} {'p95':>8} {'max':>8} | {'peak':>9}")
+    print('-' * 72)
+    for size_mb in args.sizes:
+        for name, upload in (('buffered', upload_buffered), ('streamed', upload_streamed)):
+            elapsed, p50, p95, worst, peak = asyncio.run(
+                run(upload, size_mb * MB, args.uploads, args.mbps, args.part_mb * MB, args.concurrency)
+            )
+            print(
+                f"{size_mb:>6}MB {name:>9} | {elapsed:>6.2f}s | "
+                f"{p50 * 1000:>7.1f}ms {p95 * 1000:>6.1f}ms {worst * 1000:>6.1f}ms | {peak / MB:>7.1f}MB"
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Word -> utterance grouping on a long recording
+
+Compares the previous per-word dict loop of GoogleSpeechASRService with the
+columnar grouping (services/asr_providers/utterances.py) on a synthetic
+word list (default: 90 minutes at 3 words/s, speaker turns of 1-40 words,
+one recognition result per ~30 s). Both variants start from the provider's
+word objects (word, start_offset, end_offset, confidence, speaker_tag), so
+the timing includes reading the response.
+
+Usage (from backend/):
+    python benchmarks/utterance_grouping.py
+    python benchmarks/utterance_grouping.py --minutes 90 --words-per-second 4 --repeat 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from services.asr_providers.utterances import WordColumns, group_utterances  # noqa: E402
+
+
+class Word:
+    """speech_v2 WordInfo stand-in"""
+
+    __slots__ = ('word', 'start_offset', 'end_offset', 'confidence', 'speaker_tag')
+
+    def __init__(self, word, start, end, confidence, speaker_tag):
+        self.word = word
+        self.start_offset = timedelta(seconds=start)
+        self.end_offset = timedelta(seconds=end)
+        self.confidence = confidence
+        self.speaker_tag = speaker_tag
+
+
+def synthetic_results(minutes: float, words_per_second: float, seed: int = 0):
+    """List of results (one list of words per ~30 s), speakers alternating in random turns"""
+    rng = random.Random(seed)
+    total = int(minutes * 60 * words_per_second)
+    step = 1.0 / words_per_second
+    results, current = [], []
+    speaker, turn_left = 1, rng.randint(1, 40)
+    for index in range(total):
+        start = index * step
+        current.append(Word(rng.choice('あいうえおかきくけこ') * 2, start, start + step * 0.9, rng.uniform(0.6, 1.0), speaker))
+        turn_left -= 1
+        if turn_left == 0:
+            speaker = rng.randint(1, 3)
+            turn_left = rng.randint(1, 40)
+        if len(current) >= 30 * words_per_second:
+            results.append(current)
+            current = []
+    if current:
+        results.append(current)
+    return results
+
+
+def group_legacy(results):
+    """Previous implementation (per-word dicts, sum()/len() per utterance)"""
+    utterances = []
+    for words in results:
+        current_speaker = None
+        current_utterance = {"words": [], "start": 0, "end": 0, "speaker": None}
+        for word_info in words:
+            speaker_tag = getattr(word_info, 'speaker_tag', 0) if hasattr(word_info, 'speaker_tag') else 0
+            if current_speaker is None:
+                current_speaker = speaker_tag
+                current_utterance["speaker"] = speaker_tag
+                current_utterance["start"] = word_info.start_offset.total_seconds()
+            if speaker_tag != current_speaker:
+                current_utterance["end"] = current_utterance["words"][-1]["end"]
+                current_utterance["transcript"] = "".join([w["word"] for w in current_utterance["words"]])
+                current_utterance["confidence"] = sum([w["confidence"] for w in current_utterance["words"]]) / len(current_utterance["words"])
+                utterances.append(current_utterance)
+                current_speaker = speaker_tag
+                current_utterance = {"words": [], "start": word_info.start_offset.total_seconds(), "end": 0, "speaker": speaker_tag}
+            current_utterance["words"].append({
+                "word": word_info.word,
+                "start": word_info.start_offset.total_seconds(),
+                "end": word_info.end_offset.total_seconds(),
+                "confidence": word_info.confidence
+            })
+        if current_utterance["words"]:
+            current_utterance["end"] = current_utterance["words"][-1]["end"]
+            current_utterance["transcript"] = "".join([w["word"] for w in current_utterance["words"]])
+            current_utterance["confidence"] = sum([w["confidence"] for w in current_utterance["words"]]) / len(current_utterance["words"])
+            utterances.append(current_utterance)
+
+    return [
+        {
+            "start": round(utt["start"], 2),
+            "end": round(utt["end"], 2),
+            "transcript": utt["transcript"],
+            "speaker": utt["speaker"],
+            "confidence": round(utt["confidence"], 2)
+        }
+        for utt in utterances
+    ]
+
+
+def group_columnar(results):
+    columns = WordColumns()
+    for segment, words in enumerate(results):
+        for word_info in words:
+            columns.append(
+                word_info.word,
+                word_info.start_offset.total_seconds(),
+                word_info.end_offset.total_seconds(),
+                word_info.confidence,
+                getattr(word_info, 'speaker_tag', 0),
+                segment
+            )
+    return group_utterances(columns)
+
+
+def measure(func, results, repeat: int):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        output = func(results)
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    func(results)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return output, best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--minutes', type=float, default=90)
+    parser.add_argument('--words-per-second', type=float, default=3)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    results = synthetic_results(args.minutes, args.words_per_second)
+    word_count = sum(len(words) for words in results)
+    print(f"{args.minutes:.0f} min, {word_count} words, {len(results)} results")
+
+    legacy, legacy_time, legacy_peak = measure(group_legacy, results, args.repeat)
+    columnar, columnar_time, columnar_peak = measure(group_columnar, results, args.repeat)
+
+    print(f"{'variant':<10} {'utterances':>10} {'best ms':>10} {'peak MB':>10}")
+    print(f"{'legacy':<10} {len(legacy):>10} {legacy_time * 1000:>10.1f} {legacy_peak / (1024 * 1024):>10.1f}")
+    print(f"{'columnar':<10} {len(columnar):>10} {columnar_time * 1000:>10.1f} {columnar_peak / (1024 * 1024):>10.1f}")
+    print(f"same output: {legacy == columnar}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+-- パイプラインジョブテーブル（文字起こし・Phase 1-3 のバックグラウンド実行管理）
+-- 実行日: 2026-10-17
+-- 実行場所: Supabase SQL Editor
+-- 目的: リクエスト毎のデーモンスレッドを廃止し、永続化されたジョブキューで実行する
+--       - ジョブ種別ごとの同時実行数制御
+--       - 再デプロイ時にリース切れのジョブを別プロセスが再取得
+--       - completed_steps により完了済みステップ（ASR / Phase 1-3）を再実行しない
+
+CREATE TABLE IF NOT EXISTS business_pipeline_jobs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    job_type TEXT NOT NULL,                 -- 'transcribe' | 'analyze' | 'structure_facts' | 'assess'
+    session_id UUID NOT NULL REFERENCES business_interview_sessions(id) ON DELETE CASCADE,
+    payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+    status TEXT NOT NULL DEFAULT 'queued',  -- 'queued' | 'running' | 'succeeded' | 'failed'
+    attempts INTEGER NOT NULL DEFAULT 0,
+    completed_steps JSONB NOT NULL DEFAULT '[]'::jsonb,
+    owner_id TEXT,                          -- 保持しているプロセス（host:pid:nonce）
+    lease_expires_at TIMESTAMPTZ,           -- 保持プロセスが定期的に延長する
+    error_message TEXT,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    started_at TIMESTAMPTZ,
+    finished_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- 同一セッション・同一種別のアクティブなジョブは1件のみ（Lambda重複配信対策）
+CREATE UNIQUE INDEX IF NOT EXISTS idx_pipeline_jobs_active_unique
+    ON business_pipeline_jobs(job_type, session_id)
+    WHERE status IN ('queued', 'running');
+
+-- リース切れジョブの検索用
+CREATE INDEX IF NOT EXISTS idx_pipeline_jobs_active_lease
+    ON business_pipeline_jobs(lease_expires_at)
+    WHERE status IN ('queued', 'running');
+
+CREATE INDEX IF NOT EXISTS idx_pipeline_jobs_session
+    ON business_pipeline_jobs(session_id, created_at DESC);
+
+-- RLS: バックエンド（service_role）のみアクセス
+ALTER TABLE business_pipeline_jobs ENABLE ROW LEVEL SECURITY;
+
+-- 確認クエリ
+SELECT column_name, data_type, is_nullable
+FROM information_schema.columns
+WHERE table_name = 'business_pipeline_jobs'
+ORDER BY ordinal_position;
@@ -0,0 +1,28 @@
+-- LLMレスポンスキャッシュテーブル（Phase 1-3 の同一プロンプト再実行を高速化）
+-- 実行日: 2026-10-17
+-- 実行場所: Supabase SQL Editor
+-- 目的: プロバイダー/モデル + 正規化プロンプトのハッシュをキーにLLM応答を保存する
+--       - use_custom_prompt による同一プロンプトの再実行
+--       - Lambdaの重複配信による /api/analyze の再実行
+--       いずれもLLMを呼ばずに保存済みの応答を返す（AnalyzeRequest.use_cache=false で無効化）
+
+CREATE TABLE IF NOT EXISTS business_llm_response_cache (
+    cache_key TEXT PRIMARY KEY,             -- sha256(provider/model + '\0' + 正規化プロンプト)
+    model_name TEXT NOT NULL,               -- 例: 'openai/gpt-4o'
+    response TEXT NOT NULL,
+    response_bytes INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- TTL切れエントリの削除用
+CREATE INDEX IF NOT EXISTS idx_llm_response_cache_created_at
+    ON business_llm_response_cache(created_at);
+
+-- RLS: バックエンド（service_role）のみアクセス
+ALTER TABLE business_llm_response_cache ENABLE ROW LEVEL SECURITY;
+
+-- 確認クエリ
+SELECT column_name, data_type, is_nullable
+FROM information_schema.columns
+WHERE table_name = 'business_llm_response_cache'
+ORDER BY ordinal_position;
@@ -0,0 +1,32 @@
+-- LLMフェーズ進捗テーブル（Phase 1-3 のストリーミング生成の途中経過）
+-- 実行日: 2026-10-17
+-- 実行場所: Supabase SQL Editor
+-- 目的: LLMのストリーミング出力を数秒ごとに保存し、生成中の出力・経過時間を確認できるようにする
+--       - business_interview_sessions（大きな行）は生成中に更新しない
+--       - 最終結果の保存はこれまで通りセッション行への1回の更新
+--       - last_output_at が更新されないフェーズは停止とみなせる
+
+CREATE TABLE IF NOT EXISTS business_phase_progress (
+    session_id UUID NOT NULL REFERENCES business_interview_sessions(id) ON DELETE CASCADE,
+    phase TEXT NOT NULL,                        -- 'fact_extraction' | 'fact_structuring' | 'assessment'
+    status TEXT NOT NULL DEFAULT 'generating',  -- 'generating' | 'completed' | 'failed'
+    model_name TEXT,
+    partial_output TEXT,                        -- 生成途中の出力（完了時は NULL、結果はセッション行）
+    output_chars INTEGER NOT NULL DEFAULT 0,
+    output_tokens_estimate INTEGER NOT NULL DEFAULT 0,
+    elapsed_seconds NUMERIC,
+    started_at TIMESTAMPTZ,
+    last_output_at TIMESTAMPTZ,
+    error_message TEXT,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (session_id, phase)
+);
+
+-- RLS: バックエンド（service_role）のみアクセス
+ALTER TABLE business_phase_progress ENABLE ROW LEVEL SECURITY;
+
+-- 確認クエリ
+SELECT column_name, data_type, is_nullable
+FROM information_schema.columns
+WHERE table_name = 'business_phase_progress'
+ORDER BY ordinal_position;
@@ -0,0 +1,35 @@
+-- セッション結果のバージョン列（軽量ステータスAPI用）
+-- 実行日: 2026-10-17
+-- 実行場所: Supabase SQL Editor
+-- 目的: GET /api/sessions/{id}/status で結果本体を返さずに「どのフェーズが更新されたか」を判定する
+--       - 値は "<内容のハッシュ>:<書き込み時刻(ms)>"（結果の書き込み時にバックエンドが設定）
+--       - 同一内容での再実行でも書き込みごとに値が変わる
+
+ALTER TABLE business_interview_sessions ADD COLUMN IF NOT EXISTS transcription_version TEXT;
+ALTER TABLE business_interview_sessions ADD COLUMN IF NOT EXISTS fact_extraction_version TEXT;
+ALTER TABLE business_interview_sessions ADD COLUMN IF NOT EXISTS fact_structuring_version TEXT;
+ALTER TABLE business_interview_sessions ADD COLUMN IF NOT EXISTS assessment_version TEXT;
+
+-- 既存データのバックフィル（ハッシュ方式は異なるが、比較用のトークンとしては十分）
+UPDATE business_interview_sessions
+SET transcription_version = left(md5(transcription), 16) || ':' || floor(extract(epoch FROM updated_at) * 1000)::bigint
+WHERE transcription IS NOT NULL AND transcription_version IS NULL;
+
+UPDATE business_interview_sessions
+SET fact_extraction_version = left(md5(fact_extraction_result_v1::text), 16) || ':' || floor(extract(epoch FROM updated_at) * 1000)::bigint
+WHERE fact_extraction_result_v1 IS NOT NULL AND fact_extraction_version IS NULL;
+
+UPDATE business_interview_sessions
+SET fact_structuring_version = left(md5(fact_structuring_result_v1::text), 16) || ':' || floor(extract(epoch FROM updated_at) * 1000)::bigint
+WHERE fact_structuring_result_v1 IS NOT NULL AND fact_structuring_version IS NULL;
+
+UPDATE business_interview_sessions
+SET assessment_version = left(md5(assessment_result_v1::text), 16) || ':' || floor(extract(epoch FROM updated_at) * 1000)::bigint
+WHERE assessment_result_v1 IS NOT NULL AND assessment_version IS NULL;
+
+-- 確認クエリ
+SELECT column_name, data_type, is_nullable
+FROM information_schema.columns
+WHERE table_name = 'business_interview_sessions'
+  AND column_name LIKE '%_version'
+ORDER BY ordinal_position;
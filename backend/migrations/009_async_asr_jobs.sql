@@ -0,0 +1,23 @@
+-- 非同期ASRジョブの管理列
+-- 実行日: 2026-10-17
+-- 実行場所: Supabase SQL Editor
+-- 目的: 文字起こしをプロバイダーに投入した時点でワーカーを解放し、完了はコールバック／共有ポーラーで確定する
+--       - asr_job_id: プロバイダー側のジョブID（確定・失敗時に NULL に戻す）
+--       - asr_job_provider: 投入先プロバイダー（speechmatics / deepgram / stub）
+--       - asr_job_submitted_at: 投入時刻（タイムアウト判定用）
+
+ALTER TABLE business_interview_sessions ADD COLUMN IF NOT EXISTS asr_job_id TEXT;
+ALTER TABLE business_interview_sessions ADD COLUMN IF NOT EXISTS asr_job_provider TEXT;
+ALTER TABLE business_interview_sessions ADD COLUMN IF NOT EXISTS asr_job_submitted_at TIMESTAMPTZ;
+
+-- ポーラーが処理中のジョブだけを取得するための部分インデックス
+CREATE INDEX IF NOT EXISTS idx_business_interview_sessions_pending_asr
+  ON business_interview_sessions (asr_job_submitted_at)
+  WHERE asr_job_id IS NOT NULL;
+
+-- 確認クエリ
+SELECT column_name, data_type, is_nullable
+FROM information_schema.columns
+WHERE table_name = 'business_interview_sessions'
+  AND column_name LIKE 'asr_job_%'
+ORDER BY ordinal_position;
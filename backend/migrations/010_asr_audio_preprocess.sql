@@ -0,0 +1,14 @@
+-- 前処理済み音声で投入した非同期ASRジョブのタイムスタンプ対応表
+-- 実行日: 2026-10-17
+-- 実行場所: Supabase SQL Editor
+-- 目的: AUDIO_PREPROCESS_ENABLED=true で無音を短縮した音声をプロバイダーに投入した場合、
+--       確定時に発話の時刻を元の録音の時刻に戻すための対応表を保持する
+--       - asr_audio_preprocess: 前処理の結果（元/処理後の秒数・バイト数、time_remap）。確定時に NULL に戻す
+
+ALTER TABLE business_interview_sessions ADD COLUMN IF NOT EXISTS asr_audio_preprocess JSONB;
+
+-- 確認クエリ
+SELECT column_name, data_type, is_nullable
+FROM information_schema.columns
+WHERE table_name = 'business_interview_sessions'
+  AND column_name = 'asr_audio_preprocess';
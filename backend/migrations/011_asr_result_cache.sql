@@ -0,0 +1,37 @@
+-- ASR結果キャッシュテーブル（同じ録音の再文字起こしを省略）
+-- 実行日: 2026-10-17
+-- 実行場所: Supabase SQL Editor
+-- 目的: S3オブジェクト（ETag + サイズ）・プロバイダー・モデル/設定のハッシュをキーに文字起こし結果を保存する
+--       - S3イベントLambdaと手動の /api/transcribe の重複
+--       - ジョブの再試行
+--       いずれも有料のASRジョブを投入せず、保存済みの結果をセッションに書き込む（SQSは通常どおり送信）
+--       - asr_cache_key: 非同期ASRジョブの確定時に結果を保存するキー。確定時に NULL に戻す
+
+CREATE TABLE IF NOT EXISTS business_asr_result_cache (
+    cache_key TEXT PRIMARY KEY,             -- sha256(ETag:サイズ + '\0' + プロバイダー/設定のJSON)
+    provider TEXT NOT NULL,                 -- 例: 'speechmatics'
+    model TEXT,
+    result JSONB NOT NULL,                  -- transcription, transcription_metadata, duration_seconds
+    result_bytes INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- TTL切れエントリの削除用
+CREATE INDEX IF NOT EXISTS idx_asr_result_cache_created_at
+    ON business_asr_result_cache(created_at);
+
+-- RLS: バックエンド（service_role）のみアクセス
+ALTER TABLE business_asr_result_cache ENABLE ROW LEVEL SECURITY;
+
+ALTER TABLE business_interview_sessions ADD COLUMN IF NOT EXISTS asr_cache_key TEXT;
+
+-- 確認クエリ
+SELECT column_name, data_type, is_nullable
+FROM information_schema.columns
+WHERE table_name = 'business_asr_result_cache'
+ORDER BY ordinal_position;
+
+SELECT column_name, data_type, is_nullable
+FROM information_schema.columns
+WHERE table_name = 'business_interview_sessions'
+  AND column_name = 'asr_cache_key';
@@ -0,0 +1,32 @@
+-- 録音中の文字起こしの下書きテーブル（録音終了直後に Phase 1 を開始）
+-- 実行日: 2026-10-17
+-- 実行場所: Supabase SQL Editor
+-- 目的: WebSocket（/ws/transcribe/realtime?draft_id=...）で録音中に文字起こししたテキストを下書きとして保存する
+--       - /api/upload に draft_id を渡すと、セッションを下書きで 'transcribed' として作成し、すぐに分析ジョブを投入する
+--       - その後のバッチASR（S3イベントLambda → /api/transcribe）は下書きを置き換えるだけ（ステータス・分析はそのまま）
+--       - 下書きは使用時に削除する。使われなかった下書きは下の削除クエリで定期的に消す
+
+CREATE TABLE IF NOT EXISTS business_realtime_drafts (
+    id UUID PRIMARY KEY,                    -- 録音画面が録音開始時に生成する draft_id
+    transcript TEXT NOT NULL DEFAULT '',    -- 重複除去後の文字起こし（チャンク順）
+    transcript_chunks INTEGER NOT NULL DEFAULT 0,
+    model TEXT,                             -- 例: 'gpt-4o-mini-transcribe'
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- 使われなかった下書きの削除用
+CREATE INDEX IF NOT EXISTS idx_realtime_drafts_updated_at
+    ON business_realtime_drafts(updated_at);
+
+-- RLS: バックエンド（service_role）のみアクセス
+ALTER TABLE business_realtime_drafts ENABLE ROW LEVEL SECURITY;
+
+-- 確認クエリ
+SELECT column_name, data_type, is_nullable
+FROM information_schema.columns
+WHERE table_name = 'business_realtime_drafts'
+ORDER BY ordinal_position;
+
+-- 使われなかった下書きの削除（1日以上前）
+-- DELETE FROM business_realtime_drafts WHERE updated_at < NOW() - INTERVAL '1 day';
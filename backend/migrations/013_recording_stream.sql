@@ -0,0 +1,16 @@
+-- 録音のS3ストリーミング（録音中に multipart upload、終了時の再アップロードなし）
+-- 実行日: 2026-10-17
+-- 実行場所: Supabase SQL Editor
+-- 目的: /ws/recordings/stream で録音中に S3 へ送った multipart upload の状態を下書きに保存する
+--       - recording_upload: {key, upload_id, parts: [{PartNumber, ETag}], size, content_type, complete}
+--       - POST /api/recordings/finalize が別プロセスでも upload を完了できるように DB に持つ
+--       - 完了（complete: true）前に接続が切れた upload は中止し、NULL に戻す
+--       - 中止できずに残った upload は S3 のライフサイクルルール（AbortIncompleteMultipartUpload）で削除する
+
+ALTER TABLE business_realtime_drafts ADD COLUMN IF NOT EXISTS recording_upload JSONB;
+
+-- 確認クエリ
+SELECT column_name, data_type, is_nullable
+FROM information_schema.columns
+WHERE table_name = 'business_realtime_drafts'
+  AND column_name = 'recording_upload';
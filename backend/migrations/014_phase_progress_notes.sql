@@ -0,0 +1,14 @@
+-- LLMフェーズ進捗の実行メモ（並列実行の分割・フォールバックの記録）
+-- 実行日: 2026-10-17
+-- 実行場所: Supabase SQL Editor
+-- 目的: フェーズの実行方法を進捗行に残し、GET /api/sessions/{id}/progress で確認できるようにする
+--       - notes.sharding: Phase 2 の分割並列アノテーション（シャード数・入出力件数）
+--       - 再実行後もシャードの件数が一致しない場合は {mismatch: {shard, expected, actual}, fallback: 'single_call'}
+
+ALTER TABLE business_phase_progress ADD COLUMN IF NOT EXISTS notes JSONB;
+
+-- 確認クエリ
+SELECT column_name, data_type, is_nullable
+FROM information_schema.columns
+WHERE table_name = 'business_phase_progress'
+  AND column_name = 'notes';
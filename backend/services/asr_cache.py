@@ -0,0 +1,168 @@
+"""
+ASR result cache (keyed by the S3 object, provider and configuration)
+
+The S3-event Lambda, manual /api/transcribe calls and job retries can all
+transcribe the same recording more than once, each time as a full paid ASR
+job. Before submitting, transcribe jobs look up business_asr_result_cache:
+
+Key: sha256 of
+- the S3 ETag + size of the recording (head_object; no download)
+- the provider name and its cache_fingerprint() (model, request options)
+- the audio pipeline settings that change the result (pre-processing,
+  segmented ASR)
+
+A hit stores the cached transcription on the session immediately (the SQS
+message is still sent, so analysis follows as usual). Results are stored as
+the session columns they produce (transcription, transcription_metadata with
+compact utterance columns, duration_seconds). Cache failures never fail a
+transcription: the provider is called as usual.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from supabase import Client
+
+from services.audio_preprocess import (
+    AUDIO_PREPROCESS_BITRATE,
+    AUDIO_PREPROCESS_ENABLED,
+    AUDIO_PREPROCESS_SAMPLE_RATE,
+    AUDIO_SILENCE_KEEP_SECONDS,
+    AUDIO_SILENCE_MIN_SECONDS,
+    AUDIO_VAD_MARGIN_DB,
+    AUDIO_VAD_THRESHOLD_DB,
+)
+from services.segmented_asr import ASR_SEGMENT_OVERLAP_SECONDS, ASR_SEGMENT_SECONDS, ASR_SEGMENTED_ENABLED
+
+
+ASR_CACHE_ENABLED = os.getenv("ASR_CACHE_ENABLED", "true").lower() == "true"
+ASR_CACHE_TTL_DAYS = int(os.getenv("ASR_CACHE_TTL_DAYS", "90"))
+
+ASR_CACHE_TABLE = 'business_asr_result_cache'
+
+# Session columns a cache entry restores
+CACHED_COLUMNS = ('transcription', 'transcription_metadata', 'duration_seconds')
+
+_stats_lock = threading.Lock()
+_stats = {
+    'hits': 0,
+    'misses': 0,
+    'stores': 0,
+    'errors': 0,
+}
+
+
+def _count(key: str) -> None:
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def get_asr_cache_stats() -> Dict[str, Any]:
+    with _stats_lock:
+        stats = dict(_stats)
+    stats['enabled'] = ASR_CACHE_ENABLED
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else None
+    return stats
+
+
+def pipeline_fingerprint() -> Dict[str, Any]:
+    """Audio pipeline settings that change what the provider receives"""
+    fingerprint: Dict[str, Any] = {}
+    if AUDIO_PREPROCESS_ENABLED:
+        fingerprint['preprocess'] = [
+            AUDIO_PREPROCESS_SAMPLE_RATE,
+            AUDIO_PREPROCESS_BITRATE,
+            AUDIO_VAD_THRESHOLD_DB,
+            AUDIO_VAD_MARGIN_DB,
+            AUDIO_SILENCE_MIN_SECONDS,
+            AUDIO_SILENCE_KEEP_SECONDS,
+        ]
+    if ASR_SEGMENTED_ENABLED:
+        fingerprint['segmented'] = [ASR_SEGMENT_SECONDS, ASR_SEGMENT_OVERLAP_SECONDS]
+    return fingerprint
+
+
+def build_asr_cache_key(s3_client, s3_bucket: str, s3_key: str, asr_service) -> Optional[str]:
+    """
+    Cache key of a recording for asr_service (blocking; async callers run it
+    with asyncio.to_thread). None when the cache is disabled or the object
+    cannot be read.
+    """
+    if not ASR_CACHE_ENABLED:
+        return None
+    try:
+        head = s3_client.head_object(Bucket=s3_bucket, Key=s3_key)
+        fingerprint = {
+            'provider': asr_service.provider_name,
+            'asr': asr_service.cache_fingerprint(),
+            'pipeline': pipeline_fingerprint(),
+        }
+    except Exception as e:
+        print(f"[ASRCache] Could not build cache key for {s3_key}: {e}")
+        _count('errors')
+        return None
+
+    # Multipart ETags depend on the part size, so the size is part of the identity too
+    digest = hashlib.sha256()
+    digest.update(f"{head.get('ETag', '').strip(chr(34))}:{head.get('ContentLength', 0)}".encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(json.dumps(fingerprint, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def lookup_asr_result(supabase: Optional[Client], cache_key: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Cached session columns (CACHED_COLUMNS) plus 'cached_at', or None"""
+    if not supabase or not cache_key:
+        return None
+
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=ASR_CACHE_TTL_DAYS)).isoformat()
+    try:
+        result = supabase.table(ASR_CACHE_TABLE)\
+            .select('result, created_at')\
+            .eq('cache_key', cache_key)\
+            .gte('created_at', cutoff)\
+            .limit(1)\
+            .execute()
+    except Exception as e:
+        print(f"[ASRCache] Lookup failed: {e}")
+        _count('errors')
+        return None
+
+    if not result.data:
+        _count('misses')
+        return None
+    _count('hits')
+    return {**result.data[0]['result'], 'cached_at': result.data[0]['created_at']}
+
+
+def store_asr_result(
+    supabase: Optional[Client],
+    cache_key: Optional[str],
+    provider_name: str,
+    session_update: Dict[str, Any]
+) -> None:
+    """Store the transcription columns of a finished session update (empty transcriptions are not cached)"""
+    if not supabase or not cache_key or not session_update.get('transcription'):
+        return
+
+    cached = {column: session_update.get(column) for column in CACHED_COLUMNS}
+    payload = json.dumps(cached, ensure_ascii=False)
+    try:
+        supabase.table(ASR_CACHE_TABLE).upsert({
+            'cache_key': cache_key,
+            'provider': provider_name,
+            'model': (cached.get('transcription_metadata') or {}).get('model'),
+            'result': cached,
+            'result_bytes': len(payload.encode('utf-8')),
+            'created_at': datetime.now(timezone.utc).isoformat()
+        }, on_conflict='cache_key').execute()
+    except Exception as e:
+        print(f"[ASRCache] Store failed: {e}")
+        _count('errors')
+        return
+    _count('stores')
@@ -0,0 +1,298 @@
+"""
+Async ASR job lifecycle (submit -> callback / shared poller -> finalize)
+
+With ASR_ASYNC_JOBS=true a transcribe job only submits the recording to the
+provider, stores the provider job id on the session (asr_job_id) and returns,
+so a transcribe worker is no longer held for the whole transcription.
+Completion is picked up by:
+
+- callback: POST /api/asr/callback/{session_id}?sig=... (ASR_CALLBACK_BASE_URL
+  and ASR_CALLBACK_SECRET set and the provider supports callbacks); the
+  signature is an HMAC of the session id, since providers cannot send our API
+  token. The API token is never the key: it ships in the frontend bundle, and
+  a callback carries the transcript itself (Deepgram)
+- poller: one ASRJobMonitor task per process checks all pending jobs every
+  ASR_POLL_SECONDS (providers with a job status API)
+
+Both paths finalize through a compare-and-set on asr_job_id, so with several
+worker processes (or callback + poller racing) exactly one of them saves the
+transcription and sends the SQS message.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import os
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+from supabase import Client
+
+from services.asr_providers import ASRJobFailed
+from services.llm_pipeline import run_query
+
+
+ASR_ASYNC_JOBS = os.getenv("ASR_ASYNC_JOBS", "true").lower() == "true"
+ASR_CALLBACK_BASE_URL = os.getenv("ASR_CALLBACK_BASE_URL", "").rstrip('/')
+ASR_CALLBACK_SECRET = os.getenv("ASR_CALLBACK_SECRET", "")
+ASR_POLL_SECONDS = float(os.getenv("ASR_POLL_SECONDS", "15"))
+ASR_POLL_CONCURRENCY = int(os.getenv("ASR_POLL_CONCURRENCY", "4"))
+ASR_JOB_TIMEOUT_SECONDS = int(os.getenv("ASR_JOB_TIMEOUT_SECONDS", str(3 * 60 * 60)))
+
+if ASR_CALLBACK_BASE_URL and not ASR_CALLBACK_SECRET:
+    print("[ASRJobs] ERROR: ASR_CALLBACK_BASE_URL is set but ASR_CALLBACK_SECRET is not; "
+          "callbacks are disabled (polling providers only, the others transcribe synchronously)")
+ASR_CALLBACK_ENABLED = bool(ASR_CALLBACK_BASE_URL and ASR_CALLBACK_SECRET)
+
+PENDING_ASR_COLUMNS = 'id, asr_job_id, asr_job_provider, asr_job_submitted_at, asr_audio_preprocess, asr_cache_key'
+
+
+def callback_signature(session_id: str) -> str:
+    if not ASR_CALLBACK_SECRET:
+        raise RuntimeError("ASR_CALLBACK_SECRET is not set")
+    return hmac.new(ASR_CALLBACK_SECRET.encode(), session_id.encode(), hashlib.sha256).hexdigest()[:32]
+
+
+def verify_callback_signature(session_id: str, signature: Optional[str]) -> bool:
+    if not ASR_CALLBACK_ENABLED:
+        return False
+    return bool(signature) and hmac.compare_digest(callback_signature(session_id), signature)
+
+
+def build_callback_url(session_id: str) -> Optional[str]:
+    if not ASR_CALLBACK_ENABLED:
+        return None
+    return f"{ASR_CALLBACK_BASE_URL}/api/asr/callback/{session_id}?sig={callback_signature(session_id)}"
+
+
+def use_async_job(asr_service) -> bool:
+    """Submit-and-return is possible if results can be polled, or delivered to our callback"""
+    if not ASR_ASYNC_JOBS:
+        return False
+    if getattr(asr_service, 'supports_job_polling', False):
+        return True
+    return ASR_CALLBACK_ENABLED and getattr(asr_service, 'supports_job_callback', False)
+
+
+def _age_seconds(submitted_at: Optional[str]) -> float:
+    if not submitted_at:
+        return 0.0
+    try:
+        submitted = datetime.fromisoformat(submitted_at.replace('Z', '+00:00'))
+    except ValueError:
+        return 0.0
+    if submitted.tzinfo is None:
+        submitted = submitted.replace(tzinfo=timezone.utc)
+    return (datetime.now(timezone.utc) - submitted).total_seconds()
+
+
+class ASRJobMonitor:
+    """Finalizes submitted ASR jobs: shared poller task + callback handling (per process)"""
+
+    def __init__(
+        self,
+        supabase: Client,
+        provider_factory: Callable[[str], Any],
+        sqs_queue_url: str,
+        interval: float = ASR_POLL_SECONDS,
+        concurrency: int = ASR_POLL_CONCURRENCY,
+        timeout_seconds: int = ASR_JOB_TIMEOUT_SECONDS
+    ):
+        """
+        Args:
+            supabase: Supabase client
+            provider_factory: ASR provider name -> shared provider instance (asr_registry.get)
+            sqs_queue_url: SQS queue notified when a transcription is finalized
+            interval: Seconds between polls of all pending jobs
+            concurrency: Max provider status requests at once
+            timeout_seconds: Pending jobs older than this are failed
+        """
+        self.supabase = supabase
+        self.provider_factory = provider_factory
+        self.sqs_queue_url = sqs_queue_url
+        self.interval = interval
+        self.concurrency = max(1, concurrency)
+        self.timeout_seconds = timeout_seconds
+
+        self._providers: set = set()
+        self._task: Optional[asyncio.Task] = None
+        self._counters = {
+            'polls': 0,
+            'callbacks': 0,
+            'finalized': 0,
+            'failed': 0,
+            'timed_out': 0,
+            'poll_errors': 0,
+        }
+        self._pending = 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the poller on the running loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            print(f"[ASRJobs] Poller started (every {self.interval}s)")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.poll_once()
+            except Exception as e:
+                self._counters['poll_errors'] += 1
+                print(f"[ASRJobs] Poll failed: {e}")
+
+    def _provider(self, name: str):
+        # The factory returns the shared (pooled) provider instance
+        provider = self.provider_factory(name)
+        self._providers.add(name)
+        return provider
+
+    # ------------------------------------------------------------------
+    # Poller
+    # ------------------------------------------------------------------
+
+    async def poll_once(self) -> int:
+        """Check every pending job once; returns the number finalized"""
+        result = await run_query(
+            self.supabase.table('business_interview_sessions')
+            .select(PENDING_ASR_COLUMNS)
+            .not_.is_('asr_job_id', 'null')
+            .eq('status', 'transcribing')
+            .order('asr_job_submitted_at')
+            .limit(200)
+        )
+        sessions = result.data or []
+        self._pending = len(sessions)
+        self._counters['polls'] += 1
+        if not sessions:
+            return 0
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def check(session: Dict[str, Any]) -> bool:
+            async with semaphore:
+                return await self._check(session)
+
+        outcomes = await asyncio.gather(*(check(session) for session in sessions), return_exceptions=True)
+        for session, outcome in zip(sessions, outcomes):
+            if isinstance(outcome, Exception):
+                self._counters['poll_errors'] += 1
+                print(f"[ASRJobs] Finalizing session {session['id']} failed: {outcome}")
+        return sum(1 for outcome in outcomes if outcome is True)
+
+    async def _check(self, session: Dict[str, Any]) -> bool:
+        session_id = session['id']
+        job_id = session['asr_job_id']
+        age = _age_seconds(session.get('asr_job_submitted_at'))
+
+        try:
+            provider = self._provider(session.get('asr_job_provider') or '')
+        except Exception as e:
+            print(f"[ASRJobs] No provider for session {session_id}: {e}")
+            return False
+
+        if getattr(provider, 'supports_job_polling', False):
+            try:
+                transcription_result = await provider.poll_job(job_id)
+            except ASRJobFailed as e:
+                await self._fail(session, str(e))
+                return False
+            except Exception as e:
+                self._counters['poll_errors'] += 1
+                print(f"[ASRJobs] Status check failed for session {session_id} (job {job_id}): {e}")
+                transcription_result = None
+            if transcription_result is not None:
+                return await self._finalize(session, transcription_result)
+
+        if age > self.timeout_seconds:
+            self._counters['timed_out'] += 1
+            await self._fail(session, f"ASR job {job_id} did not complete within {self.timeout_seconds}s")
+        return False
+
+    # ------------------------------------------------------------------
+    # Callback
+    # ------------------------------------------------------------------
+
+    async def handle_callback(self, session_id: str, payload: Dict[str, Any], query: Dict[str, str]) -> str:
+        """
+        Finalize a session from a provider callback (signature already verified)
+
+        Returns:
+            'finalized', 'failed', 'pending' (job not done yet), 'already_finalized',
+            'stale' (callback for a superseded job) or 'ignored' (no pending job)
+        """
+        self._counters['callbacks'] += 1
+        result = await run_query(
+            self.supabase.table('business_interview_sessions')
+            .select(PENDING_ASR_COLUMNS)
+            .eq('id', session_id)
+        )
+        session = (result.data or [None])[0]
+        if not session or not session.get('asr_job_id'):
+            return 'ignored'
+
+        provider = self._provider(session.get('asr_job_provider') or '')
+        job_id = provider.callback_job_id(payload, query)
+        if job_id != session['asr_job_id']:
+            print(f"[ASRJobs] Ignoring callback for job {job_id} (session {session_id} waits for {session['asr_job_id']})")
+            return 'stale'
+
+        try:
+            transcription_result = await provider.callback_result(job_id, payload)
+        except ASRJobFailed as e:
+            return 'failed' if await self._fail(session, str(e)) else 'already_finalized'
+        if transcription_result is None:
+            return 'pending'
+        return 'finalized' if await self._finalize(session, transcription_result) else 'already_finalized'
+
+    # ------------------------------------------------------------------
+    # Finalize
+    # ------------------------------------------------------------------
+
+    async def _finalize(self, session: Dict[str, Any], transcription_result: Dict[str, Any]) -> bool:
+        from services.background_tasks import finalize_asr_job
+
+        finalized = await asyncio.to_thread(
+            finalize_asr_job,
+            self.supabase,
+            session['id'],
+            session['asr_job_id'],
+            transcription_result,
+            _age_seconds(session.get('asr_job_submitted_at')),
+            self.sqs_queue_url,
+            session.get('asr_audio_preprocess'),
+            session.get('asr_cache_key'),
+            session.get('asr_job_provider')
+        )
+        if finalized:
+            self._counters['finalized'] += 1
+        return finalized
+
+    async def _fail(self, session: Dict[str, Any], error: str) -> bool:
+        from services.background_tasks import fail_asr_job
+
+        failed = await asyncio.to_thread(fail_asr_job, self.supabase, session['id'], session['asr_job_id'], error)
+        if failed:
+            self._counters['failed'] += 1
+        return failed
+
+    def stats(self) -> Dict[str, Any]:
+        stats = dict(self._counters)
+        stats['pending'] = self._pending
+        stats['providers'] = sorted(self._providers)
+        stats['callback_enabled'] = ASR_CALLBACK_ENABLED
+        return stats
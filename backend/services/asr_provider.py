@@ -1,20 +1,50 @@
 import os
 import time
-from typing import BinaryIO, Dict, Any
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from typing import BinaryIO, Dict, Any, Optional
+from tenacity import AsyncRetrying, stop_after_attempt, wait_exponential, retry_if_exception
 import logging
 
+import httpx
+
+from services.asr_providers import BaseASRProvider
+from services.asr_providers.pool import LoopClientPool, SharedAsyncHTTPTransport
+from services.audio_source import aiter_audio
+
 logger = logging.getLogger(__name__)
 
-class DeepgramASRService:
+# Prerecorded requests return only when the transcript is ready (SDK default read timeout is 30s)
+DEEPGRAM_TIMEOUT_SECONDS = float(os.getenv("DEEPGRAM_TIMEOUT_SECONDS", "600"))
+
+
+def _is_transient(error: BaseException) -> bool:
+    """Network errors, timeouts, 429 and 5xx are retried; other API errors are not"""
+    if isinstance(error, httpx.TransportError):
+        return True
+    status = getattr(error, 'status', None)
+    try:
+        status = int(status)
+    except (TypeError, ValueError):
+        return False
+    return status == 429 or status >= 500
+
+
+class DeepgramASRService(BaseASRProvider):
     """Deepgram ASR Service for Business API
 
     Supported models:
     - nova-2: Latest high-accuracy model (default)
     - nova-3: Newest model (if available)
     - whisper: OpenAI Whisper via Deepgram
+
+    Uses the SDK's async REST client, so concurrent transcriptions share one
+    event loop (and one pooled transport per loop) without blocking it.
     """
 
+    provider_name = "deepgram"
+    supports_url_source = True
+    # Deepgram has no job status API: async results only arrive via callback
+    supports_job_callback = True
+
     def __init__(self, model: str = "nova-2"):
         from deepgram import DeepgramClient
 
@@ -23,14 +53,70 @@ class DeepgramASRService:
             raise ValueError("DEEPGRAM_API_KEY environment variable not set")
 
         self.client = DeepgramClient(api_key=api_key)
+        self._rest = self.client.listen.asyncrest.v("1")
         self._model = model
+        # The SDK opens a new httpx.AsyncClient per request; a shared transport per
+        # loop keeps its connection pool (keep-alive, TLS sessions) across requests
+        self._transports = LoopClientPool(
+            lambda: SharedAsyncHTTPTransport(retries=1),
+            lambda transport: transport.shutdown()
+        )
+        self._timeout = httpx.Timeout(DEEPGRAM_TIMEOUT_SECONDS, connect=10.0)
         logger.info(f"Deepgram API initialized: model={model}")
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type(Exception)
-    )
+    async def aclose(self) -> None:
+        await self._transports.aclose()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        return self._transports.stats()
+
+    def cache_fingerprint(self) -> Dict[str, Any]:
+        return {'model': self._model, 'options': self._options().to_dict()}
+
+    async def _request(
+        self,
+        method_name: str,
+        audio_url: Optional[str] = None,
+        audio_file: Optional[BinaryIO] = None,
+        **kwargs
+    ):
+        """
+        Call an async REST method with retries on transient errors
+
+        The source is rebuilt per attempt: an uploaded file is streamed from
+        position 0 again as a new async iterator.
+        """
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(3),
+            wait=wait_exponential(multiplier=1, min=2, max=10),
+            retry=retry_if_exception(_is_transient),
+            reraise=True
+        ):
+            with attempt:
+                source = {"url": audio_url} if audio_url else {"stream": aiter_audio(audio_file)}
+                return await getattr(self._rest, method_name)(
+                    source=source,
+                    options=self._options(),
+                    timeout=self._timeout,
+                    transport=self._transports.get(),
+                    **kwargs
+                )
+
+    def _options(self):
+        from deepgram import PrerecordedOptions
+
+        return PrerecordedOptions(
+            model=self._model,
+            language="ja",  # Japanese
+            detect_language=False,  # Disable auto-detection (ja is specified)
+            punctuate=True,  # Auto punctuation
+            diarize=True,    # Speaker diarization
+            smart_format=True,  # Smart formatting (dates, numbers)
+            utterances=True,  # Utterance segmentation
+            paragraphs=True,  # Paragraph detection
+            filler_words=True,  # Detect filler words (um, uh, etc.)
+        )
+
     async def transcribe_audio(
         self,
         audio_file: BinaryIO,
@@ -40,103 +126,126 @@ class DeepgramASRService:
         try:
             start_time = time.time()
 
-            # Reset file pointer and read audio data
-            audio_file.seek(0)
-            audio_data = audio_file.read()
-
-            # Deepgram API options
-            from deepgram import PrerecordedOptions
-
-            options = PrerecordedOptions(
-                model=self._model,
-                language="ja",  # Japanese
-                detect_language=False,  # Disable auto-detection (ja is specified)
-                punctuate=True,  # Auto punctuation
-                diarize=True,    # Speaker diarization
-                smart_format=True,  # Smart formatting (dates, numbers)
-                utterances=True,  # Utterance segmentation
-                paragraphs=True,  # Paragraph detection
-                filler_words=True,  # Detect filler words (um, uh, etc.)
-            )
-
-            # Call Deepgram API
-            response = self.client.listen.rest.v("1").transcribe_file(
-                source={"buffer": audio_data},
-                options=options
-            )
-
-            processing_time = time.time() - start_time
-
-            # Extract transcription text
-            if not response or not response.results:
-                return {
-                    "transcription": "",
-                    "processing_time": round(processing_time, 2),
-                    "confidence": 0.0,
-                    "word_count": 0,
-                    "no_speech_detected": True
-                }
-
-            channels = response.results.channels
-            if not channels or len(channels) == 0:
-                return {
-                    "transcription": "",
-                    "processing_time": round(processing_time, 2),
-                    "confidence": 0.0,
-                    "word_count": 0,
-                    "no_speech_detected": True
-                }
-
-            # Get transcript from first channel
-            alternatives = channels[0].alternatives
-            if not alternatives or len(alternatives) == 0:
-                return {
-                    "transcription": "",
-                    "processing_time": round(processing_time, 2),
-                    "confidence": 0.0,
-                    "word_count": 0,
-                    "no_speech_detected": True
-                }
-
-            transcript = alternatives[0].transcript
-            confidence = alternatives[0].confidence
-            word_count = len(transcript) if transcript else 0  # Character count for Japanese
-
-            # Extract utterances with speaker info
-            utterances = []
-            if hasattr(response.results, 'utterances') and response.results.utterances:
-                for utt in response.results.utterances:
-                    utterances.append({
-                        "start": round(utt.start, 2) if hasattr(utt, 'start') else 0,
-                        "end": round(utt.end, 2) if hasattr(utt, 'end') else 0,
-                        "confidence": round(utt.confidence, 2) if hasattr(utt, 'confidence') else 0,
-                        "transcript": utt.transcript if hasattr(utt, 'transcript') else "",
-                        "speaker": utt.speaker if hasattr(utt, 'speaker') else None,
-                    })
+            # The file is streamed to the API in chunks (not read into memory)
+            response = await self._request("transcribe_file", audio_file=audio_file)
 
-            # Extract paragraphs
-            paragraphs = []
-            if hasattr(response.results, 'paragraphs') and response.results.paragraphs:
-                if hasattr(response.results.paragraphs, 'paragraphs'):
-                    for para in response.results.paragraphs.paragraphs:
-                        paragraphs.append({
-                            "start": round(para.start, 2) if hasattr(para, 'start') else 0,
-                            "end": round(para.end, 2) if hasattr(para, 'end') else 0,
-                            "transcript": para.text if hasattr(para, 'text') else "",
-                        })
+            return self._build_result(response, time.time() - start_time)
 
-            return {
-                "transcription": transcript,
-                "processing_time": round(processing_time, 2),
-                "confidence": round(confidence, 2),
-                "word_count": word_count,
-                "utterances": utterances,
-                "paragraphs": paragraphs,
-                "speaker_count": len(set(u.get('speaker') for u in utterances if u.get('speaker') is not None)) if utterances else 0,
-                "no_speech_detected": False,
-                "model": self._model,
-            }
+        except Exception as e:
+            logger.error(f"Deepgram API error: {str(e)}")
+            raise
+
+    async def transcribe_url(
+        self,
+        audio_url: str,
+        filename: str
+    ) -> Dict[str, Any]:
+        """Transcribe audio that Deepgram fetches from a (presigned) URL"""
+        try:
+            start_time = time.time()
+
+            response = await self._request("transcribe_url", audio_url=audio_url)
+
+            return self._build_result(response, time.time() - start_time)
 
         except Exception as e:
             logger.error(f"Deepgram API error: {str(e)}")
             raise
+
+    async def submit_job(
+        self,
+        filename: str,
+        audio_url: Optional[str] = None,
+        audio_file: Optional[BinaryIO] = None,
+        callback_url: Optional[str] = None
+    ) -> str:
+        """Submit with a callback URL; Deepgram POSTs the full response there (returns request_id)"""
+        if not callback_url:
+            raise ValueError("Deepgram async jobs require a callback URL")
+
+        if audio_url:
+            response = await self._request("transcribe_url_callback", audio_url=audio_url, callback=callback_url)
+        else:
+            response = await self._request("transcribe_file_callback", audio_file=audio_file, callback=callback_url)
+        return response.request_id
+
+    def callback_job_id(self, payload: Dict[str, Any], query: Dict[str, str]) -> Optional[str]:
+        return (payload.get('metadata') or {}).get('request_id')
+
+    async def callback_result(self, job_id: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        import json
+        from deepgram import PrerecordedResponse
+
+        # processing_time is set by the finalizer (time since submission)
+        return self._build_result(PrerecordedResponse.from_json(json.dumps(payload)), 0.0)
+
+    def _build_result(self, response, processing_time: float) -> Dict[str, Any]:
+        # Extract transcription text
+        if not response or not response.results:
+            return {
+                "transcription": "",
+                "processing_time": round(processing_time, 2),
+                "confidence": 0.0,
+                "word_count": 0,
+                "no_speech_detected": True
+            }
+
+        channels = response.results.channels
+        if not channels or len(channels) == 0:
+            return {
+                "transcription": "",
+                "processing_time": round(processing_time, 2),
+                "confidence": 0.0,
+                "word_count": 0,
+                "no_speech_detected": True
+            }
+
+        # Get transcript from first channel
+        alternatives = channels[0].alternatives
+        if not alternatives or len(alternatives) == 0:
+            return {
+                "transcription": "",
+                "processing_time": round(processing_time, 2),
+                "confidence": 0.0,
+                "word_count": 0,
+                "no_speech_detected": True
+            }
+
+        transcript = alternatives[0].transcript
+        confidence = alternatives[0].confidence
+        word_count = len(transcript) if transcript else 0  # Character count for Japanese
+
+        # Extract utterances with speaker info
+        utterances = []
+        if hasattr(response.results, 'utterances') and response.results.utterances:
+            for utt in response.results.utterances:
+                utterances.append({
+                    "start": round(utt.start, 2) if hasattr(utt, 'start') else 0,
+                    "end": round(utt.end, 2) if hasattr(utt, 'end') else 0,
+                    "confidence": round(utt.confidence, 2) if hasattr(utt, 'confidence') else 0,
+                    "transcript": utt.transcript if hasattr(utt, 'transcript') else "",
+                    "speaker": utt.speaker if hasattr(utt, 'speaker') else None,
+                })
+
+        # Extract paragraphs
+        paragraphs = []
+        if hasattr(response.results, 'paragraphs') and response.results.paragraphs:
+            if hasattr(response.results.paragraphs, 'paragraphs'):
+                for para in response.results.paragraphs.paragraphs:
+                    paragraphs.append({
+                        "start": round(para.start, 2) if hasattr(para, 'start') else 0,
+                        "end": round(para.end, 2) if hasattr(para, 'end') else 0,
+                        "transcript": para.text if hasattr(para, 'text') else "",
+                    })
+
+        return {
+            "transcription": transcript,
+            "processing_time": round(processing_time, 2),
+            "confidence": round(confidence, 2),
+            "word_count": word_count,
+            "utterances": utterances,
+            "paragraphs": paragraphs,
+            "speaker_count": len(set(u.get('speaker') for u in utterances if u.get('speaker') is not None)) if utterances else 0,
+            "no_speech_detected": False,
+            "model": self._model,
+        }
@@ -8,12 +8,26 @@ Supported providers:
 - Azure Speech (standard)
 """
 
-from typing import BinaryIO, Dict, Any
+from typing import BinaryIO, Dict, Any, Optional
 from abc import ABC, abstractmethod
 
+
+class ASRJobFailed(Exception):
+    """Raised when a submitted ASR job ended without a transcript (rejected, expired, fetch error)"""
+
+
 class BaseASRProvider(ABC):
     """Base class for all ASR providers"""
 
+    # ASR_PROVIDER name (stored with async jobs to pick the provider that finalizes them)
+    provider_name = "unknown"
+    # True if the provider can fetch the audio itself (transcribe_url)
+    supports_url_source = False
+    # Async job lifecycle (submit_job): results retrievable by poll_job() and/or
+    # delivered to a callback URL
+    supports_job_polling = False
+    supports_job_callback = False
+
     @abstractmethod
     async def transcribe_audio(
         self,
@@ -23,6 +37,12 @@ class BaseASRProvider(ABC):
         """
         Transcribe audio file
 
+        Args:
+            audio_file: Seekable binary file (a spooled temp file for S3 recordings,
+                see services/audio_source.py). Providers should stream it to the API
+                rather than read() the whole recording into memory.
+            filename: Original file name / S3 key
+
         Returns:
         {
             "transcription": str,
@@ -38,3 +58,59 @@ class BaseASRProvider(ABC):
         }
         """
         pass
+
+    async def transcribe_url(
+        self,
+        audio_url: str,
+        filename: str
+    ) -> Dict[str, Any]:
+        """
+        Transcribe audio fetched by the provider from a URL (presigned S3 GET URL)
+
+        Same return value as transcribe_audio(). Only called when
+        supports_url_source is True; otherwise the caller uploads the bytes.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support URL sources")
+
+    async def submit_job(
+        self,
+        filename: str,
+        audio_url: Optional[str] = None,
+        audio_file: Optional[BinaryIO] = None,
+        callback_url: Optional[str] = None
+    ) -> str:
+        """
+        Submit a transcription job and return the provider job id without waiting
+
+        Exactly one of audio_url / audio_file is given. callback_url is only
+        passed to providers with supports_job_callback.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support async jobs")
+
+    async def poll_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Result of a submitted job (same format as transcribe_audio), or None while it is running
+
+        Raises:
+            ASRJobFailed: If the job finished without a transcript
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support job polling")
+
+    def cache_fingerprint(self) -> Dict[str, Any]:
+        """Model and request options that change the result (part of the ASR result cache key)"""
+        return {'model': getattr(self, '_model', None)}
+
+    def callback_job_id(self, payload: Dict[str, Any], query: Dict[str, str]) -> Optional[str]:
+        """Provider job id of a callback request (JSON body + query parameters)"""
+        return query.get('id') or payload.get('id')
+
+    async def callback_result(self, job_id: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Result for a callback request; by default the job is polled once"""
+        return await self.poll_job(job_id)
+
+    async def aclose(self) -> None:
+        """Release pooled connections (called once on app shutdown by the registry)"""
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Connection pool statistics for GET /api/metrics"""
+        return {}
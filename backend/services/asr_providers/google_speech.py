@@ -1,12 +1,23 @@
+import asyncio
 import os
 import time
+import uuid
 from typing import BinaryIO, Dict, Any
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 import logging
 
+from services.asr_providers import BaseASRProvider
+from services.asr_providers.utterances import WordColumns, group_utterances
+
 logger = logging.getLogger(__name__)
 
-class GoogleSpeechASRService:
+# Long audio: recordings are staged here for BatchRecognize (unset = inline recognize, short audio only)
+GOOGLE_SPEECH_GCS_BUCKET = os.getenv("GOOGLE_SPEECH_GCS_BUCKET", "")
+GOOGLE_SPEECH_GCS_PREFIX = os.getenv("GOOGLE_SPEECH_GCS_PREFIX", "asr-staging")
+GOOGLE_SPEECH_POLL_SECONDS = float(os.getenv("GOOGLE_SPEECH_POLL_SECONDS", "10"))
+GOOGLE_SPEECH_BATCH_TIMEOUT_SECONDS = int(os.getenv("GOOGLE_SPEECH_BATCH_TIMEOUT_SECONDS", str(3 * 60 * 60)))
+
+class GoogleSpeechASRService(BaseASRProvider):
     """Google Cloud Speech-to-Text ASR Service
 
     Supported models:
@@ -16,6 +27,10 @@ class GoogleSpeechASRService:
     - latest_short: Short-form audio (< 1 minute)
     """
 
+    provider_name = "google"
+    # Speech-to-Text only reads gs:// URIs, not presigned S3 URLs: always upload
+    supports_url_source = False
+
     def __init__(self, model: str = "chirp_2"):
         from google.cloud import speech_v2
         from google.api_core.client_options import ClientOptions
@@ -33,9 +48,15 @@ class GoogleSpeechASRService:
             api_endpoint=f"{self._location}-speech.googleapis.com"
         )
         self.client = speech_v2.SpeechClient(client_options=client_options)
+        self._recognizer = f"projects/{self._project_id}/locations/{self._location}/recognizers/business-interview-recognizer"
+        self._storage_client = None
 
         logger.info(f"Google Speech API initialized: model={model}, location={self._location}")
 
+    def cache_fingerprint(self) -> Dict[str, Any]:
+        config = self._recognition_config()
+        return {'model': self._model, 'recognizer': self._recognizer, 'config': type(config).to_json(config)}
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
@@ -46,143 +67,160 @@ class GoogleSpeechASRService:
         audio_file: BinaryIO,
         filename: str
     ) -> Dict[str, Any]:
-        """Transcribe audio file using Google Cloud Speech-to-Text API with retry"""
+        """Transcribe audio file using Google Cloud Speech-to-Text API with retry
+
+        With GOOGLE_SPEECH_GCS_BUCKET set, recordings are staged in GCS and
+        transcribed with BatchRecognize (full-length interviews); otherwise the
+        inline recognize call (short audio only) is used.
+        """
         try:
             start_time = time.time()
 
-            # Reset file pointer and read audio data
-            audio_file.seek(0)
-            audio_data = audio_file.read()
-
-            from google.cloud import speech_v2
-
-            # Prepare request
-            config = speech_v2.RecognitionConfig(
-                auto_decoding_config=speech_v2.AutoDetectDecodingConfig(),
-                language_codes=["ja-JP"],
-                model=self._model,
-                features=speech_v2.RecognitionFeatures(
-                    enable_automatic_punctuation=True,
-                    enable_word_time_offsets=True,
-                    enable_word_confidence=True,
-                )
-            )
+            if GOOGLE_SPEECH_GCS_BUCKET:
+                results = await self._batch_recognize(audio_file, filename)
+            else:
+                results = await self._recognize_inline(audio_file)
+
+            return self._build_result(results, time.time() - start_time)
 
-            request = speech_v2.RecognizeRequest(
-                recognizer=f"projects/{self._project_id}/locations/{self._location}/recognizers/business-interview-recognizer",
-                config=config,
-                content=audio_data,
+        except Exception as e:
+            logger.error(f"Google Speech API error: {str(e)}")
+            raise
+
+    def _recognition_config(self):
+        from google.cloud import speech_v2
+
+        return speech_v2.RecognitionConfig(
+            auto_decoding_config=speech_v2.AutoDetectDecodingConfig(),
+            language_codes=["ja-JP"],
+            model=self._model,
+            features=speech_v2.RecognitionFeatures(
+                enable_automatic_punctuation=True,
+                enable_word_time_offsets=True,
+                enable_word_confidence=True,
             )
+        )
+
+    async def _recognize_inline(self, audio_file: BinaryIO):
+        from google.cloud import speech_v2
+
+        # Reset file pointer and read audio data
+        # (inline recognize only accepts small payloads, so this read is bounded by the API limit)
+        audio_file.seek(0)
+        audio_data = audio_file.read()
+
+        request = speech_v2.RecognizeRequest(
+            recognizer=self._recognizer,
+            config=self._recognition_config(),
+            content=audio_data,
+        )
 
-            # Call Google Speech API
-            response = self.client.recognize(request=request)
-
-            processing_time = time.time() - start_time
-
-            # Extract transcription text and metadata
-            if not response.results:
-                return {
-                    "transcription": "",
-                    "processing_time": round(processing_time, 2),
-                    "confidence": 0.0,
-                    "word_count": 0,
-                    "utterances": [],
-                    "paragraphs": [],
-                    "speaker_count": 0,
-                    "no_speech_detected": True,
-                    "model": self._model,
-                    "provider": "google",
-                }
-
-            # Combine all transcripts
-            full_transcript = ""
-            total_confidence = 0.0
-            utterances = []
-            speaker_set = set()
-
-            for result in response.results:
-                if not result.alternatives:
-                    continue
-
-                alternative = result.alternatives[0]
-                full_transcript += alternative.transcript
-                total_confidence += alternative.confidence
-
-                # Extract speaker-tagged utterances
-                if hasattr(alternative, 'words') and alternative.words:
-                    current_speaker = None
-                    current_utterance = {
-                        "words": [],
-                        "start": 0,
-                        "end": 0,
-                        "speaker": None
-                    }
-
-                    for word_info in alternative.words:
-                        speaker_tag = getattr(word_info, 'speaker_tag', 0) if hasattr(word_info, 'speaker_tag') else 0
-                        speaker_set.add(speaker_tag)
-
-                        if current_speaker is None:
-                            current_speaker = speaker_tag
-                            current_utterance["speaker"] = speaker_tag
-                            current_utterance["start"] = word_info.start_offset.total_seconds()
-
-                        if speaker_tag != current_speaker:
-                            # Speaker changed - save previous utterance
-                            current_utterance["end"] = current_utterance["words"][-1]["end"]
-                            current_utterance["transcript"] = "".join([w["word"] for w in current_utterance["words"]])
-                            current_utterance["confidence"] = sum([w["confidence"] for w in current_utterance["words"]]) / len(current_utterance["words"])
-                            utterances.append(current_utterance)
-
-                            # Start new utterance
-                            current_speaker = speaker_tag
-                            current_utterance = {
-                                "words": [],
-                                "start": word_info.start_offset.total_seconds(),
-                                "end": 0,
-                                "speaker": speaker_tag
-                            }
-
-                        current_utterance["words"].append({
-                            "word": word_info.word,
-                            "start": word_info.start_offset.total_seconds(),
-                            "end": word_info.end_offset.total_seconds(),
-                            "confidence": word_info.confidence
-                        })
-
-                    # Add last utterance
-                    if current_utterance["words"]:
-                        current_utterance["end"] = current_utterance["words"][-1]["end"]
-                        current_utterance["transcript"] = "".join([w["word"] for w in current_utterance["words"]])
-                        current_utterance["confidence"] = sum([w["confidence"] for w in current_utterance["words"]]) / len(current_utterance["words"])
-                        utterances.append(current_utterance)
-
-            avg_confidence = total_confidence / len(response.results) if response.results else 0.0
-
-            # Clean utterances (remove 'words' field for response)
-            clean_utterances = []
-            for utt in utterances:
-                clean_utterances.append({
-                    "start": round(utt["start"], 2),
-                    "end": round(utt["end"], 2),
-                    "transcript": utt["transcript"],
-                    "speaker": utt["speaker"],
-                    "confidence": round(utt["confidence"], 2)
-                })
+        # Call Google Speech API (blocking gRPC call, off the event loop)
+        response = await asyncio.to_thread(self.client.recognize, request=request)
+        return response.results
+
+    async def _batch_recognize(self, audio_file: BinaryIO, filename: str):
+        """Stage the recording in GCS, run BatchRecognize and poll the operation without blocking"""
+        from google.cloud import speech_v2
+
+        blob = await asyncio.to_thread(self._upload_to_gcs, audio_file, filename)
+        gcs_uri = f"gs://{blob.bucket.name}/{blob.name}"
+        try:
+            request = speech_v2.BatchRecognizeRequest(
+                recognizer=self._recognizer,
+                config=self._recognition_config(),
+                files=[speech_v2.BatchRecognizeFileMetadata(uri=gcs_uri)],
+                recognition_output_config=speech_v2.RecognitionOutputConfig(
+                    inline_response_config=speech_v2.InlineOutputConfig(),
+                ),
+            )
+            operation = await asyncio.to_thread(self.client.batch_recognize, request=request)
+            logger.info(f"Google BatchRecognize started: {operation.operation.name}")
+
+            deadline = time.time() + GOOGLE_SPEECH_BATCH_TIMEOUT_SECONDS
+            while not await asyncio.to_thread(operation.done):
+                if time.time() > deadline:
+                    raise TimeoutError(f"BatchRecognize did not finish within {GOOGLE_SPEECH_BATCH_TIMEOUT_SECONDS}s")
+                await asyncio.sleep(GOOGLE_SPEECH_POLL_SECONDS)
+
+            response = operation.result()
+            file_result = response.results[gcs_uri]
+            if file_result.error and file_result.error.code:
+                raise RuntimeError(f"BatchRecognize failed: {file_result.error.message}")
+            return file_result.inline_result.transcript.results or file_result.transcript.results
+        finally:
+            await asyncio.to_thread(self._delete_from_gcs, blob)
+
+    def _upload_to_gcs(self, audio_file: BinaryIO, filename: str):
+        from google.cloud import storage
+
+        if self._storage_client is None:
+            self._storage_client = storage.Client(project=self._project_id)
+        name = f"{GOOGLE_SPEECH_GCS_PREFIX}/{uuid.uuid4().hex}/{os.path.basename(filename)}"
+        blob = self._storage_client.bucket(GOOGLE_SPEECH_GCS_BUCKET).blob(name)
+        # Chunked (resumable) upload straight from the spooled file
+        blob.upload_from_file(audio_file, rewind=True)
+        return blob
+
+    def _delete_from_gcs(self, blob) -> None:
+        try:
+            blob.delete()
+        except Exception as e:
+            logger.warning(f"Failed to delete staged audio gs://{blob.bucket.name}/{blob.name}: {e}")
 
+    def _build_result(self, results, processing_time: float) -> Dict[str, Any]:
+        # Extract transcription text and metadata
+        if not results:
             return {
-                "transcription": full_transcript,
+                "transcription": "",
                 "processing_time": round(processing_time, 2),
-                "confidence": round(avg_confidence, 2),
-                "word_count": len(full_transcript),
-                "utterances": clean_utterances,
-                "paragraphs": [],  # Google Speech v2 doesn't provide paragraph segmentation
-                "speaker_count": len(speaker_set),
-                "no_speech_detected": False,
+                "confidence": 0.0,
+                "word_count": 0,
+                "utterances": [],
+                "paragraphs": [],
+                "speaker_count": 0,
+                "no_speech_detected": True,
                 "model": self._model,
                 "provider": "google",
             }
 
-        except Exception as e:
-            logger.error(f"Google Speech API error: {str(e)}")
-            raise
+        # Combine all transcripts; words go into columns and are grouped in one pass
+        transcripts = []
+        total_confidence = 0.0
+        columns = WordColumns()
+
+        for segment, result in enumerate(results):
+            if not result.alternatives:
+                continue
+
+            alternative = result.alternatives[0]
+            transcripts.append(alternative.transcript)
+            total_confidence += alternative.confidence
+
+            # Speaker-tagged words (an utterance never spans two results)
+            for word_info in alternative.words or ():
+                columns.append(
+                    word_info.word,
+                    word_info.start_offset.total_seconds(),
+                    word_info.end_offset.total_seconds(),
+                    word_info.confidence,
+                    getattr(word_info, 'speaker_tag', 0),
+                    segment
+                )
+
+        full_transcript = "".join(transcripts)
+        avg_confidence = total_confidence / len(results)
+        utterances = group_utterances(columns)
+
+        return {
+            "transcription": full_transcript,
+            "processing_time": round(processing_time, 2),
+            "confidence": round(avg_confidence, 2),
+            "word_count": len(full_transcript),
+            "utterances": utterances,
+            "paragraphs": [],  # Google Speech v2 doesn't provide paragraph segmentation
+            "speaker_count": len(set(columns.speakers)),
+            "no_speech_detected": False,
+            "model": self._model,
+            "provider": "google",
+        }
@@ -0,0 +1,104 @@
+"""
+Connection pooling helpers for ASR providers
+
+- LoopClientPool: one async SDK client per event loop (aiohttp / httpx async
+  pools are bound to the loop they were created on), reused by every job on
+  that loop and closed on shutdown
+- SharedAsyncHTTPTransport: httpx transport whose connection pool survives
+  the per-request httpx.AsyncClient the Deepgram SDK opens and closes
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+
+class LoopClientPool:
+    """Async client per running event loop"""
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        close: Callable[[Any], Awaitable[None]]
+    ):
+        self._factory = factory
+        self._close = close
+        self._clients: Dict[asyncio.AbstractEventLoop, Any] = {}
+        self._lock = threading.Lock()
+        self._created = 0
+        self._requests = 0
+
+    def get(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._requests += 1
+            client = self._clients.get(loop)
+            if client is None:
+                # Loops that finished (asyncio.run) can no longer use their client
+                for closed_loop in [other for other in self._clients if other.is_closed()]:
+                    del self._clients[closed_loop]
+                client = self._factory()
+                self._clients[loop] = client
+                self._created += 1
+            return client
+
+    async def aclose(self, timeout: float = 5.0) -> None:
+        """Close every client on its own loop (clients of stopped loops are dropped)"""
+        with self._lock:
+            clients = list(self._clients.items())
+            self._clients.clear()
+
+        current = asyncio.get_running_loop()
+        for loop, client in clients:
+            try:
+                if loop is current:
+                    await self._close(client)
+                elif loop.is_running():
+                    future = asyncio.run_coroutine_threadsafe(self._close(client), loop)
+                    await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+            except Exception as e:
+                print(f"[ASRPool] Failed to close client: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            clients = list(self._clients.values())
+            stats = {
+                'clients': len(clients),
+                'clients_created': self._created,
+                'requests': self._requests,
+            }
+        # Clients that report their own pool (SharedAsyncHTTPTransport) are summed up
+        for client in clients:
+            client_stats = client.stats() if callable(getattr(client, 'stats', None)) else {}
+            for key, value in client_stats.items():
+                stats[key] = stats.get(key, 0) + value
+        return stats
+
+
+class SharedAsyncHTTPTransport(httpx.AsyncHTTPTransport):
+    """httpx async transport that ignores aclose() from the clients using it (call shutdown())
+
+    The Deepgram SDK opens a new httpx.AsyncClient per request; passing one of
+    these (per event loop, via LoopClientPool) keeps the connection pool.
+    """
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type=None, exc_value=None, traceback=None) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        await super().aclose()
+
+    def stats(self) -> Dict[str, Optional[int]]:
+        connections = list(getattr(self._pool, 'connections', []) or [])
+        return {
+            'connections': len(connections),
+            'idle_connections': sum(1 for connection in connections if connection.is_idle()),
+        }
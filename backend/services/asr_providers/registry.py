@@ -0,0 +1,98 @@
+"""
+Process-wide ASR provider registry
+
+Providers are created once per process and shared by every transcription job,
+the ASR job monitor and the callback endpoint, so their HTTP connection pools
+(TLS sessions, keep-alive connections, auth state) are reused instead of being
+rebuilt per request. Providers must therefore be safe for concurrent use:
+async SDK clients are kept per event loop (pool.LoopClientPool).
+
+The app lifespan calls aclose() on shutdown.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from services.asr_providers import BaseASRProvider
+
+
+def create_asr_provider(provider_name: str) -> BaseASRProvider:
+    if provider_name == "deepgram":
+        from services.asr_provider import DeepgramASRService
+        return DeepgramASRService()
+    elif provider_name == "speechmatics":
+        from services.asr_providers.speechmatics_provider import SpeechmaticsASRService
+        return SpeechmaticsASRService()
+    elif provider_name == "google":
+        from services.asr_providers.google_speech import GoogleSpeechASRService
+        return GoogleSpeechASRService()
+    elif provider_name == "stub":
+        from services.asr_providers.stub_provider import StubASRService
+        return StubASRService()
+    else:
+        raise ValueError(f"Unknown ASR provider: {provider_name}. Supported: deepgram, speechmatics, google, stub")
+
+
+class ASRProviderRegistry:
+    """Lazily created, shared ASR provider instances (one per provider name)"""
+
+    def __init__(self, factory: Callable[[str], BaseASRProvider] = create_asr_provider):
+        self._factory = factory
+        self._providers: Dict[str, BaseASRProvider] = {}
+        self._created_at: Dict[str, float] = {}
+        self._uses: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, provider_name: Optional[str] = None) -> BaseASRProvider:
+        """
+        Shared provider instance (ASR_PROVIDER when no name is given)
+
+        Raises:
+            ValueError: Unknown provider or missing credentials (not cached, so a
+                fixed configuration is picked up on the next call)
+        """
+        provider_name = (provider_name or os.getenv("ASR_PROVIDER", "speechmatics")).lower()
+        with self._lock:
+            provider = self._providers.get(provider_name)
+            if provider is None:
+                provider = self._factory(provider_name)
+                self._providers[provider_name] = provider
+                self._created_at[provider_name] = time.time()
+                self._uses[provider_name] = 0
+            self._uses[provider_name] += 1
+            return provider
+
+    async def aclose(self) -> None:
+        """Close provider connection pools (app shutdown)"""
+        with self._lock:
+            providers = list(self._providers.items())
+            self._providers.clear()
+
+        for provider_name, provider in providers:
+            try:
+                await provider.aclose()
+            except Exception as e:
+                print(f"[ASRRegistry] Failed to close {provider_name}: {e}")
+        if providers:
+            print(f"[ASRRegistry] Closed {len(providers)} ASR provider(s)")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            providers = list(self._providers.items())
+            uses = dict(self._uses)
+            created_at = dict(self._created_at)
+
+        now = time.time()
+        return {
+            provider_name: {
+                'uses': uses.get(provider_name, 0),
+                'age_seconds': round(now - created_at.get(provider_name, now)),
+                'pool': provider.pool_stats(),
+            }
+            for provider_name, provider in providers
+        }
+
+
+asr_registry = ASRProviderRegistry()
@@ -1,21 +1,62 @@
 import os
 import time
-from typing import BinaryIO, Dict, Any
+from typing import BinaryIO, Dict, Any, Optional
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 import logging
 
+from services.asr_providers import ASRJobFailed, BaseASRProvider
+from services.asr_providers.pool import LoopClientPool
+from services.asr_providers.utterances import WordColumns, group_utterances
+
 logger = logging.getLogger(__name__)
 
-class SpeechmaticsASRService:
+# A pause at least this long starts a new utterance even without a speaker change
+SPEECHMATICS_UTTERANCE_GAP_SECONDS = float(os.getenv("SPEECHMATICS_UTTERANCE_GAP_SECONDS", "0.8"))
+
+class SpeechmaticsASRService(BaseASRProvider):
     """Speechmatics ASR Service using new speechmatics-batch SDK"""
 
+    provider_name = "speechmatics"
+    supports_url_source = True
+    supports_job_polling = True
+    supports_job_callback = True
+
     def __init__(self):
         api_key = os.getenv("SPEECHMATICS_API_KEY")
         if not api_key:
             raise ValueError("SPEECHMATICS_API_KEY environment variable not set")
         self.api_key = api_key
+        # One AsyncClient (aiohttp session) per event loop, shared by all jobs on it
+        self._clients = LoopClientPool(self._create_client, lambda client: client.close())
         logger.info("Speechmatics API initialized")
 
+    def _create_client(self):
+        from speechmatics.batch import AsyncClient
+        return AsyncClient(api_key=self.api_key)
+
+    async def aclose(self) -> None:
+        await self._clients.aclose()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        return self._clients.stats()
+
+    def cache_fingerprint(self) -> Dict[str, Any]:
+        return {'model': 'speechmatics-batch', 'config': self._transcription_config().to_dict()}
+
+    def _transcription_config(self):
+        from speechmatics.batch import TranscriptionConfig
+
+        # Configure with diarization (following official example)
+        return TranscriptionConfig(
+            language="ja",
+            diarization="speaker",
+            enable_entities=True,
+            speaker_diarization_config={
+                "speaker_sensitivity": 0.5,
+                "prefer_current_speaker": False
+            }
+        )
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
@@ -28,74 +69,135 @@ class SpeechmaticsASRService:
     ) -> Dict[str, Any]:
         """Transcribe audio file using Speechmatics Batch API"""
         try:
-            from speechmatics.batch import AsyncClient, TranscriptionConfig, FormatType
-
             start_time = time.time()
             audio_file.seek(0)
 
-            # Create client
-            client = AsyncClient(api_key=self.api_key)
-
-            # Configure with diarization (following official example)
-            config = TranscriptionConfig(
-                language="ja",
-                diarization="speaker",
-                enable_entities=True,
-                speaker_diarization_config={
-                    "speaker_sensitivity": 0.5,
-                    "prefer_current_speaker": False
-                }
-            )
+            client = self._clients.get()
 
             # Submit and wait (following official example)
-            job = await client.submit_job(audio_file, transcription_config=config)
+            job = await client.submit_job(audio_file, transcription_config=self._transcription_config())
+            result = await client.wait_for_completion(job.id)
+
+            return self._build_result(result, time.time() - start_time)
+
+        except Exception as e:
+            logger.error(f"Speechmatics API error: {str(e)}")
+            raise
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception_type(Exception)
+    )
+    async def transcribe_url(
+        self,
+        audio_url: str,
+        filename: str
+    ) -> Dict[str, Any]:
+        """Transcribe audio that Speechmatics fetches from a (presigned) URL (fetch_data)"""
+        try:
+            from speechmatics.batch import FetchData, JobConfig, JobType
+
+            start_time = time.time()
+
+            client = self._clients.get()
+
+            config = JobConfig(
+                type=JobType.TRANSCRIPTION,
+                transcription_config=self._transcription_config(),
+                fetch_data=FetchData(url=audio_url)
+            )
+            job = await client.submit_job(None, config=config)
             result = await client.wait_for_completion(job.id)
-            await client.close()
-
-            processing_time = time.time() - start_time
-
-            # Use official response object properties
-            transcript_text = result.transcript_text if hasattr(result, 'transcript_text') else ""
-
-            if not transcript_text:
-                return {
-                    "transcription": "",
-                    "processing_time": round(processing_time, 2),
-                    "confidence": 0.0,
-                    "word_count": 0,
-                    "utterances": [],
-                    "paragraphs": [],
-                    "speaker_count": 0,
-                    "no_speech_detected": True,
-                    "model": "speechmatics-batch",
-                    "provider": "speechmatics",
-                }
-
-            # Parse result object (following official response structure)
-            utterances = []
-            speaker_set = set()
-
-            # Access results from result object
-            if hasattr(result, 'results'):
-                for item in result.results:
-                    if hasattr(item, 'alternatives') and item.alternatives:
-                        alt = item.alternatives[0]
-                        if hasattr(alt, 'speaker') and alt.speaker:
-                            speaker_set.add(alt.speaker)
 
+            return self._build_result(result, time.time() - start_time)
+
+        except Exception as e:
+            logger.error(f"Speechmatics API error: {str(e)}")
+            raise
+
+    async def submit_job(
+        self,
+        filename: str,
+        audio_url: Optional[str] = None,
+        audio_file: Optional[BinaryIO] = None,
+        callback_url: Optional[str] = None
+    ) -> str:
+        """Submit a batch job without waiting; Speechmatics calls callback_url (?id=&status=) when done"""
+        from speechmatics.batch import FetchData, JobConfig, JobType, NotificationConfig
+
+        config = JobConfig(
+            type=JobType.TRANSCRIPTION,
+            transcription_config=self._transcription_config(),
+            fetch_data=FetchData(url=audio_url) if audio_url else None,
+            notification_config=[NotificationConfig(url=callback_url, contents=['jobinfo'])] if callback_url else None
+        )
+        if audio_file is not None:
+            audio_file.seek(0)
+
+        job = await self._clients.get().submit_job(None if audio_url else audio_file, config=config)
+        return job.id
+
+    async def poll_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        from speechmatics.batch import JobStatus
+
+        client = self._clients.get()
+        job = await client.get_job_info(job_id)
+        if job.status == JobStatus.RUNNING:
+            return None
+        if job.status != JobStatus.DONE:
+            raise ASRJobFailed(f"Speechmatics job {job_id} {job.status.value}")
+        result = await client.get_transcript(job_id)
+
+        # processing_time is set by the finalizer (time since submission)
+        return self._build_result(result, 0.0)
+
+    def _build_result(self, result, processing_time: float) -> Dict[str, Any]:
+        # Use official response object properties
+        transcript_text = result.transcript_text if hasattr(result, 'transcript_text') else ""
+
+        if not transcript_text:
             return {
-                "transcription": transcript_text,
+                "transcription": "",
                 "processing_time": round(processing_time, 2),
-                "confidence": 0.95,
-                "word_count": len(transcript_text),
-                "utterances": utterances,
+                "confidence": 0.0,
+                "word_count": 0,
+                "utterances": [],
                 "paragraphs": [],
-                "speaker_count": len(speaker_set),
-                "no_speech_detected": False,
+                "speaker_count": 0,
+                "no_speech_detected": True,
                 "model": "speechmatics-batch",
                 "provider": "speechmatics",
             }
 
-        except Exception as e:
-            logger.error(f"Speechmatics API error: {str(e)}")
-            raise
+        # Words / punctuation -> speaker turns, also split at pauses (like Deepgram utterances)
+        columns = WordColumns()
+        segment = 0
+        previous_end = None
+        for item in result.results or ():
+            if not item.alternatives:
+                continue
+            alt = item.alternatives[0]
+            start = item.start_time or 0.0
+            end = item.end_time or start
+            if item.type != 'punctuation' and previous_end is not None and start - previous_end >= SPEECHMATICS_UTTERANCE_GAP_SECONDS:
+                segment += 1
+            previous_end = end
+            columns.append(alt.content or '', start, end, alt.confidence or 0.0, alt.speaker, segment)
+
+        utterances = group_utterances(columns)
+        speaker_set = {speaker for speaker in columns.speakers if speaker}
+        confidence = sum(columns.confidences) / len(columns) if len(columns) else 0.0
+
+        return {
+            "transcription": transcript_text,
+            "processing_time": round(processing_time, 2),
+            "confidence": round(confidence, 2),
+            "word_count": len(transcript_text),
+            "utterances": utterances,
+            "paragraphs": [],
+            "speaker_count": len(speaker_set),
+            "no_speech_detected": False,
+            "model": "speechmatics-batch",
+            "provider": "speechmatics",
+        }
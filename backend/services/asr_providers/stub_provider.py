@@ -0,0 +1,105 @@
+import asyncio
+import os
+import time
+from typing import BinaryIO, Dict, Any, Optional
+import logging
+
+import httpx
+
+from services.asr_providers import ASRJobFailed, BaseASRProvider
+from services.asr_providers.pool import LoopClientPool
+
+logger = logging.getLogger(__name__)
+
+
+class StubASRService(BaseASRProvider):
+    """Client of the local stub ASR server (backend/stub_asr_server.py)
+
+    For local development: exercises URL submission, job polling and
+    callbacks without a real ASR account. ASR_PROVIDER=stub,
+    STUB_ASR_URL=http://localhost:8090
+    """
+
+    provider_name = "stub"
+    supports_url_source = True
+    supports_job_polling = True
+    supports_job_callback = True
+
+    def __init__(self):
+        self.base_url = os.getenv("STUB_ASR_URL", "http://localhost:8090").rstrip('/')
+        self._clients = LoopClientPool(
+            lambda: httpx.AsyncClient(base_url=self.base_url, timeout=30.0),
+            lambda client: client.aclose()
+        )
+        logger.info(f"Stub ASR initialized: {self.base_url}")
+
+    async def aclose(self) -> None:
+        await self._clients.aclose()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        return self._clients.stats()
+
+    async def submit_job(
+        self,
+        filename: str,
+        audio_url: Optional[str] = None,
+        audio_file: Optional[BinaryIO] = None,
+        callback_url: Optional[str] = None
+    ) -> str:
+        params = {'filename': filename}
+        if callback_url:
+            params['callback_url'] = callback_url
+        if audio_url:
+            params['url'] = audio_url
+
+        client = self._clients.get()
+        if audio_url:
+            response = await client.post("/v1/jobs", params=params)
+        else:
+            # Local stub only: reading the file here is fine
+            audio_file.seek(0)
+            response = await client.post(
+                "/v1/jobs",
+                params=params,
+                content=audio_file.read(),
+                headers={'Content-Type': 'application/octet-stream'}
+            )
+        response.raise_for_status()
+        return response.json()['id']
+
+    async def poll_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        response = await self._clients.get().get(f"/v1/jobs/{job_id}")
+        response.raise_for_status()
+        job = response.json()
+
+        if job['status'] == 'running':
+            return None
+        if job['status'] != 'done':
+            raise ASRJobFailed(f"Stub job {job_id} {job['status']}: {job.get('error')}")
+        return job['result']
+
+    async def _wait(self, job_id: str, start_time: float) -> Dict[str, Any]:
+        while True:
+            result = await self.poll_job(job_id)
+            if result is not None:
+                result['processing_time'] = round(time.time() - start_time, 2)
+                return result
+            await asyncio.sleep(0.5)
+
+    async def transcribe_audio(
+        self,
+        audio_file: BinaryIO,
+        filename: str
+    ) -> Dict[str, Any]:
+        start_time = time.time()
+        job_id = await self.submit_job(filename, audio_file=audio_file)
+        return await self._wait(job_id, start_time)
+
+    async def transcribe_url(
+        self,
+        audio_url: str,
+        filename: str
+    ) -> Dict[str, Any]:
+        start_time = time.time()
+        job_id = await self.submit_job(filename, audio_url=audio_url)
+        return await self._wait(job_id, start_time)
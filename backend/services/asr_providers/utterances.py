@@ -0,0 +1,95 @@
+"""
+Columnar word -> utterance grouping
+
+ASR responses carry one record per word. Instead of building a dict per word
+and re-summing confidences per utterance, providers collect the words into
+parallel columns (WordColumns) and group_utterances() finds utterance
+boundaries with array diffs:
+
+- a new utterance starts where the speaker changes or a new recognition
+  segment (provider result) begins
+- start / end / mean confidence come from index lookups and np.add.reduceat
+  over the boundaries, so the work is linear in the number of words and the
+  only per-utterance Python work is joining its words
+
+Output matches the transcription_metadata.utterances format
+({start, end, transcript, speaker, confidence}).
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+class WordColumns:
+    """Words of a transcript as parallel columns (append per word, then group)"""
+
+    __slots__ = ('words', 'starts', 'ends', 'confidences', 'speakers', 'segments')
+
+    def __init__(self):
+        self.words: List[str] = []
+        self.starts: List[float] = []
+        self.ends: List[float] = []
+        self.confidences: List[float] = []
+        self.speakers: List[Any] = []
+        self.segments: List[int] = []
+
+    def append(
+        self,
+        word: str,
+        start: float,
+        end: float,
+        confidence: float,
+        speaker: Any,
+        segment: int = 0
+    ) -> None:
+        self.words.append(word)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.confidences.append(confidence)
+        self.speakers.append(speaker)
+        self.segments.append(segment)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+
+def utterance_bounds(speakers: np.ndarray, segments: Optional[np.ndarray] = None) -> np.ndarray:
+    """Indices [0, b1, ..., n] where a new utterance starts (speaker or segment change)"""
+    count = len(speakers)
+    if count == 0:
+        return np.zeros(1, dtype=np.intp)
+    changed = speakers[1:] != speakers[:-1]
+    if segments is not None:
+        changed |= segments[1:] != segments[:-1]
+    return np.concatenate(([0], np.flatnonzero(changed) + 1, [count])).astype(np.intp)
+
+
+def group_utterances(columns: WordColumns) -> List[Dict[str, Any]]:
+    """Group consecutive words of the same speaker (within a segment) into utterances"""
+    if not len(columns):
+        return []
+
+    # Speakers may be ints (speaker_tag) or labels (speaker_label); both compare elementwise
+    bounds = utterance_bounds(np.asarray(columns.speakers), np.asarray(columns.segments, dtype=np.int64))
+    first = bounds[:-1]
+    last = bounds[1:] - 1
+
+    starts = np.round(np.asarray(columns.starts, dtype=np.float64)[first], 2)
+    ends = np.round(np.asarray(columns.ends, dtype=np.float64)[last], 2)
+    confidences = np.round(np.add.reduceat(np.asarray(columns.confidences, dtype=np.float64), first) / np.diff(bounds), 2)
+
+    words = columns.words
+    speakers = columns.speakers
+    return [
+        {
+            "start": float(start),
+            "end": float(end),
+            "transcript": "".join(words[begin:stop]),
+            "speaker": speakers[begin],
+            "confidence": float(confidence),
+        }
+        for begin, stop, start, end, confidence in zip(
+            first.tolist(), bounds[1:].tolist(), starts.tolist(), ends.tolist(), confidences.tolist()
+        )
+    ]
@@ -0,0 +1,305 @@
+"""
+Optional audio pre-processing before ASR (AUDIO_PREPROCESS_ENABLED=true)
+
+Browser recordings (RecordingSession.tsx, MediaRecorder webm) contain long
+silences and arrive at whatever bitrate the browser picked. Before upload to
+the ASR provider the recording is:
+
+1. decoded by ffmpeg to 16 kHz mono 16-bit PCM (downmix + resample), written
+   to a temp file so memory stays bounded for long interviews
+2. scanned in blocks with NumPy: per-frame energy (dBFS) against an adaptive
+   threshold (noise floor + AUDIO_VAD_MARGIN_DB, at least
+   AUDIO_VAD_THRESHOLD_DB), speech frames widened by a short hangover
+3. silent runs longer than AUDIO_SILENCE_MIN_SECONDS are shortened to
+   AUDIO_SILENCE_KEEP_SECONDS (half kept at each edge)
+4. the kept spans are re-encoded to Opus (AUDIO_PREPROCESS_BITRATE)
+
+The time remap table ([[processed_seconds, original_seconds], ...], one row
+per kept span) maps provider timestamps back to the original recording;
+remap_transcription() applies it to utterances / paragraphs.
+
+Any failure (ffmpeg missing, undecodable input) falls back to the original
+audio.
+"""
+
+import bisect
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from services.audio_source import AUDIO_DOWNLOAD_CHUNK_BYTES, AUDIO_SPOOL_DIR, SpooledAudioFile, audio_size
+
+
+AUDIO_PREPROCESS_ENABLED = os.getenv("AUDIO_PREPROCESS_ENABLED", "false").lower() == "true"
+AUDIO_PREPROCESS_SAMPLE_RATE = int(os.getenv("AUDIO_PREPROCESS_SAMPLE_RATE", "16000"))
+AUDIO_PREPROCESS_BITRATE = os.getenv("AUDIO_PREPROCESS_BITRATE", "24k")
+AUDIO_VAD_FRAME_MS = int(os.getenv("AUDIO_VAD_FRAME_MS", "30"))
+AUDIO_VAD_THRESHOLD_DB = float(os.getenv("AUDIO_VAD_THRESHOLD_DB", "-50"))
+AUDIO_VAD_MARGIN_DB = float(os.getenv("AUDIO_VAD_MARGIN_DB", "12"))
+AUDIO_VAD_HANGOVER_MS = int(os.getenv("AUDIO_VAD_HANGOVER_MS", "300"))
+AUDIO_SILENCE_MIN_SECONDS = float(os.getenv("AUDIO_SILENCE_MIN_SECONDS", "2.0"))
+AUDIO_SILENCE_KEEP_SECONDS = float(os.getenv("AUDIO_SILENCE_KEEP_SECONDS", "0.6"))
+FFMPEG_BINARY = os.getenv("FFMPEG_BINARY", "ffmpeg")
+
+SAMPLE_BYTES = 2  # s16le
+
+_stats_lock = threading.Lock()
+_stats = {
+    'processed': 0,
+    'failed': 0,
+    'seconds_in': 0.0,
+    'seconds_out': 0.0,
+    'bytes_in': 0,
+    'bytes_out': 0,
+}
+
+
+def _count(key: str, amount=1) -> None:
+    with _stats_lock:
+        _stats[key] += amount
+
+
+def get_preprocess_stats() -> Dict[str, Any]:
+    with _stats_lock:
+        stats = dict(_stats)
+    stats['enabled'] = AUDIO_PREPROCESS_ENABLED
+    stats['seconds_in'] = round(stats['seconds_in'], 1)
+    stats['seconds_out'] = round(stats['seconds_out'], 1)
+    return stats
+
+
+# ------------------------------------------------------------------
+# ffmpeg
+# ------------------------------------------------------------------
+
+def _run_ffmpeg(args: List[str], source: Optional[BinaryIO], output: BinaryIO, feed=None) -> None:
+    """Run ffmpeg writing to `output`; stdin is copied from `source` (or produced by `feed`)"""
+    with tempfile.TemporaryFile(dir=AUDIO_SPOOL_DIR) as stderr:
+        process = subprocess.Popen(
+            [FFMPEG_BINARY, '-nostdin', '-hide_banner', '-loglevel', 'error', *args],
+            stdin=subprocess.PIPE,
+            stdout=output,
+            stderr=stderr
+        )
+        try:
+            if feed is not None:
+                feed(process.stdin)
+            else:
+                source.seek(0)
+                shutil.copyfileobj(source, process.stdin, AUDIO_DOWNLOAD_CHUNK_BYTES)
+        except BrokenPipeError:
+            pass  # ffmpeg exited early; its return code / stderr tell why
+        finally:
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+        returncode = process.wait()
+        if returncode != 0:
+            stderr.seek(0)
+            raise RuntimeError(f"ffmpeg exited with {returncode}: {stderr.read()[-500:].decode(errors='replace').strip()}")
+
+
+def decode_to_pcm(audio_file: BinaryIO, pcm_file: BinaryIO, sample_rate: int = AUDIO_PREPROCESS_SAMPLE_RATE) -> None:
+    """Any input ffmpeg understands -> mono s16le at sample_rate"""
+    _run_ffmpeg(['-i', 'pipe:0', '-vn', '-ac', '1', '-ar', str(sample_rate), '-f', 's16le', 'pipe:1'], audio_file, pcm_file)
+
+
+# ------------------------------------------------------------------
+# Silence detection (vectorized)
+# ------------------------------------------------------------------
+
+def frame_energies_db(pcm_file: BinaryIO, frame_samples: int, block_frames: int = 4096) -> np.ndarray:
+    """Per-frame RMS level (dBFS) of a s16le file, read in blocks (a trailing partial frame is included)"""
+    pcm_file.seek(0)
+    levels = []
+    block_bytes = frame_samples * block_frames * SAMPLE_BYTES
+    while True:
+        data = pcm_file.read(block_bytes)
+        if not data:
+            break
+        samples = np.frombuffer(data[:len(data) - len(data) % SAMPLE_BYTES], dtype='<i2').astype(np.float32)
+        padding = -len(samples) % frame_samples
+        if padding:
+            samples = np.concatenate((samples, np.zeros(padding, dtype=np.float32)))
+        frames = samples.reshape(-1, frame_samples) / 32768.0
+        levels.append(10.0 * np.log10(np.mean(frames * frames, axis=1) + 1e-10))
+    return np.concatenate(levels) if levels else np.zeros(0, dtype=np.float32)
+
+
+def detect_speech(
+    levels_db: np.ndarray,
+    frame_ms: int = AUDIO_VAD_FRAME_MS,
+    threshold_db: float = AUDIO_VAD_THRESHOLD_DB,
+    margin_db: float = AUDIO_VAD_MARGIN_DB,
+    hangover_ms: int = AUDIO_VAD_HANGOVER_MS
+) -> np.ndarray:
+    """Boolean speech mask per frame"""
+    if not len(levels_db):
+        return np.zeros(0, dtype=bool)
+    noise_floor = float(np.percentile(levels_db, 10))
+    speech = levels_db > max(threshold_db, noise_floor + margin_db)
+    hangover = max(0, hangover_ms // frame_ms)
+    if hangover:
+        # Widen speech by `hangover` frames on both sides (word onsets / tails are quiet)
+        kernel = np.ones(2 * hangover + 1, dtype=np.int32)
+        speech = np.convolve(speech.astype(np.int32), kernel, mode='same') > 0
+    return speech
+
+
+def keep_spans(
+    speech: np.ndarray,
+    frame_ms: int = AUDIO_VAD_FRAME_MS,
+    min_silence_seconds: float = AUDIO_SILENCE_MIN_SECONDS,
+    keep_silence_seconds: float = AUDIO_SILENCE_KEEP_SECONDS
+) -> List[Tuple[int, int]]:
+    """
+    Frame spans [start, end) to keep: everything except the middle of
+    silent runs longer than min_silence_seconds
+    """
+    count = len(speech)
+    if not count:
+        return []
+    min_frames = max(1, int(round(min_silence_seconds * 1000 / frame_ms)))
+    edge_frames = int(round(keep_silence_seconds * 1000 / frame_ms)) // 2
+
+    # Silent runs from the edges of the padded mask
+    silent = np.concatenate(([False], ~speech, [False]))
+    edges = np.flatnonzero(np.diff(silent.astype(np.int8)))
+    run_starts, run_ends = edges[0::2], edges[1::2]
+    long_runs = (run_ends - run_starts) >= min_frames
+    cut_starts = run_starts[long_runs] + edge_frames
+    cut_ends = run_ends[long_runs] - edge_frames
+
+    # Leading / trailing silence needs no padding towards the file edge
+    cut_starts = np.where(run_starts[long_runs] == 0, 0, cut_starts)
+    cut_ends = np.where(run_ends[long_runs] == count, count, cut_ends)
+
+    spans = []
+    position = 0
+    for cut_start, cut_end in zip(cut_starts.tolist(), cut_ends.tolist()):
+        if cut_start > position:
+            spans.append((position, cut_start))
+        position = max(position, cut_end)
+    if position < count:
+        spans.append((position, count))
+    return spans
+
+
+# ------------------------------------------------------------------
+# Timestamp remap
+# ------------------------------------------------------------------
+
+def build_time_remap(spans: List[Tuple[int, int]], frame_ms: int = AUDIO_VAD_FRAME_MS) -> List[List[float]]:
+    """[[processed_seconds, original_seconds], ...]: start of each kept span in both timelines"""
+    table = []
+    processed_frames = 0
+    for start, end in spans:
+        table.append([round(processed_frames * frame_ms / 1000, 3), round(start * frame_ms / 1000, 3)])
+        processed_frames += end - start
+    return table
+
+
+def remap_transcription(transcription_result: Dict[str, Any], time_remap: Optional[List[List[float]]]) -> Dict[str, Any]:
+    """Map utterance / paragraph times of a result on processed audio back to the original"""
+    if not time_remap:
+        return transcription_result
+    processed_starts = [row[0] for row in time_remap]
+
+    def remap(seconds):
+        index = max(0, bisect.bisect_right(processed_starts, seconds or 0) - 1)
+        processed_start, original_start = time_remap[index]
+        return round(original_start + ((seconds or 0) - processed_start), 2)
+
+    for key in ('utterances', 'paragraphs'):
+        for segment in transcription_result.get(key) or []:
+            segment['start'] = remap(segment.get('start'))
+            segment['end'] = remap(segment.get('end'))
+    return transcription_result
+
+
+# ------------------------------------------------------------------
+# Pipeline
+# ------------------------------------------------------------------
+
+def encode_spans(pcm_file: BinaryIO, spans: List[Tuple[int, int]], frame_samples: int, output: BinaryIO) -> None:
+    """Frame spans [start, end) of a s16le file, concatenated -> Opus (ogg) in `output`"""
+    frame_bytes = frame_samples * SAMPLE_BYTES
+
+    def feed(stdin) -> None:
+        for start, end in spans:
+            pcm_file.seek(start * frame_bytes)
+            remaining = (end - start) * frame_bytes
+            while remaining > 0:
+                data = pcm_file.read(min(remaining, AUDIO_DOWNLOAD_CHUNK_BYTES))
+                if not data:
+                    break
+                stdin.write(data)
+                remaining -= len(data)
+
+    _run_ffmpeg(
+        [
+            '-f', 's16le', '-ar', str(AUDIO_PREPROCESS_SAMPLE_RATE), '-ac', '1', '-i', 'pipe:0',
+            '-c:a', 'libopus', '-b:a', AUDIO_PREPROCESS_BITRATE, '-application', 'voip', '-f', 'ogg', 'pipe:1'
+        ],
+        None,
+        output,
+        feed=feed
+    )
+
+
+def preprocess_audio(audio_file: BinaryIO, filename: str) -> Tuple[BinaryIO, Optional[List[List[float]]], Dict[str, Any]]:
+    """
+    Trim silences and re-encode (blocking; run with asyncio.to_thread)
+
+    Returns:
+        (audio file for the ASR provider, time remap table, stats). On failure
+        the original file with no remap table; the caller closes a returned
+        file that is not the original.
+    """
+    started = time.time()
+    frame_samples = AUDIO_PREPROCESS_SAMPLE_RATE * AUDIO_VAD_FRAME_MS // 1000
+    base, _ = os.path.splitext(os.path.basename(filename))
+    # ffmpeg writes to the file descriptor (fileno() rolls the spool over to disk)
+    processed = SpooledAudioFile(f"{base}.ogg", prefix='asr-pre-', suffix='.ogg', dir=AUDIO_SPOOL_DIR)
+    try:
+        with tempfile.TemporaryFile(prefix='asr-pcm-', dir=AUDIO_SPOOL_DIR) as pcm_file:
+            decode_to_pcm(audio_file, pcm_file)
+            total_frames = -(-pcm_file.tell() // (frame_samples * SAMPLE_BYTES))
+            speech = detect_speech(frame_energies_db(pcm_file, frame_samples))
+            spans = keep_spans(speech)
+            if not spans:
+                raise ValueError("no speech detected")
+            encode_spans(pcm_file, spans, frame_samples, processed)
+        processed.seek(0)
+    except Exception as e:
+        processed.close()
+        _count('failed')
+        print(f"[Audio] Pre-processing failed, sending original audio: {e}")
+        return audio_file, None, {}
+
+    frame_seconds = AUDIO_VAD_FRAME_MS / 1000
+    stats = {
+        'original_seconds': round(total_frames * frame_seconds, 1),
+        'processed_seconds': round(sum(end - start for start, end in spans) * frame_seconds, 1),
+        'original_bytes': audio_size(audio_file),
+        'processed_bytes': audio_size(processed),
+        'seconds': round(time.time() - started, 2),
+    }
+    _count('processed')
+    _count('seconds_in', stats['original_seconds'])
+    _count('seconds_out', stats['processed_seconds'])
+    _count('bytes_in', stats['original_bytes'])
+    _count('bytes_out', stats['processed_bytes'])
+    print(
+        f"[Audio] Pre-processed {filename}: {stats['original_seconds']}s -> {stats['processed_seconds']}s, "
+        f"{stats['original_bytes'] / (1024 * 1024):.1f} MB -> {stats['processed_bytes'] / (1024 * 1024):.1f} MB "
+        f"in {stats['seconds']}s"
+    )
+    return processed, build_time_remap(spans), stats
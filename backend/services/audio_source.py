@@ -0,0 +1,199 @@
+"""
+Audio source for ASR - S3 object spooled to a temp file
+
+Recordings are copied from S3 in AUDIO_DOWNLOAD_CHUNK_BYTES reads into a
+SpooledTemporaryFile: short recordings stay in memory, anything above
+AUDIO_SPOOL_MAX_MEMORY_MB rolls over to disk. The ASR providers receive the
+file object and stream it to the API, so peak memory per transcription job is
+bounded by the spool size instead of the recording length.
+
+With ASR_AUDIO_SOURCE=url (default) providers that can fetch audio
+themselves (supports_url_source) get a short-lived presigned GET URL instead,
+so the recording never transits this host. If URL submission fails the job
+falls back to the spooled upload.
+"""
+
+import asyncio
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import AsyncIterator, BinaryIO, Dict, Iterator, Optional
+
+
+AUDIO_SPOOL_MAX_MEMORY_MB = int(os.getenv("AUDIO_SPOOL_MAX_MEMORY_MB", "8"))
+AUDIO_DOWNLOAD_CHUNK_BYTES = int(os.getenv("AUDIO_DOWNLOAD_CHUNK_BYTES", str(1024 * 1024)))
+AUDIO_SPOOL_DIR = os.getenv("AUDIO_SPOOL_DIR") or None
+
+# 'url': providers that can fetch audio get a presigned S3 URL (upload as fallback)
+# 'upload': always download and upload the bytes
+ASR_AUDIO_SOURCE = os.getenv("ASR_AUDIO_SOURCE", "url").lower()
+ASR_PRESIGNED_URL_EXPIRES_SECONDS = int(os.getenv("ASR_PRESIGNED_URL_EXPIRES_SECONDS", "900"))
+
+_stats_lock = threading.Lock()
+_stats = {
+    'downloads': 0,
+    'bytes': 0,
+    'spooled_to_disk': 0,
+    'active': 0,
+    'url_submissions': 0,
+    'url_fallbacks': 0,
+}
+
+
+def _count(key: str, amount: int = 1) -> None:
+    with _stats_lock:
+        _stats[key] += amount
+
+
+class SpooledAudioFile(tempfile.SpooledTemporaryFile):
+    """Spooled temp file that reports the recording's file name
+
+    SDKs use file.name as the upload file name; a plain spooled file has None
+    (in memory) or a file descriptor number (rolled over to disk).
+    """
+
+    def __init__(self, filename: str, **kwargs):
+        super().__init__(**kwargs)
+        self.filename = filename
+        _count('active')
+
+    @property
+    def name(self) -> str:
+        return self.filename
+
+    def close(self) -> None:
+        if not self.closed:
+            _count('active', -1)
+        super().close()
+
+
+def spool_stream(
+    body,
+    spool: BinaryIO,
+    chunk_bytes: int = AUDIO_DOWNLOAD_CHUNK_BYTES
+) -> int:
+    """Copy a readable stream (botocore StreamingBody) into spool; returns bytes copied"""
+    size = 0
+    while True:
+        chunk = body.read(chunk_bytes)
+        if not chunk:
+            break
+        spool.write(chunk)
+        size += len(chunk)
+    spool.seek(0)
+    return size
+
+
+def audio_size(audio_file: BinaryIO) -> int:
+    """Size of a seekable audio file object (position is restored)"""
+    position = audio_file.tell()
+    audio_file.seek(0, os.SEEK_END)
+    size = audio_file.tell()
+    audio_file.seek(position)
+    return size
+
+
+def download_s3_audio(
+    s3_client,
+    s3_bucket: str,
+    s3_key: str,
+    max_memory_bytes: Optional[int] = None
+) -> SpooledAudioFile:
+    """
+    Download an S3 object into a spooled temp file (blocking; async callers
+    run it with asyncio.to_thread)
+
+    Returns:
+        Seekable binary file positioned at 0; the caller closes it
+    """
+    if max_memory_bytes is None:
+        max_memory_bytes = AUDIO_SPOOL_MAX_MEMORY_MB * 1024 * 1024
+
+    filename = os.path.basename(s3_key)
+    spool = SpooledAudioFile(
+        filename,
+        max_size=max_memory_bytes,
+        prefix='asr-audio-',
+        suffix=os.path.splitext(filename)[1],
+        dir=AUDIO_SPOOL_DIR
+    )
+    try:
+        response = s3_client.get_object(Bucket=s3_bucket, Key=s3_key)
+        body = response['Body']
+        try:
+            size = spool_stream(body, spool)
+        finally:
+            body.close()
+    except BaseException:
+        spool.close()
+        raise
+
+    on_disk = getattr(spool, '_rolled', False)
+    _count('downloads')
+    _count('bytes', size)
+    if on_disk:
+        _count('spooled_to_disk')
+    print(f"[Audio] Downloaded {s3_key}: {size / (1024 * 1024):.1f} MB ({'disk' if on_disk else 'memory'})")
+    return spool
+
+
+async def aiter_audio(
+    audio_file: BinaryIO,
+    chunk_bytes: int = AUDIO_DOWNLOAD_CHUNK_BYTES
+) -> AsyncIterator[bytes]:
+    """Read a (possibly on-disk) audio file from position 0 in chunks without blocking the loop"""
+    await asyncio.to_thread(audio_file.seek, 0)
+    while True:
+        chunk = await asyncio.to_thread(audio_file.read, chunk_bytes)
+        if not chunk:
+            break
+        yield chunk
+
+
+@contextmanager
+def open_s3_audio(
+    s3_client,
+    s3_bucket: str,
+    s3_key: str,
+    max_memory_bytes: Optional[int] = None
+) -> Iterator[BinaryIO]:
+    """
+    Download an S3 object into a spooled temp file
+
+    Yields:
+        Seekable binary file positioned at 0; closed (and deleted) on exit
+    """
+    spool = download_s3_audio(s3_client, s3_bucket, s3_key, max_memory_bytes)
+    try:
+        yield spool
+    finally:
+        spool.close()
+
+
+def use_url_source(asr_service) -> bool:
+    """Whether this job should hand the provider a presigned URL"""
+    return ASR_AUDIO_SOURCE == 'url' and getattr(asr_service, 'supports_url_source', False)
+
+
+def presign_audio_url(
+    s3_client,
+    s3_bucket: str,
+    s3_key: str,
+    expires_in: int = ASR_PRESIGNED_URL_EXPIRES_SECONDS
+) -> str:
+    """Short-lived presigned GET URL the ASR provider fetches the recording from"""
+    return s3_client.generate_presigned_url(
+        'get_object',
+        Params={'Bucket': s3_bucket, 'Key': s3_key},
+        ExpiresIn=expires_in
+    )
+
+
+def count_url_submission(fallback: bool = False) -> None:
+    _count('url_fallbacks' if fallback else 'url_submissions')
+
+
+def get_audio_source_stats() -> Dict[str, int]:
+    with _stats_lock:
+        return dict(_stats)
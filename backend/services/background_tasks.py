@@ -1,13 +1,42 @@
 import os
 import json
-import io
 import time
 import asyncio
-from datetime import datetime
+from datetime import datetime, timezone
 import boto3
 from supabase import Client
 from services.prompts import build_fact_extraction_prompt, build_fact_structuring_prompt, build_assessment_prompt
-from services.llm_pipeline import execute_llm_phase, format_llm_error_message
+from services.llm_pipeline import (
+    PhaseProgress,
+    aexecute_llm_phase,
+    astream_with_progress,
+    estimate_tokens,
+    format_llm_error_message,
+    parse_llm_output,
+    run_query,
+)
+from services.session_events import publish_session_event
+from services.asr_jobs import build_callback_url, use_async_job
+from services.asr_cache import CACHED_COLUMNS, build_asr_cache_key, lookup_asr_result, store_asr_result
+from services.realtime_drafts import count_draft, draft_version
+from services.transcript_columns import encode_utterances
+from services.audio_preprocess import AUDIO_PREPROCESS_ENABLED, preprocess_audio, remap_transcription
+from services.audio_source import count_url_submission, download_s3_audio, presign_audio_url, use_url_source
+from services.segmented_asr import ASR_SEGMENTED_ENABLED, atranscribe_segmented
+from services.chunked_extraction import arun_chunked_extraction, should_chunk, split_transcript
+from services.sharded_structuring import arun_sharded_structuring
+from services.parallel_assessment import arun_parallel_assessment
+from services.phase_io import (
+    build_projection,
+    read_phase_input,
+    start_phase,
+    with_content_versions,
+    write_phase_result,
+    write_session_status,
+)
+
+# Session columns used by Phase 1 (prompt context + chunk boundaries); avoids select('*') of all phase results
+PHASE1_INPUT_COLUMNS = 'transcription, transcription_metadata, status, attendees, subject_id, staff_id, recorded_at'
 
 
 def transcribe_background(
@@ -17,11 +46,41 @@ def transcribe_background(
     s3_bucket: str,
     supabase: Client,
     asr_service,
-    sqs_queue_url: str
+    sqs_queue_url: str,
+    job=None,
+    refine_draft: bool = False
+):
+    """Background task for audio transcription - sync wrapper around atranscribe_background()"""
+    asyncio.run(atranscribe_background(
+        session_id=session_id,
+        s3_audio_path=s3_audio_path,
+        s3_client=s3_client,
+        s3_bucket=s3_bucket,
+        supabase=supabase,
+        asr_service=asr_service,
+        sqs_queue_url=sqs_queue_url,
+        job=job,
+        refine_draft=refine_draft
+    ))
+
+
+async def atranscribe_background(
+    session_id: str,
+    s3_audio_path: str,
+    s3_client: boto3.client,
+    s3_bucket: str,
+    supabase: Client,
+    asr_service,
+    sqs_queue_url: str,
+    job=None,
+    refine_draft: bool = False
 ):
     """
     Background task for audio transcription
 
+    Runs on the job queue's shared event loop, so concurrent transcriptions
+    reuse the provider's pooled client (services.asr_providers.registry).
+
     Args:
         session_id: Session ID
         s3_audio_path: S3 path to audio file
@@ -30,78 +89,409 @@ def transcribe_background(
         supabase: Supabase client
         asr_service: ASR service instance
         sqs_queue_url: SQS queue URL for completion notification
+        job: JobContext when run from the job queue (skips steps finished by a previous attempt)
+        refine_draft: Session was transcribed from a realtime draft and is already being
+            analyzed; only replace the transcription (see _arefine_draft_transcription)
     """
+    if refine_draft:
+        await _arefine_draft_transcription(session_id, s3_audio_path, s3_client, s3_bucket, supabase, asr_service)
+        return
+
     try:
         print(f"[Background] Starting transcription for session: {session_id}")
         start_time = time.time()
 
-        # Update status to 'transcribing'
+        transcribed = _step_done(job, 'transcribed')
+        # Same recording + provider configuration transcribed before (services/asr_cache.py)
+        cache_key = None if transcribed else await asyncio.to_thread(
+            build_asr_cache_key, s3_client, s3_bucket, s3_audio_path, asr_service
+        )
+
+        if transcribed:
+            print(f"[Background] Transcription already saved by a previous attempt, skipping ASR for session: {session_id}")
+        elif cache_key and await _asave_cached_transcription(session_id, cache_key, supabase):
+            await _amark_step(job, 'transcribed')
+        elif use_async_job(asr_service) and not ASR_SEGMENTED_ENABLED:
+            # Submit and return: the ASR job monitor (callback / poller) saves the result and sends SQS
+            if not _step_done(job, 'asr_submitted'):
+                await _asubmit_asr_job(session_id, s3_audio_path, s3_client, s3_bucket, supabase, asr_service, cache_key)
+                await _amark_step(job, 'asr_submitted')
+            print(f"[Background] ASR job submitted in {time.time() - start_time:.2f}s for session: {session_id}")
+            return
+        else:
+            update_data = await _atranscribe_and_save(session_id, s3_audio_path, s3_client, s3_bucket, supabase, asr_service)
+            await _amark_step(job, 'transcribed')
+            await asyncio.to_thread(store_asr_result, supabase, cache_key, asr_service.provider_name, update_data)
+
+        processing_time = time.time() - start_time
+        print(f"[Background] Transcription completed in {processing_time:.2f}s for session: {session_id}")
+
+        # Send SQS message for next step (analysis)
+        await asyncio.to_thread(_send_sqs_message, sqs_queue_url, session_id)
+        print(f"[Background] SQS message sent for session: {session_id}")
+
+    except Exception as e:
+        print(f"[Background] ERROR in transcription: {str(e)}")
+        # Update DB with error
+        if supabase:
+            await run_query(
+                supabase.table('business_interview_sessions').update({
+                    'status': 'failed',
+                    'error_message': f"Transcription failed: {str(e)}",
+                    'updated_at': datetime.now().isoformat()
+                }).eq('id', session_id)
+            )
+        _publish_status(session_id, 'failed', f"Transcription failed: {str(e)}")
+        # Let the job queue record the failure
+        raise
+
+
+async def _atranscribe_and_save(
+    session_id: str,
+    s3_audio_path: str,
+    s3_client: boto3.client,
+    s3_bucket: str,
+    supabase: Client,
+    asr_service
+) -> dict:
+    """Download audio, run ASR and save the transcription (status: transcribing -> transcribed); returns the session update"""
+    # Update status to 'transcribing'
+    await run_query(
         supabase.table('business_interview_sessions').update({
             'status': 'transcribing',
             'updated_at': datetime.now().isoformat()
-        }).eq('id', session_id).execute()
+        }).eq('id', session_id)
+    )
+    _publish_status(session_id, 'transcribing')
+
+    transcription_result = await _arun_asr(s3_audio_path, s3_client, s3_bucket, asr_service)
+
+    # Update DB with transcription
+    update_data = _transcription_update(transcription_result)
+    await run_query(
+        supabase.table('business_interview_sessions').update(update_data).eq('id', session_id)
+    )
+    _publish_status(session_id, 'transcribed')
+    return update_data
+
+
+async def _asave_cached_transcription(session_id: str, cache_key: str, supabase: Client) -> bool:
+    """Save a cached ASR result for the session (status: transcribed); False on a cache miss"""
+    cached = await asyncio.to_thread(lookup_asr_result, supabase, cache_key)
+    if cached is None:
+        return False
+
+    transcription_metadata = dict(cached.get('transcription_metadata') or {})
+    transcription_metadata['asr_cache'] = {'cache_key': cache_key, 'cached_at': cached.get('cached_at')}
+    await run_query(
+        supabase.table('business_interview_sessions').update(with_content_versions({
+            'transcription': cached.get('transcription'),
+            'transcription_metadata': transcription_metadata,
+            'duration_seconds': cached.get('duration_seconds') or 0,
+            'status': 'transcribed',
+            # A job still pending for this session (earlier attempt) is superseded
+            'asr_job_id': None,
+            'updated_at': datetime.now().isoformat()
+        })).eq('id', session_id)
+    )
+    _publish_status(session_id, 'transcribed')
+    print(f"[Background] ASR cache hit (stored {cached.get('cached_at')}) for session: {session_id}")
+    return True
 
-        # Download audio from S3
-        s3_response = s3_client.get_object(Bucket=s3_bucket, Key=s3_audio_path)
-        audio_content = s3_response['Body'].read()
-        audio_file = io.BytesIO(audio_content)
 
-        # Transcribe with ASR provider (async function)
-        transcription_result = asyncio.run(
-            asr_service.transcribe_audio(
-                audio_file=audio_file,
+async def _arefine_draft_transcription(
+    session_id: str,
+    s3_audio_path: str,
+    s3_client: boto3.client,
+    s3_bucket: str,
+    supabase: Client,
+    asr_service
+) -> None:
+    """
+    Replace a realtime draft transcription with the batch ASR result
+
+    The session is already analyzing (or analyzed) the draft, so the status is
+    left alone and no SQS message is sent; a failure keeps the draft and is
+    re-raised for the job queue. Always
+    the synchronous ASR path (async jobs finalize into the standard route).
+    Compare-and-set on transcription_version keeps a transcription edited
+    since the upload.
+    """
+    start_time = time.time()
+    try:
+        result = await run_query(
+            supabase.table('business_interview_sessions')
+            .select('transcription_version, transcription_metadata')
+            .eq('id', session_id)
+            .single()
+        )
+        version = draft_version(result.data or {})
+        if version is None or (result.data or {}).get('transcription_version') != version:
+            count_draft('refine_skipped')
+            print(f"[Background] Transcription no longer the realtime draft, skipping refinement for session: {session_id}")
+            return
+
+        cache_key = await asyncio.to_thread(build_asr_cache_key, s3_client, s3_bucket, s3_audio_path, asr_service)
+        cached = await asyncio.to_thread(lookup_asr_result, supabase, cache_key)
+        if cached is not None:
+            update_data = with_content_versions({column: cached.get(column) for column in CACHED_COLUMNS})
+            update_data['transcription_metadata'] = dict(update_data['transcription_metadata'] or {})
+            update_data['transcription_metadata']['asr_cache'] = {'cache_key': cache_key, 'cached_at': cached.get('cached_at')}
+        else:
+            transcription_result = await _arun_asr(s3_audio_path, s3_client, s3_bucket, asr_service)
+            update_data = _transcription_update(transcription_result, asr_service.provider_name)
+            await asyncio.to_thread(store_asr_result, supabase, cache_key, asr_service.provider_name, update_data)
+
+        update_data.pop('status', None)
+        if not update_data.get('duration_seconds'):
+            # Keep the recording length sent by the client
+            update_data.pop('duration_seconds', None)
+        update_data['transcription_metadata']['refined_draft'] = {
+            'model': result.data['transcription_metadata'].get('model'),
+            'chunks': result.data['transcription_metadata'].get('chunks'),
+        }
+        update_data['updated_at'] = datetime.now().isoformat()
+
+        updated = await run_query(
+            supabase.table('business_interview_sessions')
+            .update(update_data)
+            .eq('id', session_id)
+            .eq('transcription_version', version)
+        )
+        if not updated.data:
+            count_draft('refine_skipped')
+            print(f"[Background] Transcription edited during refinement, keeping it for session: {session_id}")
+            return
+        count_draft('refined')
+        print(f"[Background] Realtime draft refined by batch ASR in {time.time() - start_time:.2f}s for session: {session_id}")
+    except Exception as e:
+        count_draft('errors')
+        print(f"[Background] ERROR in draft refinement (draft kept): {str(e)}")
+        raise
+
+
+def _transcription_update(transcription_result: dict, provider_name: str = None) -> dict:
+    """Session update for a finished transcription (status: transcribed)"""
+    # Calculate audio duration from transcription result
+    duration_seconds = 0
+    utterances = transcription_result.get('utterances', [])
+    if utterances and len(utterances) > 0:
+        # Get the end time of the last utterance
+        last_utterance = utterances[-1]
+        duration_seconds = int(last_utterance.get('end', 0))
+
+    transcription_metadata = {
+        # Columnar (services/transcript_columns.py); read with UtteranceColumns.from_metadata()
+        'utterance_columns': encode_utterances(utterances or []),
+        'paragraphs': transcription_result.get('paragraphs', []),
+        'speaker_count': transcription_result.get('speaker_count', 0),
+        'confidence': transcription_result.get('confidence', 0.0),
+        'word_count': transcription_result.get('word_count', 0),
+        'provider': transcription_result.get('provider', provider_name or os.getenv('ASR_PROVIDER', 'unknown')),
+        'model': transcription_result.get('model', 'unknown'),
+        'processing_time': transcription_result.get('processing_time', 0.0),
+    }
+    if transcription_result.get('audio_preprocess'):
+        # Trimmed audio was transcribed; times above are already mapped back to the original
+        transcription_metadata['audio_preprocess'] = transcription_result['audio_preprocess']
+    if transcription_result.get('asr_segments'):
+        # Segmented ASR (services/segmented_asr.py): cut points and speaker label reconciliation
+        transcription_metadata['asr_segments'] = transcription_result['asr_segments']
+
+    return with_content_versions({
+        'transcription': transcription_result['transcription'],
+        'transcription_metadata': transcription_metadata,
+        'duration_seconds': duration_seconds,
+        'status': 'transcribed',
+        'updated_at': datetime.now().isoformat()
+    })
+
+
+async def _adownload_for_asr(s3_audio_path: str, s3_client: boto3.client, s3_bucket: str):
+    """
+    Spooled recording for upload, pre-processed when AUDIO_PREPROCESS_ENABLED
+
+    Returns:
+        (audio_file, audio_preprocess) - audio_preprocess is the stats + time_remap
+        to store / apply to the result, or None; the caller closes audio_file
+    """
+    # Download audio from S3 into a spooled temp file (rolls over to disk for long recordings)
+    audio_file = await asyncio.to_thread(download_s3_audio, s3_client, s3_bucket, s3_audio_path)
+    return await _apreprocess(audio_file, s3_audio_path)
+
+
+async def _apreprocess(audio_file, s3_audio_path: str):
+    """(audio_file, audio_preprocess) as _adownload_for_asr, for an already downloaded recording"""
+    if not AUDIO_PREPROCESS_ENABLED:
+        return audio_file, None
+
+    processed, time_remap, stats = await asyncio.to_thread(preprocess_audio, audio_file, s3_audio_path)
+    if processed is audio_file:
+        return audio_file, None
+    audio_file.close()
+    return processed, {**stats, 'time_remap': time_remap}
+
+
+def _apply_preprocess(transcription_result: dict, audio_preprocess: dict = None) -> dict:
+    """Map times of a result on pre-processed audio back to the original recording"""
+    if audio_preprocess:
+        remap_transcription(transcription_result, audio_preprocess.get('time_remap'))
+        transcription_result['audio_preprocess'] = audio_preprocess
+    return transcription_result
+
+
+async def _arun_asr(s3_audio_path: str, s3_client: boto3.client, s3_bucket: str, asr_service) -> dict:
+    """Presigned URL submission when the provider supports it, else (or on failure) upload the bytes"""
+    # Pre-processing and segmentation need the bytes here, so they always upload
+    if use_url_source(asr_service) and not (AUDIO_PREPROCESS_ENABLED or ASR_SEGMENTED_ENABLED):
+        audio_url = await asyncio.to_thread(presign_audio_url, s3_client, s3_bucket, s3_audio_path)
+        try:
+            transcription_result = await asr_service.transcribe_url(
+                audio_url=audio_url,
                 filename=s3_audio_path
             )
+            count_url_submission()
+            return transcription_result
+        except Exception as e:
+            count_url_submission(fallback=True)
+            print(f"[Background] URL submission failed, falling back to upload: {str(e)}")
+
+    audio_file = await asyncio.to_thread(download_s3_audio, s3_client, s3_bucket, s3_audio_path)
+    try:
+        if ASR_SEGMENTED_ENABLED:
+            # Long recordings: concurrent segments, times already on the original recording
+            transcription_result = await atranscribe_segmented(asr_service, audio_file, s3_audio_path)
+            if transcription_result is not None:
+                return transcription_result
+        audio_file, audio_preprocess = await _apreprocess(audio_file, s3_audio_path)
+        transcription_result = await asr_service.transcribe_audio(
+            audio_file=audio_file,
+            filename=s3_audio_path
         )
+    finally:
+        audio_file.close()
+    return _apply_preprocess(transcription_result, audio_preprocess)
 
-        # Calculate audio duration from transcription result
-        duration_seconds = 0
-        utterances = transcription_result.get('utterances', [])
-        if utterances and len(utterances) > 0:
-            # Get the end time of the last utterance
-            last_utterance = utterances[-1]
-            duration_seconds = int(last_utterance.get('end', 0))
 
-        # Update DB with transcription
+async def _asubmit_asr_job(
+    session_id: str,
+    s3_audio_path: str,
+    s3_client: boto3.client,
+    s3_bucket: str,
+    supabase: Client,
+    asr_service,
+    cache_key: str = None
+) -> str:
+    """Submit the recording as an async ASR job and persist its id (status: transcribing)"""
+    result = await run_query(
+        supabase.table('business_interview_sessions')
+        .select('status, asr_job_id')
+        .eq('id', session_id)
+        .single()
+    )
+    session = result.data or {}
+    if session.get('asr_job_id') and session.get('status') == 'transcribing':
+        print(f"[Background] ASR job {session['asr_job_id']} already pending for session: {session_id}")
+        return session['asr_job_id']
+
+    await run_query(
         supabase.table('business_interview_sessions').update({
-            'transcription': transcription_result['transcription'],
-            'transcription_metadata': {
-                'utterances': transcription_result.get('utterances', []),
-                'paragraphs': transcription_result.get('paragraphs', []),
-                'speaker_count': transcription_result.get('speaker_count', 0),
-                'confidence': transcription_result.get('confidence', 0.0),
-                'word_count': transcription_result.get('word_count', 0),
-                'provider': transcription_result.get('provider', os.getenv('ASR_PROVIDER', 'unknown')),
-                'model': transcription_result.get('model', 'unknown'),
-                'processing_time': transcription_result.get('processing_time', 0.0),
-            },
-            'duration_seconds': duration_seconds,
-            'status': 'transcribed',
+            'status': 'transcribing',
             'updated_at': datetime.now().isoformat()
-        }).eq('id', session_id).execute()
+        }).eq('id', session_id)
+    )
+    _publish_status(session_id, 'transcribing')
 
-        processing_time = time.time() - start_time
-        print(f"[Background] Transcription completed in {processing_time:.2f}s for session: {session_id}")
+    callback_url = build_callback_url(session_id) if asr_service.supports_job_callback else None
+    job_id = None
+    audio_preprocess = None
+    if use_url_source(asr_service) and not AUDIO_PREPROCESS_ENABLED:
+        audio_url = await asyncio.to_thread(presign_audio_url, s3_client, s3_bucket, s3_audio_path)
+        try:
+            job_id = await asr_service.submit_job(s3_audio_path, audio_url=audio_url, callback_url=callback_url)
+            count_url_submission()
+        except Exception as e:
+            count_url_submission(fallback=True)
+            print(f"[Background] URL submission failed, falling back to upload: {str(e)}")
+    if job_id is None:
+        audio_file, audio_preprocess = await _adownload_for_asr(s3_audio_path, s3_client, s3_bucket)
+        try:
+            job_id = await asr_service.submit_job(s3_audio_path, audio_file=audio_file, callback_url=callback_url)
+        finally:
+            audio_file.close()
 
-        # Send SQS message for next step (analysis)
-        sqs_client = boto3.client('sqs', region_name=os.getenv('AWS_REGION', 'ap-southeast-2'))
-        sqs_client.send_message(
-            QueueUrl=sqs_queue_url,
-            MessageBody=json.dumps({'session_id': session_id}),
-            MessageGroupId=session_id,
-            MessageDeduplicationId=f"{session_id}-{int(time.time())}"
-        )
-        print(f"[Background] SQS message sent for session: {session_id}")
+    await run_query(
+        supabase.table('business_interview_sessions').update({
+            'asr_job_id': job_id,
+            'asr_job_provider': asr_service.provider_name,
+            'asr_job_submitted_at': datetime.now(timezone.utc).isoformat(),
+            # Applied by finalize_asr_job (provider times are on the trimmed audio)
+            'asr_audio_preprocess': audio_preprocess,
+            # finalize_asr_job stores the result in the ASR result cache under this key
+            'asr_cache_key': cache_key,
+            'updated_at': datetime.now().isoformat()
+        }).eq('id', session_id)
+    )
+    print(f"[Background] Submitted {asr_service.provider_name} job {job_id} for session: {session_id}")
+    return job_id
 
-    except Exception as e:
-        print(f"[Background] ERROR in transcription: {str(e)}")
-        # Update DB with error
-        if supabase:
-            supabase.table('business_interview_sessions').update({
-                'status': 'failed',
-                'error_message': f"Transcription failed: {str(e)}",
-                'updated_at': datetime.now().isoformat()
-            }).eq('id', session_id).execute()
+
+def finalize_asr_job(
+    supabase: Client,
+    session_id: str,
+    asr_job_id: str,
+    transcription_result: dict,
+    elapsed_seconds: float,
+    sqs_queue_url: str,
+    audio_preprocess: dict = None,
+    cache_key: str = None,
+    provider_name: str = None
+) -> bool:
+    """
+    Save the result of an async ASR job and send the SQS message
+
+    Compare-and-set on asr_job_id: returns False (and does nothing) if the
+    job was already finalized by another process or superseded.
+    audio_preprocess is the session's asr_audio_preprocess (trimmed upload),
+    cache_key its asr_cache_key (the result is stored in the ASR result cache).
+    """
+    update_data = _transcription_update(_apply_preprocess(transcription_result, audio_preprocess))
+    update_data['transcription_metadata']['processing_time'] = round(elapsed_seconds, 2)
+    update_data['asr_job_id'] = None
+    update_data['asr_audio_preprocess'] = None
+    update_data['asr_cache_key'] = None
+
+    result = supabase.table('business_interview_sessions')\
+        .update(update_data)\
+        .eq('id', session_id)\
+        .eq('asr_job_id', asr_job_id)\
+        .execute()
+    if not result.data:
+        return False
+
+    _publish_status(session_id, 'transcribed')
+    print(f"[Background] Transcription completed in {elapsed_seconds:.2f}s (ASR job {asr_job_id}) for session: {session_id}")
+    store_asr_result(supabase, cache_key, provider_name or 'unknown', update_data)
+    _send_sqs_message(sqs_queue_url, session_id)
+    print(f"[Background] SQS message sent for session: {session_id}")
+    return True
+
+
+def fail_asr_job(supabase: Client, session_id: str, asr_job_id: str, error: str) -> bool:
+    """Mark the session failed for a pending ASR job (compare-and-set on asr_job_id)"""
+    error_message = f"Transcription failed: {error}"
+    result = supabase.table('business_interview_sessions').update({
+        'status': 'failed',
+        'error_message': error_message,
+        'asr_job_id': None,
+        'updated_at': datetime.now().isoformat()
+    }).eq('id', session_id).eq('asr_job_id', asr_job_id).execute()
+    if not result.data:
+        return False
+
+    print(f"[Background] ERROR in transcription (ASR job {asr_job_id}): {error}")
+    _publish_status(session_id, 'failed', error_message)
+    return True
 
 
 def analyze_background(
@@ -110,7 +500,29 @@ def analyze_background(
     llm_service,
     sqs_queue_url: str = None,
     use_custom_prompt: bool = False,
-    auto_chain: bool = True
+    auto_chain: bool = True,
+    job=None
+):
+    """Background task for interview analysis - sync wrapper around aanalyze_background()"""
+    asyncio.run(aanalyze_background(
+        session_id=session_id,
+        supabase=supabase,
+        llm_service=llm_service,
+        sqs_queue_url=sqs_queue_url,
+        use_custom_prompt=use_custom_prompt,
+        auto_chain=auto_chain,
+        job=job
+    ))
+
+
+async def aanalyze_background(
+    session_id: str,
+    supabase: Client,
+    llm_service,
+    sqs_queue_url: str = None,
+    use_custom_prompt: bool = False,
+    auto_chain: bool = True,
+    job=None
 ):
     """
     Background task for interview analysis
@@ -122,23 +534,22 @@ def analyze_background(
         sqs_queue_url: SQS queue URL for completion notification (optional)
         use_custom_prompt: If True, use the prompt already stored in DB
         auto_chain: If True, auto-chain Phase 2->3 after Phase 1 (default: True for Lambda/standard route)
+        job: JobContext when run from the job queue (skips phases finished by a previous attempt)
     """
     previous_status = None
+    chain_failed = False
     try:
         print(f"[Background] Starting analysis for session: {session_id}")
         start_time = time.time()
 
-        # Get session from DB
-        result = supabase.table('business_interview_sessions')\
-            .select('*')\
-            .eq('id', session_id)\
-            .single()\
-            .execute()
-
-        if not result.data:
-            raise Exception(f"Session not found: {session_id}")
-
-        session = result.data
+        # Get session from DB (only the columns Phase 1 needs)
+        start_phase('fact_extraction')
+        session = await read_phase_input(
+            supabase,
+            session_id,
+            'fact_extraction',
+            build_projection(PHASE1_INPUT_COLUMNS, 'fact_extraction_prompt_v1' if use_custom_prompt else '')
+        )
         transcription = session.get('transcription')
         previous_status = session.get('status')
 
@@ -147,158 +558,90 @@ def analyze_background(
 
         # Update status to 'analyzing' (only for standard route or if not yet completed)
         if auto_chain or previous_status != 'completed':
-            supabase.table('business_interview_sessions').update({
-                'status': 'analyzing',
-                'updated_at': datetime.now().isoformat()
-            }).eq('id', session_id).execute()
-
-        # Initialize variables with default values
-        subject = None
-        attendees = session.get('attendees') or {}  # Handle None from DB
-        age_text = "不明"
-
-        # Get subject info directly from session's subject_id
-        subject_id = session.get('subject_id')
-        if subject_id:
-            try:
-                subject_result = supabase.table('subjects')\
-                    .select('*')\
-                    .eq('subject_id', subject_id)\
-                    .execute()
-
-                if subject_result and subject_result.data and len(subject_result.data) > 0:
-                    subject = subject_result.data[0]
-
-                    # Calculate age from birth_date if available
-                    if subject.get('birth_date'):
-                        try:
-                            birth_date = datetime.fromisoformat(subject['birth_date'].replace('Z', '+00:00'))
-                            age = (datetime.now() - birth_date).days // 365
-                            age_text = f"{age}歳"
-                        except (ValueError, TypeError, KeyError) as e:
-                            print(f"[Warning] Failed to calculate age: {e}")
-                            age_text = "不明"
-            except Exception as e:
-                print(f"[Warning] Failed to fetch subject: {e}")
-        # Get staff info
-        staff_name = "山田太郎"  # Default fallback
-        staff_id = session.get('staff_id')
-        if staff_id:
-            try:
-                staff_result = supabase.table('users')\
-                    .select('name')\
-                    .eq('user_id', staff_id)\
-                    .execute()
-                if staff_result and staff_result.data and len(staff_result.data) > 0:
-                    staff_name = f"{staff_result.data[0].get('name', 'スタッフ')}（児童発達支援管理責任者）"
-            except Exception as e:
-                print(f"[Warning] Failed to fetch staff: {e}")
-
-        # Generate extraction_v1 prompt using prompts.py (or use stored prompt)
-        if use_custom_prompt:
-            prompt = session.get('fact_extraction_prompt_v1')
-            if not prompt:
-                raise Exception("No stored prompt found for Phase 1")
-            print(f"[Background] Using stored custom prompt for Phase 1")
-        else:
-            prompt = build_fact_extraction_prompt(
-                transcription=transcription,
-                subject=subject,
-                age_text=age_text,
-                attendees=attendees,
-                staff_name=staff_name,
-                recorded_at=session.get('recorded_at', '不明')
-            )
+            await write_session_status(supabase, session_id, 'fact_extraction', {'status': 'analyzing'})
+            _publish_status(session_id, 'analyzing')
 
-        # Call LLM with error handling
-        try:
-            llm_response = llm_service.generate(prompt)
-            if not llm_response:
-                raise Exception("LLM returned empty response")
-        except Exception as e:
-            raise Exception(format_llm_error_message(e))
-
-        # Parse LLM response (handle both JSON string and plain text)
-        try:
-            if llm_response.strip().startswith('{'):
-                analysis_data = json.loads(llm_response)
-            else:
-                # If not JSON, wrap in summary structure
-                analysis_data = {'summary': llm_response}
-        except json.JSONDecodeError:
-            # Fallback: treat as plain text
-            analysis_data = {'summary': llm_response}
-
-        # Update DB with result
-        update_data = {
-            'fact_extraction_prompt_v1': prompt,
-            'fact_extraction_result_v1': analysis_data,
-            'status': 'analyzing',
-            'updated_at': datetime.now().isoformat()
-        }
-        # Record which model was used
-        if hasattr(llm_service, 'model_name'):
-            update_data['model_used_phase1'] = llm_service.model_name
-        supabase.table('business_interview_sessions').update(update_data).eq('id', session_id).execute()
+        phase1_result = None
+        if _step_done(job, 'phase1'):
+            print(f"[Background] Phase 1 already saved by a previous attempt, skipping for session: {session_id}")
+        else:
+            phase1_result = await _arun_fact_extraction(session_id, session, supabase, llm_service, use_custom_prompt)
+            await _amark_step(job, 'phase1')
 
         processing_time = time.time() - start_time
         print(f"[Background] Analysis completed in {processing_time:.2f}s for session: {session_id}")
 
         # Send SQS message for next step (optional)
         if sqs_queue_url:
-            sqs_client = boto3.client('sqs', region_name=os.getenv('AWS_REGION', 'ap-southeast-2'))
-            sqs_client.send_message(
-                QueueUrl=sqs_queue_url,
-                MessageBody=json.dumps({'session_id': session_id}),
-                MessageGroupId=session_id,
-                MessageDeduplicationId=f"{session_id}-{int(time.time())}"
-            )
+            await asyncio.to_thread(_send_sqs_message, sqs_queue_url, session_id)
             print(f"[Background] SQS message sent for session: {session_id}")
 
         if auto_chain:
             # Auto-chain: Phase 1 -> Phase 2 -> Phase 3 (standard route / Lambda)
             print(f"[Background] Auto-chaining Phase 2 (Fact Structuring) for session: {session_id}")
             try:
-                structure_facts_background(
-                    session_id=session_id,
-                    supabase=supabase,
-                    llm_service=llm_service,
-                    use_custom_prompt=False
-                )
+                # Hand each phase result to the next phase in memory (no re-read)
+                phase2_result = None
+                if not _step_done(job, 'phase2'):
+                    phase2_result = await astructure_facts_background(
+                        session_id=session_id,
+                        supabase=supabase,
+                        llm_service=llm_service,
+                        use_custom_prompt=False,
+                        input_data={'fact_extraction_result_v1': phase1_result} if phase1_result else None
+                    )
+                    await _amark_step(job, 'phase2')
                 print(f"[Background] Phase 2 completed. Auto-chaining Phase 3 (Assessment) for session: {session_id}")
-                assess_background(
-                    session_id=session_id,
-                    supabase=supabase,
-                    llm_service=llm_service,
-                    use_custom_prompt=False
+                if not _step_done(job, 'phase3'):
+                    await aassess_background(
+                        session_id=session_id,
+                        supabase=supabase,
+                        llm_service=llm_service,
+                        use_custom_prompt=False,
+                        input_data={'fact_structuring_result_v1': phase2_result} if phase2_result else None
+                    )
+                    await _amark_step(job, 'phase3')
+                await run_query(
+                    supabase.table('business_interview_sessions').update({
+                        'status': 'completed',
+                        'error_message': None,
+                        'updated_at': datetime.now().isoformat()
+                    }).eq('id', session_id)
                 )
-                supabase.table('business_interview_sessions').update({
-                    'status': 'completed',
-                    'error_message': None,
-                    'updated_at': datetime.now().isoformat()
-                }).eq('id', session_id).execute()
+                _publish_status(session_id, 'completed')
                 print(f"[Background] Phase 3 completed. Full pipeline finished for session: {session_id}")
             except Exception as chain_err:
                 print(f"[Background] ERROR in auto-chain (Phase 2/3): {str(chain_err)}")
                 import traceback
                 print(f"[Background] Chain traceback:\n{traceback.format_exc()}")
-                supabase.table('business_interview_sessions').update({
-                    'status': 'failed',
-                    'error_message': f"Pipeline chain failed: {str(chain_err)}",
-                    'updated_at': datetime.now().isoformat()
-                }).eq('id', session_id).execute()
+                await run_query(
+                    supabase.table('business_interview_sessions').update({
+                        'status': 'failed',
+                        'error_message': f"Pipeline chain failed: {str(chain_err)}",
+                        'updated_at': datetime.now().isoformat()
+                    }).eq('id', session_id)
+                )
+                _publish_status(session_id, 'failed', f"Pipeline chain failed: {str(chain_err)}")
+                chain_failed = True
+                raise
         else:
             # Spot execution: Phase 1 only (no auto-chain)
             # Preserve previous status if already completed; only advance if not yet completed
             print(f"[Background] Phase 1 only (auto_chain=False) for session: {session_id}")
             final_status = previous_status if previous_status == 'completed' else 'completed'
-            supabase.table('business_interview_sessions').update({
-                'status': final_status,
-                'error_message': None,
-                'updated_at': datetime.now().isoformat()
-            }).eq('id', session_id).execute()
+            await run_query(
+                supabase.table('business_interview_sessions').update({
+                    'status': final_status,
+                    'error_message': None,
+                    'updated_at': datetime.now().isoformat()
+                }).eq('id', session_id)
+            )
+            _publish_status(session_id, final_status)
 
     except Exception as e:
+        if chain_failed:
+            # Session already marked failed by the auto-chain handler
+            raise
         import traceback
         error_details = traceback.format_exc()
         print(f"[Background] ERROR in analysis: {str(e)}")
@@ -307,19 +650,153 @@ def analyze_background(
         if supabase:
             if auto_chain:
                 # Standard route: mark as failed
-                supabase.table('business_interview_sessions').update({
-                    'status': 'failed',
-                    'error_message': f"Analysis failed: {str(e)}",
-                    'updated_at': datetime.now().isoformat()
-                }).eq('id', session_id).execute()
+                await run_query(
+                    supabase.table('business_interview_sessions').update({
+                        'status': 'failed',
+                        'error_message': f"Analysis failed: {str(e)}",
+                        'updated_at': datetime.now().isoformat()
+                    }).eq('id', session_id)
+                )
+                _publish_status(session_id, 'failed', f"Analysis failed: {str(e)}")
             else:
                 # Spot execution: preserve previous status, only update error_message
                 restore_status = previous_status if previous_status else 'failed'
-                supabase.table('business_interview_sessions').update({
-                    'status': restore_status,
-                    'error_message': f"Spot analysis failed: {str(e)}",
-                    'updated_at': datetime.now().isoformat()
-                }).eq('id', session_id).execute()
+                await run_query(
+                    supabase.table('business_interview_sessions').update({
+                        'status': restore_status,
+                        'error_message': f"Spot analysis failed: {str(e)}",
+                        'updated_at': datetime.now().isoformat()
+                    }).eq('id', session_id)
+                )
+                _publish_status(session_id, restore_status, f"Spot analysis failed: {str(e)}")
+        # Let the job queue record the failure
+        raise
+
+
+async def _arun_fact_extraction(
+    session_id: str,
+    session: dict,
+    supabase: Client,
+    llm_service,
+    use_custom_prompt: bool = False
+) -> dict:
+    """Phase 1: build (or load) the prompt, call the LLM and save fact_extraction_result_v1"""
+    transcription = session.get('transcription')
+
+    # Initialize variables with default values
+    subject = None
+    attendees = session.get('attendees') or {}  # Handle None from DB
+    age_text = "不明"
+
+    # Get subject info directly from session's subject_id
+    subject_id = session.get('subject_id')
+    if subject_id:
+        try:
+            subject_result = await run_query(
+                supabase.table('subjects')
+                .select('*')
+                .eq('subject_id', subject_id)
+            )
+
+            if subject_result and subject_result.data and len(subject_result.data) > 0:
+                subject = subject_result.data[0]
+
+                # Calculate age from birth_date if available
+                if subject.get('birth_date'):
+                    try:
+                        birth_date = datetime.fromisoformat(subject['birth_date'].replace('Z', '+00:00'))
+                        age = (datetime.now() - birth_date).days // 365
+                        age_text = f"{age}歳"
+                    except (ValueError, TypeError, KeyError) as e:
+                        print(f"[Warning] Failed to calculate age: {e}")
+                        age_text = "不明"
+        except Exception as e:
+            print(f"[Warning] Failed to fetch subject: {e}")
+    # Get staff info
+    staff_name = "山田太郎"  # Default fallback
+    staff_id = session.get('staff_id')
+    if staff_id:
+        try:
+            staff_result = await run_query(
+                supabase.table('users')
+                .select('name')
+                .eq('user_id', staff_id)
+            )
+            if staff_result and staff_result.data and len(staff_result.data) > 0:
+                staff_name = f"{staff_result.data[0].get('name', 'スタッフ')}（児童発達支援管理責任者）"
+        except Exception as e:
+            print(f"[Warning] Failed to fetch staff: {e}")
+
+    # Generate extraction_v1 prompt using prompts.py (or use stored prompt)
+    if use_custom_prompt:
+        prompt = session.get('fact_extraction_prompt_v1')
+        if not prompt:
+            raise Exception("No stored prompt found for Phase 1")
+        print(f"[Background] Using stored custom prompt for Phase 1")
+    else:
+        prompt = build_fact_extraction_prompt(
+            transcription=transcription,
+            subject=subject,
+            age_text=age_text,
+            attendees=attendees,
+            staff_name=staff_name,
+            recorded_at=session.get('recorded_at', '不明')
+        )
+
+    # Long transcripts: map-reduce over boundary-aligned chunks (a stored custom prompt always runs as-is)
+    chunks = None
+    if not use_custom_prompt and should_chunk(transcription):
+        chunks = split_transcript(transcription, session.get('transcription_metadata'))
+        print(f"[Background] Long transcript (~{estimate_tokens(transcription)} tokens): chunked Phase 1 with {len(chunks)} chunks")
+
+    # Call LLM with error handling (streamed; partial output flushed to the progress store)
+    publish_session_event(session_id, 'phase_started', {'phase': 'fact_extraction'})
+    progress = PhaseProgress(supabase, session_id, 'fact_extraction', getattr(llm_service, 'model_name', None))
+    try:
+        if chunks and len(chunks) > 1:
+            analysis_data = await arun_chunked_extraction(
+                llm_service,
+                chunks,
+                lambda chunk, part_index, part_count: build_fact_extraction_prompt(
+                    transcription=chunk,
+                    subject=subject,
+                    age_text=age_text,
+                    attendees=attendees,
+                    staff_name=staff_name,
+                    recorded_at=session.get('recorded_at', '不明'),
+                    part_index=part_index,
+                    part_count=part_count
+                ),
+                progress
+            )
+        else:
+            llm_response = await astream_with_progress(llm_service, prompt, progress)
+            if not llm_response:
+                raise Exception("LLM returned empty response")
+            # Parse LLM response (handle both JSON string and plain text)
+            analysis_data = parse_llm_output(llm_response)
+    except Exception as e:
+        error_message = format_llm_error_message(e)
+        await progress.fail(error_message)
+        publish_session_event(session_id, 'phase_failed', {'phase': 'fact_extraction', 'error_message': error_message})
+        raise Exception(error_message)
+
+    # Update DB with result (prompt + result + model in one write)
+    update_data = {
+        'fact_extraction_prompt_v1': prompt,
+        'fact_extraction_result_v1': analysis_data,
+        'status': 'analyzing',
+    }
+    # Record which model was used
+    if hasattr(llm_service, 'model_name'):
+        update_data['model_used_phase1'] = llm_service.model_name
+    await write_phase_result(supabase, session_id, 'fact_extraction', update_data)
+    await progress.finish()
+    publish_session_event(session_id, 'phase_completed', {
+        'phase': 'fact_extraction',
+        'model_used': update_data.get('model_used_phase1')
+    })
+    return analysis_data
 
 
 def structure_facts_background(
@@ -328,6 +805,17 @@ def structure_facts_background(
     llm_service,
     use_custom_prompt: bool = False
 ):
+    """Phase 2: Fact Structuring - sync wrapper around astructure_facts_background()"""
+    return asyncio.run(astructure_facts_background(session_id, supabase, llm_service, use_custom_prompt))
+
+
+async def astructure_facts_background(
+    session_id: str,
+    supabase: Client,
+    llm_service,
+    use_custom_prompt: bool = False,
+    input_data: dict = None
+) -> dict:
     """
     Phase 2: Fact Structuring (Background Task)
 
@@ -340,9 +828,13 @@ def structure_facts_background(
         supabase: Supabase client
         llm_service: LLM service instance
         use_custom_prompt: If True, use the prompt already stored in DB
+        input_data: Phase 1 result already in memory (auto-chain), skips the DB read
+
+    Returns:
+        fact_structuring_result_v1
     """
     # Use unified LLM pipeline
-    execute_llm_phase(
+    return await aexecute_llm_phase(
         session_id=session_id,
         supabase=supabase,
         llm_service=llm_service,
@@ -352,7 +844,9 @@ def structure_facts_background(
         output_column="fact_structuring_result_v1",
         prompt_column="fact_structuring_prompt_v1",
         model_used_column="model_used_phase2",
-        use_stored_prompt=use_custom_prompt
+        use_stored_prompt=use_custom_prompt,
+        input_data=input_data,
+        parallel_runner=arun_sharded_structuring
     )
 
 
@@ -362,6 +856,17 @@ def assess_background(
     llm_service,
     use_custom_prompt: bool = False
 ):
+    """Phase 3: Assessment - sync wrapper around aassess_background()"""
+    return asyncio.run(aassess_background(session_id, supabase, llm_service, use_custom_prompt))
+
+
+async def aassess_background(
+    session_id: str,
+    supabase: Client,
+    llm_service,
+    use_custom_prompt: bool = False,
+    input_data: dict = None
+) -> dict:
     """
     Phase 3: Assessment (Background Task)
 
@@ -377,9 +882,13 @@ def assess_background(
         supabase: Supabase client
         llm_service: LLM service instance
         use_custom_prompt: If True, use the prompt already stored in DB
+        input_data: Phase 2 result already in memory (auto-chain), skips the DB read
+
+    Returns:
+        assessment_result_v1
     """
     # Use unified LLM pipeline - Phase 3 uses Phase 2 annotated output
-    execute_llm_phase(
+    assessment_result = await aexecute_llm_phase(
         session_id=session_id,
         supabase=supabase,
         llm_service=llm_service,
@@ -389,14 +898,43 @@ def assess_background(
         output_column="assessment_result_v1",
         prompt_column="assessment_prompt_v1",
         model_used_column="model_used_phase3",
-        use_stored_prompt=use_custom_prompt
+        use_stored_prompt=use_custom_prompt,
+        input_data=input_data,
+        parallel_runner=arun_parallel_assessment
     )
 
     # Auto-sync assessment_v1 to business_support_plans after Phase 3 completion
-    sync_assessment_to_support_plan(session_id, supabase)
+    await asyncio.to_thread(sync_assessment_to_support_plan, session_id, supabase, assessment_result)
+    return assessment_result
+
+
+def _publish_status(session_id: str, status: str, error_message: str = None):
+    """Notify SSE subscribers of a session status transition"""
+    publish_session_event(session_id, 'status', {'status': status, 'error_message': error_message})
+
+
+def _step_done(job, step: str) -> bool:
+    """Return True if a re-claimed job already completed the step"""
+    return job is not None and job.is_done(step)
+
+
+async def _amark_step(job, step: str) -> None:
+    """Record a completed step on the job (no-op outside the job queue)"""
+    if job is not None:
+        await asyncio.to_thread(job.mark_done, step)
+
+
+def _send_sqs_message(sqs_queue_url: str, session_id: str):
+    sqs_client = boto3.client('sqs', region_name=os.getenv('AWS_REGION', 'ap-southeast-2'))
+    sqs_client.send_message(
+        QueueUrl=sqs_queue_url,
+        MessageBody=json.dumps({'session_id': session_id}),
+        MessageGroupId=session_id,
+        MessageDeduplicationId=f"{session_id}-{int(time.time())}"
+    )
 
 
-def sync_assessment_to_support_plan(session_id: str, supabase: Client):
+def sync_assessment_to_support_plan(session_id: str, supabase: Client, assessment_result: dict = None):
     """
     Sync assessment_v1 data to business_support_plans xxx_ai_generated columns
 
@@ -406,13 +944,15 @@ def sync_assessment_to_support_plan(session_id: str, supabase: Client):
     Args:
         session_id: Session ID
         supabase: Supabase client
+        assessment_result: Phase 3 result already in memory (only support_plan_id is read)
     """
     try:
         print(f"[Background] Starting auto-sync for session: {session_id}")
 
         # 1. Get session with support_plan_id and assessment_result_v1
+        select_clause = 'support_plan_id' if assessment_result else 'support_plan_id, assessment_result_v1'
         session_result = supabase.table('business_interview_sessions')\
-            .select('support_plan_id, assessment_result_v1')\
+            .select(select_clause)\
             .eq('id', session_id)\
             .single()\
             .execute()
@@ -422,7 +962,8 @@ def sync_assessment_to_support_plan(session_id: str, supabase: Client):
             return
 
         support_plan_id = session_result.data.get('support_plan_id')
-        assessment_result = session_result.data.get('assessment_result_v1')
+        if assessment_result is None:
+            assessment_result = session_result.data.get('assessment_result_v1')
 
         if not support_plan_id:
             print(f"[Background] No support_plan_id linked to session: {session_id}")
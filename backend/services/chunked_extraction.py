@@ -0,0 +1,241 @@
+"""
+Chunked (map-reduce) Phase 1 extraction for long transcripts
+
+A 60-90 minute interview does not fit comfortably in one extraction call.
+Above PHASE1_CHUNK_THRESHOLD_TOKENS the transcript is:
+
+1. split at utterance / paragraph boundaries (transcription_metadata), or at
+   line / sentence boundaries when the metadata no longer matches the text
+   (e.g. the transcription was edited by hand)
+2. extracted per chunk concurrently (PHASE1_CHUNK_CONCURRENCY, and the global
+   LLM_MAX_CONCURRENCY limit)
+3. merged into one extraction_v1: categories in schema order, items in chunk
+   order, duplicates removed (the highest confidence / priority is kept)
+
+Wall-clock time follows the slowest chunk instead of the total length.
+"""
+
+import asyncio
+import os
+import re
+import unicodedata
+from typing import Any, Callable, Dict, List, Optional
+
+from services.llm_pipeline import (
+    PhaseProgress,
+    agenerate_bounded,
+    estimate_tokens,
+    extract_from_wrapped_result,
+    parse_llm_output,
+)
+from services.transcript_columns import UtteranceColumns
+
+
+PHASE1_CHUNK_THRESHOLD_TOKENS = int(os.getenv("PHASE1_CHUNK_THRESHOLD_TOKENS", "12000"))
+PHASE1_CHUNK_TARGET_TOKENS = int(os.getenv("PHASE1_CHUNK_TARGET_TOKENS", "4000"))
+PHASE1_CHUNK_CONCURRENCY = int(os.getenv("PHASE1_CHUNK_CONCURRENCY", "4"))
+
+# extraction_v1 categories in schema order (see build_fact_extraction_prompt)
+EXTRACTION_CATEGORIES = [
+    'basic_info',
+    'current_state',
+    'strengths',
+    'challenges',
+    'physical_sensory',
+    'medical_development',
+    'family_environment',
+    'parent_intentions',
+    'child_intentions',
+    'staff_notes',
+    'administrative_notes',
+    'unresolved_items',
+]
+
+CONFIDENCE_RANK = {'low': 0, 'medium': 1, 'high': 2}
+
+_SENTENCE_END = re.compile(r'(?<=[。！？!?])')
+_DEDUPE_STRIP = re.compile(r'[\s、。，．,.・「」『』（）()!！?？:：;；"\'`]+')
+
+
+def should_chunk(transcription: str) -> bool:
+    return bool(transcription) and estimate_tokens(transcription) > PHASE1_CHUNK_THRESHOLD_TOKENS
+
+
+# ------------------------------------------------------------------
+# Split
+# ------------------------------------------------------------------
+
+def _compact(text: str) -> str:
+    return re.sub(r'\s+', '', text or '')
+
+
+def _metadata_units(transcription: str, metadata: Optional[Dict[str, Any]]) -> Optional[List[str]]:
+    """Utterances (with speaker) or paragraphs, if they still reproduce the transcription"""
+    if not isinstance(metadata, dict):
+        return None
+
+    candidates = []
+    utterances = UtteranceColumns.from_metadata(metadata)
+    if utterances:
+        candidates.append([(view.transcript.strip(), view.speaker) for view in utterances])
+    candidates.append([
+        ((paragraph.get('transcript') or paragraph.get('text') or '').strip(), None)
+        for paragraph in metadata.get('paragraphs') or []
+    ])
+
+    expected = _compact(transcription)
+    for segments in candidates:
+        if not any(text for text, _ in segments) or _compact(''.join(text for text, _ in segments)) != expected:
+            continue
+        return [f"[話者{speaker}] {text}" if speaker is not None else text for text, speaker in segments if text]
+    return None
+
+
+def _text_units(transcription: str, target_tokens: int) -> List[str]:
+    """Lines, then sentences (then fixed slices) for lines that alone exceed the target"""
+    units = []
+    for line in transcription.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if estimate_tokens(line) <= target_tokens:
+            units.append(line)
+            continue
+        for sentence in _SENTENCE_END.split(line):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            if estimate_tokens(sentence) <= target_tokens:
+                units.append(sentence)
+                continue
+            # Unpunctuated run: at worst 1 token per char
+            units.extend(sentence[start:start + target_tokens] for start in range(0, len(sentence), target_tokens))
+    return units
+
+
+def split_transcript(
+    transcription: str,
+    transcription_metadata: Optional[Dict[str, Any]] = None,
+    target_tokens: int = PHASE1_CHUNK_TARGET_TOKENS
+) -> List[str]:
+    """Pack boundary-aligned units into chunks of about target_tokens"""
+    units = _metadata_units(transcription, transcription_metadata) or _text_units(transcription, target_tokens)
+
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for unit in units:
+        unit_tokens = estimate_tokens(unit)
+        if current and current_tokens + unit_tokens > target_tokens:
+            chunks.append('\n'.join(current))
+            current, current_tokens = [], 0
+        current.append(unit)
+        current_tokens += unit_tokens
+    if current:
+        chunks.append('\n'.join(current))
+    return chunks
+
+
+# ------------------------------------------------------------------
+# Merge
+# ------------------------------------------------------------------
+
+def _dedupe_key(category: str, item: Any) -> str:
+    if isinstance(item, dict):
+        if category == 'basic_info':
+            text = f"{item.get('field', '')}={item.get('value', '')}"
+        else:
+            text = str(item.get('summary', ''))
+    else:
+        text = str(item)
+    return _DEDUPE_STRIP.sub('', unicodedata.normalize('NFKC', text)).lower()
+
+
+def _merge_duplicate(kept: Dict[str, Any], item: Dict[str, Any]) -> None:
+    if CONFIDENCE_RANK.get(item.get('confidence'), -1) > CONFIDENCE_RANK.get(kept.get('confidence'), -1):
+        kept['confidence'] = item['confidence']
+    if isinstance(item.get('priority'), int):
+        if not isinstance(kept.get('priority'), int) or item['priority'] < kept['priority']:
+            kept['priority'] = item['priority']
+
+
+def merge_extractions(parts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge per-chunk extraction_v1 dicts (in chunk order) deterministically
+
+    Categories follow EXTRACTION_CATEGORIES (unknown ones after, sorted);
+    items keep first-seen order and exact/normalized duplicates collapse.
+    """
+    extra_categories = sorted({
+        category for part in parts for category in part
+        if category not in EXTRACTION_CATEGORIES
+    })
+
+    merged: Dict[str, Any] = {}
+    for category in EXTRACTION_CATEGORIES + extra_categories:
+        items: List[Any] = []
+        seen: Dict[str, Any] = {}
+        for part in parts:
+            for item in part.get(category) or []:
+                key = _dedupe_key(category, item)
+                if not key:
+                    continue
+                if key in seen:
+                    if isinstance(item, dict) and isinstance(seen[key], dict):
+                        _merge_duplicate(seen[key], item)
+                    continue
+                item = dict(item) if isinstance(item, dict) else item
+                seen[key] = item
+                items.append(item)
+        merged[category] = items
+    return merged
+
+
+# ------------------------------------------------------------------
+# Map-reduce
+# ------------------------------------------------------------------
+
+async def arun_chunked_extraction(
+    llm_service,
+    chunks: List[str],
+    build_chunk_prompt: Callable[[str, int, int], str],
+    progress: PhaseProgress
+) -> Dict[str, Any]:
+    """
+    Extract each chunk concurrently and merge into {"extraction_v1": ...}
+
+    Args:
+        llm_service: LLM service instance
+        chunks: Transcript chunks (split_transcript)
+        build_chunk_prompt: (chunk_text, part_index, part_count) -> prompt
+        progress: Phase progress; receives each chunk's output as it completes
+
+    Raises:
+        ValueError: If a chunk fails or returns no extraction_v1
+    """
+    semaphore = asyncio.Semaphore(PHASE1_CHUNK_CONCURRENCY)
+    part_count = len(chunks)
+
+    async def extract(index: int, chunk: str) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                output = await agenerate_bounded(llm_service, build_chunk_prompt(chunk, index + 1, part_count))
+            except Exception as e:
+                raise ValueError(f"chunk {index + 1}/{part_count}: {e}") from e
+
+        progress.add(output or '')
+        extraction = extract_from_wrapped_result(parse_llm_output(output or ''), 'extraction_v1')
+        if not isinstance(extraction, dict):
+            raise ValueError(f"chunk {index + 1}/{part_count}: extraction_v1 not found in LLM response")
+        return extraction
+
+    await progress.start()
+    tasks = [asyncio.ensure_future(extract(index, chunk)) for index, chunk in enumerate(chunks)]
+    try:
+        # gather() keeps chunk order regardless of completion order
+        parts = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    return {'extraction_v1': merge_extractions(list(parts))}
@@ -0,0 +1,586 @@
+"""
+Pipeline Job Queue - Durable, bounded execution of background pipeline jobs
+
+Replaces the per-request daemon threads of /api/transcribe, /api/analyze,
+/api/structure-facts and /api/assess:
+1. Jobs are persisted to business_pipeline_jobs before they are queued
+2. Each job type has its own worker pool with configurable concurrency
+3. Admission control rejects new jobs when the local backlog is full
+4. The owning process renews a lease on every job it holds; jobs whose lease
+   expired (process killed by a redeploy) are re-claimed by the next process
+5. Handlers record completed steps, so a re-claimed job resumes after the
+   last completed step instead of re-running costly ASR/LLM calls
+
+Handlers may be plain functions (run on a dedicated worker thread pool) or
+coroutine functions. Coroutine handlers of all job types are multiplexed on
+one shared event loop thread; their concurrency is bounded per job type, so
+many in-flight LLM phases no longer occupy one OS thread each.
+"""
+
+import asyncio
+import os
+import queue
+import socket
+import threading
+import traceback
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from supabase import Client
+
+
+JOBS_TABLE = 'business_pipeline_jobs'
+ACTIVE_JOB_STATUSES = ['queued', 'running']
+
+
+class JobQueueFull(Exception):
+    """Raised when admission control rejects a new job"""
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class JobContext:
+    """Handle passed to job handlers (job row data + step checkpoints)"""
+
+    def __init__(self, job_queue: 'JobQueue', job: Dict[str, Any]):
+        self._job_queue = job_queue
+        self._job = job
+        self._completed_steps: List[str] = list(job.get('completed_steps') or [])
+
+    @property
+    def id(self) -> str:
+        return self._job['id']
+
+    @property
+    def job_type(self) -> str:
+        return self._job['job_type']
+
+    @property
+    def session_id(self) -> str:
+        return self._job['session_id']
+
+    @property
+    def payload(self) -> Dict[str, Any]:
+        return self._job.get('payload') or {}
+
+    @property
+    def attempts(self) -> int:
+        return self._job.get('attempts') or 0
+
+    def is_done(self, step: str) -> bool:
+        """Return True if the step was completed by a previous attempt"""
+        return step in self._completed_steps
+
+    def mark_done(self, step: str) -> None:
+        """Persist a completed step so a re-claimed job can skip it"""
+        if step in self._completed_steps:
+            return
+        self._completed_steps.append(step)
+        self._job_queue._update_job(self.id, {'completed_steps': self._completed_steps})
+
+
+class JobQueue:
+    """Persisted job queue with per-job-type worker pools"""
+
+    def __init__(
+        self,
+        supabase: Client,
+        max_pending: int = 20,
+        lease_seconds: int = 120,
+        max_attempts: int = 3
+    ):
+        """
+        Args:
+            supabase: Supabase client
+            max_pending: Max jobs (queued + running) held by this process
+            lease_seconds: Lease duration; a job whose lease expired is re-claimable
+            max_attempts: Max execution attempts before a re-claimed job is abandoned
+        """
+        self.supabase = supabase
+        self.max_pending = max_pending
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.owner_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        self._handlers: Dict[str, Callable[[JobContext], Any]] = {}
+        self._async_types: set = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._on_exhausted: Dict[str, Optional[Callable[[Dict[str, Any]], None]]] = {}
+        self._concurrency: Dict[str, int] = {}
+        self._queues: Dict[str, 'queue.Queue[str]'] = {}
+        self._held: Dict[str, Dict[str, Any]] = {}
+        self._running: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._counters = {'submitted': 0, 'deduplicated': 0, 'rejected': 0,
+                          'recovered': 0, 'succeeded': 0, 'failed': 0, 'abandoned': 0}
+
+    # ------------------------------------------------------------------
+    # Registration / lifecycle
+    # ------------------------------------------------------------------
+
+    def register(
+        self,
+        job_type: str,
+        handler: Callable[[JobContext], None],
+        concurrency: int = 1,
+        on_exhausted: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> None:
+        """
+        Register a handler for a job type
+
+        Args:
+            job_type: Job type name (e.g., "transcribe", "analyze")
+            handler: Callable (or coroutine function) taking a JobContext
+            concurrency: Max jobs of this type executing at once
+            on_exhausted: Called with the job row when a job is abandoned after max_attempts
+        """
+        self._handlers[job_type] = handler
+        if asyncio.iscoroutinefunction(handler):
+            self._async_types.add(job_type)
+        self._on_exhausted[job_type] = on_exhausted
+        self._concurrency[job_type] = max(1, concurrency)
+        self._queues[job_type] = queue.Queue()
+
+    def start(self) -> None:
+        """Start worker pools, the lease keeper, and recover abandoned jobs"""
+        self._stop.clear()
+        if self._async_types:
+            self._loop = asyncio.new_event_loop()
+            loop_thread = threading.Thread(target=self._loop.run_forever, name="job-event-loop", daemon=True)
+            loop_thread.start()
+            self._threads.append(loop_thread)
+
+        for job_type, concurrency in self._concurrency.items():
+            if job_type in self._async_types:
+                thread = threading.Thread(
+                    target=self._dispatch_loop,
+                    args=(job_type,),
+                    name=f"job-{job_type}-dispatch",
+                    daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+                continue
+            for index in range(concurrency):
+                thread = threading.Thread(
+                    target=self._worker_loop,
+                    args=(job_type,),
+                    name=f"job-{job_type}-{index}",
+                    daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+        keeper = threading.Thread(target=self._lease_loop, name="job-lease-keeper", daemon=True)
+        keeper.start()
+        self._threads.append(keeper)
+
+        print(f"[JobQueue] Started as {self.owner_id} with concurrency {self._concurrency}")
+        self.recover()
+
+    def stop(self) -> None:
+        """
+        Stop accepting work and release leases on jobs that have not started,
+        so another process can pick them up immediately. Running jobs keep
+        their lease until it expires and are then re-claimed.
+        """
+        self._stop.set()
+        with self._lock:
+            waiting_ids = [job_id for job_id in self._held if job_id not in self._running]
+        if waiting_ids:
+            try:
+                self.supabase.table(JOBS_TABLE).update({
+                    'lease_expires_at': _utc_now().isoformat(),
+                    'updated_at': _utc_now().isoformat()
+                }).in_('id', waiting_ids).eq('owner_id', self.owner_id).execute()
+            except Exception as e:
+                print(f"[JobQueue] WARNING: Failed to release leases on shutdown: {e}")
+        if self._loop:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        print(f"[JobQueue] Stopped ({len(waiting_ids)} queued jobs released)")
+
+    # ------------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------------
+
+    def submit(
+        self,
+        job_type: str,
+        session_id: str,
+        payload: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Persist and enqueue a job
+
+        If an active job of the same type already exists for the session
+        (e.g., duplicate Lambda delivery), that job is returned instead.
+
+        Returns:
+            (job row, created) - created is False when an active job was reused
+
+        Raises:
+            ValueError: If the job type is not registered
+            JobQueueFull: If this process already holds max_pending jobs
+        """
+        if job_type not in self._handlers:
+            raise ValueError(f"Unknown job type: {job_type}")
+
+        existing = self._find_active_job(job_type, session_id)
+        if existing:
+            lease_expires_at = _parse_timestamp(existing.get('lease_expires_at'))
+            if lease_expires_at and lease_expires_at > _utc_now():
+                self._count('deduplicated')
+                print(f"[JobQueue] Reusing active {job_type} job {existing['id']} for session: {session_id}")
+                return existing, False
+
+        if existing and self._reserve(existing):
+            # Lease expired (owner died) - take the job over right away
+            claimed = self._claim(existing)
+            if claimed:
+                return claimed, False
+            self._release(existing['id'])
+
+        now = _utc_now()
+        job = {
+            'id': str(uuid.uuid4()),
+            'job_type': job_type,
+            'session_id': session_id,
+            'payload': payload or {},
+            'status': 'queued',
+            'attempts': 0,
+            'completed_steps': [],
+            'owner_id': self.owner_id,
+            'lease_expires_at': (now + timedelta(seconds=self.lease_seconds)).isoformat(),
+            'created_at': now.isoformat(),
+            'updated_at': now.isoformat(),
+        }
+        if not self._reserve(job):
+            with self._lock:
+                self._counters['rejected'] += 1
+                held = len(self._held)
+            raise JobQueueFull(
+                f"Job queue is full ({held}/{self.max_pending} jobs in progress). "
+                "Please retry later."
+            )
+
+        try:
+            self.supabase.table(JOBS_TABLE).insert(job).execute()
+        except Exception:
+            self._release(job['id'])
+            # Unique index on active (job_type, session_id): another process won the race
+            existing = self._find_active_job(job_type, session_id)
+            if existing:
+                self._count('deduplicated')
+                return existing, False
+            raise
+
+        self._count('submitted')
+        self._enqueue(job)
+        print(f"[JobQueue] Queued {job_type} job {job['id']} for session: {session_id}")
+        return job, True
+
+    # ------------------------------------------------------------------
+    # Recovery
+    # ------------------------------------------------------------------
+
+    def recover(self) -> int:
+        """
+        Re-claim active jobs whose lease expired (owner process was killed)
+
+        Returns:
+            Number of jobs re-claimed by this process
+        """
+        with self._lock:
+            capacity = self.max_pending - len(self._held)
+        if capacity <= 0:
+            return 0
+
+        try:
+            result = self.supabase.table(JOBS_TABLE)\
+                .select('*')\
+                .in_('status', ACTIVE_JOB_STATUSES)\
+                .in_('job_type', list(self._handlers.keys()))\
+                .lt('lease_expires_at', _utc_now().isoformat())\
+                .order('created_at')\
+                .limit(capacity)\
+                .execute()
+        except Exception as e:
+            print(f"[JobQueue] WARNING: Failed to query abandoned jobs: {e}")
+            return 0
+
+        recovered = 0
+        for job in result.data or []:
+            if (job.get('attempts') or 0) >= self.max_attempts:
+                self._abandon(job)
+                continue
+            if not self._reserve(job):
+                continue
+            if self._claim(job):
+                recovered += 1
+            else:
+                self._release(job['id'])
+
+        if recovered:
+            self._count('recovered', recovered)
+            print(f"[JobQueue] Re-claimed {recovered} abandoned job(s)")
+        return recovered
+
+    def _claim(self, job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Take over an expired job (compare-and-set on its lease; the caller reserved its slot)"""
+        now = _utc_now()
+        query = self.supabase.table(JOBS_TABLE).update({
+            'status': 'queued',
+            'owner_id': self.owner_id,
+            'lease_expires_at': (now + timedelta(seconds=self.lease_seconds)).isoformat(),
+            'updated_at': now.isoformat()
+        }).eq('id', job['id']).in_('status', ACTIVE_JOB_STATUSES)
+        if job.get('lease_expires_at'):
+            query = query.eq('lease_expires_at', job['lease_expires_at'])
+        result = query.execute()
+
+        if not result.data:
+            return None  # Another process claimed it first
+
+        claimed = result.data[0]
+        self._enqueue(claimed)
+        print(f"[JobQueue] Re-claimed {claimed['job_type']} job {claimed['id']} "
+              f"(attempt {(claimed.get('attempts') or 0) + 1}) for session: {claimed['session_id']}")
+        return claimed
+
+    def _abandon(self, job: Dict[str, Any]) -> None:
+        """Mark a job as failed after too many attempts"""
+        result = self.supabase.table(JOBS_TABLE).update({
+            'status': 'failed',
+            'error_message': f"Abandoned after {job.get('attempts')} attempts",
+            'finished_at': _utc_now().isoformat(),
+            'updated_at': _utc_now().isoformat()
+        }).eq('id', job['id']).in_('status', ACTIVE_JOB_STATUSES).execute()
+
+        if not result.data:
+            return
+
+        self._count('abandoned')
+        print(f"[JobQueue] Abandoned {job['job_type']} job {job['id']} for session: {job['session_id']}")
+        on_exhausted = self._on_exhausted.get(job['job_type'])
+        if on_exhausted:
+            try:
+                on_exhausted(job)
+            except Exception as e:
+                print(f"[JobQueue] WARNING: on_exhausted hook failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    def _reserve(self, job: Dict[str, Any]) -> bool:
+        """
+        Take a max_pending slot for a job about to be inserted or claimed
+
+        The capacity check and the slot are one lock hold, so submit() and
+        recover() (lease keeper thread) cannot both fill the last slot.
+        False when full or when the job is already held. Released with
+        _release() if the job is not enqueued after all.
+        """
+        with self._lock:
+            if job['id'] in self._held or len(self._held) >= self.max_pending:
+                return False
+            self._held[job['id']] = job
+            return True
+
+    def _enqueue(self, job: Dict[str, Any]) -> None:
+        with self._lock:
+            self._held[job['id']] = job
+        self._queues[job['job_type']].put(job['id'])
+
+    def _worker_loop(self, job_type: str) -> None:
+        job_queue = self._queues[job_type]
+        while not self._stop.is_set():
+            try:
+                job_id = job_queue.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            try:
+                self._execute(job_id)
+            finally:
+                job_queue.task_done()
+
+    def _dispatch_loop(self, job_type: str) -> None:
+        """Hand queued jobs of an async job type to the shared event loop"""
+        job_queue = self._queues[job_type]
+        slots = threading.BoundedSemaphore(self._concurrency[job_type])
+        while not self._stop.is_set():
+            try:
+                job_id = job_queue.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            slots.acquire()
+            future = asyncio.run_coroutine_threadsafe(self._execute_async(job_id), self._loop)
+            future.add_done_callback(lambda _: slots.release())
+            job_queue.task_done()
+
+    def _execute(self, job_id: str) -> None:
+        try:
+            job = self._begin(job_id)
+            if job is None:
+                return
+            self._handlers[job['job_type']](JobContext(self, job))
+            self._succeed(job)
+        except Exception as e:
+            self._fail(job_id, e)
+        finally:
+            self._release(job_id)
+
+    async def _execute_async(self, job_id: str) -> None:
+        try:
+            job = await asyncio.to_thread(self._begin, job_id)
+            if job is None:
+                return
+            await self._handlers[job['job_type']](JobContext(self, job))
+            await asyncio.to_thread(self._succeed, job)
+        except Exception as e:
+            await asyncio.to_thread(self._fail, job_id, e)
+        finally:
+            self._release(job_id)
+
+    def _begin(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Mark a held job as running; returns None if it is no longer ours"""
+        with self._lock:
+            job = self._held.get(job_id)
+        if not job:
+            return None
+
+        now = _utc_now()
+        attempts = (job.get('attempts') or 0) + 1
+        result = self.supabase.table(JOBS_TABLE).update({
+            'status': 'running',
+            'attempts': attempts,
+            'started_at': now.isoformat(),
+            'lease_expires_at': (now + timedelta(seconds=self.lease_seconds)).isoformat(),
+            'updated_at': now.isoformat()
+        }).eq('id', job_id).eq('owner_id', self.owner_id).execute()
+
+        if not result.data:
+            print(f"[JobQueue] Job {job_id} no longer owned by this process, skipping")
+            return None
+
+        job = result.data[0]
+        with self._lock:
+            self._running[job_id] = job['job_type']
+
+        print(f"[JobQueue] Running {job['job_type']} job {job_id} (attempt {attempts}) for session: {job['session_id']}")
+        return job
+
+    def _succeed(self, job: Dict[str, Any]) -> None:
+        self._update_job(job['id'], {
+            'status': 'succeeded',
+            'error_message': None,
+            'finished_at': _utc_now().isoformat()
+        })
+        self._count('succeeded')
+        print(f"[JobQueue] {job['job_type']} job {job['id']} succeeded")
+
+    def _fail(self, job_id: str, error: Exception) -> None:
+        print(f"[JobQueue] ERROR in job {job_id}: {str(error)}")
+        print(f"[JobQueue] Traceback:\n{''.join(traceback.format_exception(error))}")
+        self._count('failed')
+        try:
+            self._update_job(job_id, {
+                'status': 'failed',
+                'error_message': str(error),
+                'finished_at': _utc_now().isoformat()
+            })
+        except Exception as update_err:
+            print(f"[JobQueue] WARNING: Failed to record job failure: {update_err}")
+
+    def _release(self, job_id: str) -> None:
+        with self._lock:
+            self._held.pop(job_id, None)
+            self._running.pop(job_id, None)
+
+    def _lease_loop(self) -> None:
+        """Renew leases on held jobs and periodically re-claim abandoned ones"""
+        interval = max(5, self.lease_seconds // 3)
+        while not self._stop.wait(interval):
+            with self._lock:
+                held_ids = list(self._held.keys())
+            if held_ids:
+                try:
+                    self.supabase.table(JOBS_TABLE).update({
+                        'lease_expires_at': (_utc_now() + timedelta(seconds=self.lease_seconds)).isoformat()
+                    }).in_('id', held_ids).eq('owner_id', self.owner_id).execute()
+                except Exception as e:
+                    print(f"[JobQueue] WARNING: Failed to renew leases: {e}")
+            self.recover()
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _find_active_job(self, job_type: str, session_id: str) -> Optional[Dict[str, Any]]:
+        result = self.supabase.table(JOBS_TABLE)\
+            .select('*')\
+            .eq('job_type', job_type)\
+            .eq('session_id', session_id)\
+            .in_('status', ACTIVE_JOB_STATUSES)\
+            .limit(1)\
+            .execute()
+        return result.data[0] if result.data else None
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        # Called from request handlers, worker threads and the lease keeper
+        with self._lock:
+            self._counters[key] += amount
+
+    def _update_job(self, job_id: str, data: Dict[str, Any]) -> None:
+        data['updated_at'] = _utc_now().isoformat()
+        self.supabase.table(JOBS_TABLE).update(data).eq('id', job_id).execute()
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        result = self.supabase.table(JOBS_TABLE)\
+            .select('*')\
+            .eq('id', job_id)\
+            .limit(1)\
+            .execute()
+        return result.data[0] if result.data else None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-job-type queue depth and running counts for this process"""
+        with self._lock:
+            running_by_type: Dict[str, int] = {}
+            for job_type in self._running.values():
+                running_by_type[job_type] = running_by_type.get(job_type, 0) + 1
+            held = len(self._held)
+            counters = dict(self._counters)
+
+        return {
+            'owner_id': self.owner_id,
+            'max_pending': self.max_pending,
+            'in_progress': held,
+            'job_types': {
+                job_type: {
+                    'concurrency': self._concurrency[job_type],
+                    'mode': 'async' if job_type in self._async_types else 'thread',
+                    'queued': self._queues[job_type].qsize(),
+                    'running': running_by_type.get(job_type, 0),
+                }
+                for job_type in self._handlers
+            },
+            'counters': counters,
+        }
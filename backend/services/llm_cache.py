@@ -0,0 +1,230 @@
+"""
+LLM response cache (content-addressed)
+
+Key: sha256 of provider/model + canonical prompt
+Tiers:
+- memory:     in-process LRU, evicted by total response size (bytes)
+- persistent: business_llm_response_cache table, shared by all workers and
+              surviving redeploys
+
+Re-running a phase with an unchanged prompt (use_custom_prompt, duplicate
+Lambda delivery) returns the stored response instead of calling the LLM.
+Cache failures never fail a phase: the provider is called as usual.
+"""
+
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, Optional
+
+from supabase import Client
+
+from services.llm_providers import LLMProvider
+
+
+LLM_CACHE_TABLE = 'business_llm_response_cache'
+
+
+def canonical_prompt(prompt: str) -> str:
+    """Normalize whitespace that does not change the meaning of a prompt"""
+    lines = prompt.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    return '\n'.join(line.rstrip() for line in lines).strip()
+
+
+def build_cache_key(model_name: str, prompt: str) -> str:
+    """model_name is '<provider>/<model>' (LLMProvider.model_name)"""
+    digest = hashlib.sha256()
+    digest.update(model_name.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(canonical_prompt(prompt).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class LLMResponseCache:
+    """Two-tier (memory LRU + Supabase) cache of LLM responses"""
+
+    def __init__(
+        self,
+        supabase: Optional[Client],
+        max_memory_bytes: int = 32 * 1024 * 1024,
+        ttl_days: int = 30
+    ):
+        self.supabase = supabase
+        self.max_memory_bytes = max_memory_bytes
+        self.ttl_days = ttl_days
+
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {
+            'memory_hits': 0,
+            'persistent_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0,
+            'persistent_errors': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Memory tier
+    # ------------------------------------------------------------------
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._counters[key] += 1
+
+    def _memory_get(self, key: str) -> Optional[str]:
+        with self._lock:
+            response = self._entries.get(key)
+            if response is not None:
+                self._entries.move_to_end(key)
+            return response
+
+    def _memory_put(self, key: str, response: str) -> None:
+        size = len(response.encode('utf-8'))
+        if size > self.max_memory_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous.encode('utf-8'))
+
+            self._entries[key] = response
+            self._memory_bytes += size
+
+            while self._memory_bytes > self.max_memory_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._memory_bytes -= len(evicted.encode('utf-8'))
+                self._counters['evictions'] += 1
+
+    # ------------------------------------------------------------------
+    # Persistent tier
+    # ------------------------------------------------------------------
+
+    def _persistent_get(self, key: str) -> Optional[str]:
+        if not self.supabase:
+            return None
+
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=self.ttl_days)).isoformat()
+        try:
+            result = self.supabase.table(LLM_CACHE_TABLE)\
+                .select('response')\
+                .eq('cache_key', key)\
+                .gte('created_at', cutoff)\
+                .limit(1)\
+                .execute()
+        except Exception as e:
+            print(f"[LLMCache] Persistent lookup failed: {e}")
+            self._count('persistent_errors')
+            return None
+
+        return result.data[0]['response'] if result.data else None
+
+    def _persistent_put(self, key: str, model_name: str, response: str) -> None:
+        if not self.supabase:
+            return
+
+        try:
+            self.supabase.table(LLM_CACHE_TABLE).upsert({
+                'cache_key': key,
+                'model_name': model_name,
+                'response': response,
+                'response_bytes': len(response.encode('utf-8')),
+                'created_at': datetime.now(timezone.utc).isoformat()
+            }, on_conflict='cache_key').execute()
+        except Exception as e:
+            print(f"[LLMCache] Persistent store failed: {e}")
+            self._count('persistent_errors')
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, model_name: str, prompt: str) -> Optional[str]:
+        key = build_cache_key(model_name, prompt)
+
+        response = self._memory_get(key)
+        if response is not None:
+            self._count('memory_hits')
+            return response
+
+        response = self._persistent_get(key)
+        if response is not None:
+            self._count('persistent_hits')
+            self._memory_put(key, response)
+            return response
+
+        self._count('misses')
+        return None
+
+    def put(self, model_name: str, prompt: str, response: str) -> None:
+        if not response:
+            return
+
+        key = build_cache_key(model_name, prompt)
+        self._memory_put(key, response)
+        self._persistent_put(key, model_name, response)
+        self._count('stores')
+
+    def wrap(self, provider: LLMProvider) -> "CachedLLMProvider":
+        return CachedLLMProvider(provider, self)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats['memory_entries'] = len(self._entries)
+            stats['memory_bytes'] = self._memory_bytes
+
+        stats['max_memory_bytes'] = self.max_memory_bytes
+        lookups = stats['memory_hits'] + stats['persistent_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['memory_hits'] + stats['persistent_hits']) / lookups, 3) if lookups else None
+        return stats
+
+
+class CachedLLMProvider(LLMProvider):
+    """LLMProvider decorator that consults LLMResponseCache before calling the LLM"""
+
+    def __init__(self, provider: LLMProvider, cache: LLMResponseCache):
+        self.provider = provider
+        self.cache = cache
+
+    def generate(self, prompt: str) -> str:
+        cached = self.cache.get(self.model_name, prompt)
+        if cached is not None:
+            print(f"[LLMCache] Hit for {self.model_name}")
+            return cached
+
+        response = self.provider.generate(prompt)
+        self.cache.put(self.model_name, prompt, response)
+        return response
+
+    async def agenerate(self, prompt: str) -> str:
+        cached = await asyncio.to_thread(self.cache.get, self.model_name, prompt)
+        if cached is not None:
+            print(f"[LLMCache] Hit for {self.model_name}")
+            return cached
+
+        response = await self.provider.agenerate(prompt)
+        await asyncio.to_thread(self.cache.put, self.model_name, prompt, response)
+        return response
+
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        cached = await asyncio.to_thread(self.cache.get, self.model_name, prompt)
+        if cached is not None:
+            print(f"[LLMCache] Hit for {self.model_name}")
+            yield cached
+            return
+
+        chunks = []
+        async for chunk in self.provider.astream(prompt):
+            chunks.append(chunk)
+            yield chunk
+        # Only a fully consumed stream is stored
+        await asyncio.to_thread(self.cache.put, self.model_name, prompt, ''.join(chunks))
+
+    @property
+    def model_name(self) -> str:
+        return self.provider.model_name
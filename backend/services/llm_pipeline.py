@@ -2,18 +2,197 @@
 LLM Pipeline - Common processing for Phase 1-3
 
 Unified pattern for all analysis phases:
-1. Load data from DB
+1. Load data from DB (one projected read)
 2. Generate prompt
 3. Call LLM
 4. Parse response
-5. Save result to DB
+5. Save prompt + result to DB (one write)
+
+While the LLM streams, partial output and progress (tokens so far, elapsed
+time) are flushed every LLM_PROGRESS_FLUSH_SECONDS to business_phase_progress.
+A stream that produces nothing for LLM_STREAM_STALL_SECONDS is aborted.
+
+aexecute_llm_phase() is the asyncio-native implementation: LLM calls go
+through LLMProvider.agenerate() (bounded by LLM_MAX_CONCURRENCY per event
+loop) and Supabase calls run in short-lived worker threads. The sync
+execute_llm_phase() wrapper stays available for scripts.
 """
 
+import asyncio
 import json
+import os
 import time
+import weakref
 from datetime import datetime
-from typing import Callable, Dict, Any, Optional
+from typing import Awaitable, Callable, Dict, Any, Optional
 from supabase import Client
+from services.phase_io import (
+    build_projection,
+    read_phase_input,
+    start_phase,
+    write_phase_error,
+    write_phase_progress,
+    write_phase_result,
+)
+from services.session_events import publish_session_event
+
+
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_PROGRESS_FLUSH_SECONDS = float(os.getenv("LLM_PROGRESS_FLUSH_SECONDS", "2"))
+# Reasoning models can think for minutes before the first token
+LLM_STREAM_STALL_SECONDS = float(os.getenv("LLM_STREAM_STALL_SECONDS", "300"))
+PROGRESS_EVENT_TAIL_CHARS = 500
+
+_llm_semaphores = weakref.WeakKeyDictionary()
+
+
+async def run_query(query):
+    """Execute a Supabase query builder off the event loop"""
+    return await asyncio.to_thread(query.execute)
+
+
+def _llm_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _llm_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+        _llm_semaphores[loop] = semaphore
+    return semaphore
+
+
+async def agenerate_bounded(llm_service, prompt: str) -> str:
+    """Call llm_service.agenerate() under the per-loop LLM concurrency limit"""
+    async with _llm_semaphore():
+        return await llm_service.agenerate(prompt)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count: ~4 ASCII chars per token, ~1 token per Japanese char"""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+class PhaseProgress:
+    """
+    Periodically persist partial LLM output of one phase
+
+    Flushes run in the background (at most one in flight) so the stream is
+    never paused by a DB write. Progress write failures are logged only.
+    """
+
+    def __init__(self, supabase: Optional[Client], session_id: str, phase_name: str, model_name: Optional[str]):
+        self.supabase = supabase
+        self.session_id = session_id
+        self.phase_name = phase_name
+        self.model_name = model_name
+        self.started_at = datetime.now()
+        self._start = time.monotonic()
+        self._last_flush = 0.0
+        self._last_output_at: Optional[str] = None
+        self._chunks = []
+        self._notes: Dict[str, Any] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    @property
+    def output(self) -> str:
+        return ''.join(self._chunks)
+
+    def _snapshot(self, status: str, include_output: bool = True, error_message: Optional[str] = None) -> Dict[str, Any]:
+        output = self.output
+        return {
+            'status': status,
+            'model_name': self.model_name,
+            'partial_output': output if include_output else None,
+            'output_chars': len(output),
+            'output_tokens_estimate': estimate_tokens(output),
+            'elapsed_seconds': round(time.monotonic() - self._start, 1),
+            'started_at': self.started_at.isoformat(),
+            'last_output_at': self._last_output_at,
+            'error_message': error_message,
+            'notes': dict(self._notes) or None,
+        }
+
+    async def _write(self, data: Dict[str, Any]) -> None:
+        # SSE subscribers get the tail only; the full partial output stays in the progress store
+        event_data = {key: value for key, value in data.items() if key != 'partial_output'}
+        event_data['phase'] = self.phase_name
+        event_data['partial_output_tail'] = (data.get('partial_output') or '')[-PROGRESS_EVENT_TAIL_CHARS:]
+        publish_session_event(self.session_id, 'phase_progress', event_data)
+
+        if not self.supabase:
+            return
+        try:
+            await write_phase_progress(self.supabase, self.session_id, self.phase_name, data)
+        except Exception as e:
+            print(f"[Background] Progress write failed for {self.phase_name}: {e}")
+
+    async def start(self) -> None:
+        await self._write(self._snapshot('generating'))
+        self._last_flush = time.monotonic()
+
+    def add(self, chunk: str) -> None:
+        self._chunks.append(chunk)
+        self._last_output_at = datetime.now().isoformat()
+
+        now = time.monotonic()
+        if now - self._last_flush < LLM_PROGRESS_FLUSH_SECONDS:
+            return
+        if self._flush_task and not self._flush_task.done():
+            return
+        self._last_flush = now
+        self._flush_task = asyncio.create_task(self._write(self._snapshot('generating')))
+
+    def note(self, key: str, value: Any) -> None:
+        """Attach run metadata (e.g. a parallel runner falling back) to the progress row"""
+        self._notes[key] = value
+
+    def discard_output(self) -> None:
+        """Drop partial output before the same phase is generated again"""
+        self._chunks = []
+
+    async def _drain(self) -> None:
+        if self._flush_task and not self._flush_task.done():
+            await self._flush_task
+
+    async def finish(self) -> None:
+        """Mark generation complete (the result itself lives on the session row)"""
+        await self._drain()
+        await self._write(self._snapshot('completed', include_output=False))
+
+    async def fail(self, error_message: str) -> None:
+        await self._drain()
+        await self._write(self._snapshot('failed', error_message=error_message))
+
+
+async def astream_with_progress(llm_service, prompt: str, progress: PhaseProgress) -> str:
+    """
+    Stream llm_service.astream() under the LLM concurrency limit, feeding
+    chunks into progress. Raises TimeoutError if the stream stalls.
+    """
+    async with _llm_semaphore():
+        await progress.start()
+        stream = llm_service.astream(prompt).__aiter__()
+        while True:
+            try:
+                chunk = await asyncio.wait_for(stream.__anext__(), LLM_STREAM_STALL_SECONDS)
+            except StopAsyncIteration:
+                break
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"LLM stream stalled: no output for {LLM_STREAM_STALL_SECONDS:.0f}s")
+            progress.add(chunk)
+    return progress.output
+
+
+def parse_llm_output(llm_output: str) -> Dict[str, Any]:
+    """Parse LLM response (JSON object, or plain text wrapped in summary)"""
+    try:
+        if llm_output.strip().startswith('{'):
+            return json.loads(llm_output)
+        # If not JSON, wrap in summary structure
+        return {'summary': llm_output}
+    except json.JSONDecodeError:
+        # Fallback: treat as plain text
+        return {'summary': llm_output}
 
 
 def format_llm_error_message(error: Exception) -> str:
@@ -57,18 +236,57 @@ def execute_llm_phase(
     prompt_column: str,
     model_used_column: Optional[str] = None,
     additional_data: Optional[Dict[str, Any]] = None,
-    use_stored_prompt: bool = False
-) -> None:
+    use_stored_prompt: bool = False,
+    input_data: Optional[Dict[str, Any]] = None,
+    parallel_runner: Optional[Callable[..., Awaitable[Optional[Dict[str, Any]]]]] = None
+) -> Dict[str, Any]:
+    """
+    Execute a single LLM analysis phase (Phase 1, 2, or 3) - sync wrapper
+
+    Runs aexecute_llm_phase() on a private event loop. Must not be called
+    from a running event loop (use aexecute_llm_phase there).
+    """
+    return asyncio.run(aexecute_llm_phase(
+        session_id=session_id,
+        supabase=supabase,
+        llm_service=llm_service,
+        phase_name=phase_name,
+        prompt_builder=prompt_builder,
+        input_selector=input_selector,
+        output_column=output_column,
+        prompt_column=prompt_column,
+        model_used_column=model_used_column,
+        additional_data=additional_data,
+        use_stored_prompt=use_stored_prompt,
+        input_data=input_data,
+        parallel_runner=parallel_runner
+    ))
+
+
+async def aexecute_llm_phase(
+    session_id: str,
+    supabase: Client,
+    llm_service,
+    phase_name: str,
+    prompt_builder: Callable,
+    input_selector: str,
+    output_column: str,
+    prompt_column: str,
+    model_used_column: Optional[str] = None,
+    additional_data: Optional[Dict[str, Any]] = None,
+    use_stored_prompt: bool = False,
+    input_data: Optional[Dict[str, Any]] = None,
+    parallel_runner: Optional[Callable[..., Awaitable[Optional[Dict[str, Any]]]]] = None
+) -> Dict[str, Any]:
     """
     Execute a single LLM analysis phase (Phase 1, 2, or 3)
 
-    Unified processing pattern:
-    1. DB.select() - Load previous phase result
+    Unified processing pattern (one read, one write - see phase_io.py):
+    1. DB.select() - Load previous phase result and stored prompt in one projection
     2. Build prompt (or use stored prompt if use_stored_prompt=True)
-    3. Save prompt to DB
-    4. Call LLM
-    5. Parse JSON (flexible)
-    6. Save result to DB
+    3. Call LLM (streaming, progress flushed to business_phase_progress)
+    4. Parse JSON (flexible)
+    5. DB.update() - Save prompt, result, model used and cleared error together
 
     Args:
         session_id: Session ID
@@ -82,94 +300,89 @@ def execute_llm_phase(
         model_used_column: DB column to record model used (e.g., "model_used_phase2")
         additional_data: Additional data to pass to prompt_builder (optional)
         use_stored_prompt: If True, use the prompt already stored in DB instead of rebuilding
+        input_data: Input columns already in memory (e.g., the previous phase result
+            in an auto-chain); skips the DB read when the stored prompt is not needed
+        parallel_runner: async (llm_service, session_data, progress) -> result or None.
+            Splits the phase into concurrent LLM calls; None falls back to the single
+            call. Never used with a stored (user-edited) prompt. The full prompt is
+            still saved to prompt_column.
+
+    Returns:
+        Parsed result saved to output_column
 
     Raises:
         Exception: If any step fails
     """
     start_time = time.time()
     print(f"[Background] Starting {phase_name} for session: {session_id}")
+    start_phase(phase_name)
+    publish_session_event(session_id, 'phase_started', {'phase': phase_name})
 
     try:
-        # 1. Load data from DB
-        result = supabase.table('business_interview_sessions')\
-            .select(input_selector)\
-            .eq('id', session_id)\
-            .single()\
-            .execute()
-
-        if not result.data:
-            raise ValueError(f"Session not found: {session_id}")
-
-        # 1.5. Clear old error_message (if exists) before starting new phase
-        supabase.table('business_interview_sessions').update({
-            'error_message': None
-        }).eq('id', session_id).execute()
+        # 1. Load input + stored prompt in one projected select
+        if input_data is None or use_stored_prompt:
+            select_clause = build_projection(input_selector, prompt_column if use_stored_prompt else '')
+            session_data = await read_phase_input(supabase, session_id, phase_name, select_clause)
+        else:
+            session_data = input_data
 
         # 2. Build prompt (or use stored prompt)
         if use_stored_prompt:
             # Use the prompt already saved in DB (edited by user)
-            prompt_result = supabase.table('business_interview_sessions')\
-                .select(prompt_column)\
-                .eq('id', session_id)\
-                .single()\
-                .execute()
-            prompt = prompt_result.data.get(prompt_column) if prompt_result.data else None
+            prompt = session_data.get(prompt_column)
             if not prompt:
                 raise ValueError(f"No stored prompt found in {prompt_column}")
             print(f"[Background] Using stored prompt for {phase_name} (first 80 chars): {prompt[:80]}")
         else:
             if additional_data:
-                prompt = prompt_builder(result.data, **additional_data)
+                prompt = prompt_builder(session_data, **additional_data)
             else:
-                prompt = prompt_builder(result.data)
+                prompt = prompt_builder(session_data)
             print(f"[Background] Generated new prompt for {phase_name} (first 80 chars): {prompt[:80]}")
 
-            # 3. Save prompt to DB
-            supabase.table('business_interview_sessions').update({
-                prompt_column: prompt
-            }).eq('id', session_id).execute()
-
-        # 4. Call LLM
+        # 3. Call LLM (streamed; partial output flushed to the progress store)
         print(f"[Background] Calling LLM for {phase_name}...")
+        progress = PhaseProgress(supabase, session_id, phase_name, getattr(llm_service, 'model_name', None))
         try:
-            llm_output = llm_service.generate(prompt)
-            if not llm_output:
-                raise ValueError("LLM returned empty response")
+            result_data = None
+            if parallel_runner and not use_stored_prompt:
+                result_data = await parallel_runner(llm_service, session_data, progress)
+            if result_data is None:
+                llm_output = await astream_with_progress(llm_service, prompt, progress)
+                if not llm_output:
+                    raise ValueError("LLM returned empty response")
+                # 4. Parse JSON response (flexible handling)
+                result_data = parse_llm_output(llm_output)
         except Exception as e:
-            raise ValueError(format_llm_error_message(e))
-
-        # 5. Parse JSON response (flexible handling)
-        try:
-            if llm_output.strip().startswith('{'):
-                result_data = json.loads(llm_output)
-            else:
-                # If not JSON, wrap in summary structure
-                result_data = {'summary': llm_output}
-        except json.JSONDecodeError:
-            # Fallback: treat as plain text
-            result_data = {'summary': llm_output}
+            error_message = format_llm_error_message(e)
+            await progress.fail(error_message)
+            raise ValueError(error_message)
 
-        # 6. Save result to DB
+        # 5. Save prompt + result (+ model used, cleared error) in one write
         update_data = {
+            prompt_column: prompt,
             output_column: result_data,
-            'updated_at': datetime.now().isoformat()
         }
         # Record which model was used (if column specified)
         if model_used_column and hasattr(llm_service, 'model_name'):
             update_data[model_used_column] = llm_service.model_name
-        supabase.table('business_interview_sessions').update(update_data).eq('id', session_id).execute()
+        await write_phase_result(supabase, session_id, phase_name, update_data)
+        await progress.finish()
+        publish_session_event(session_id, 'phase_completed', {
+            'phase': phase_name,
+            'model_used': update_data.get(model_used_column) if model_used_column else None
+        })
 
         processing_time = time.time() - start_time
         print(f"[Background] {phase_name} completed in {processing_time:.2f}s for session: {session_id}")
+        return result_data
 
     except Exception as e:
         print(f"[Background] ERROR in {phase_name}: {str(e)}")
+        publish_session_event(session_id, 'phase_failed', {'phase': phase_name, 'error_message': f"{phase_name} failed: {str(e)}"})
         # Update DB with error
         if supabase:
-            supabase.table('business_interview_sessions').update({
-                'error_message': f"{phase_name} failed: {str(e)}",
-                'updated_at': datetime.now().isoformat()
-            }).eq('id', session_id).execute()
+            await write_phase_error(supabase, session_id, phase_name, f"{phase_name} failed: {str(e)}")
         raise
 
 
@@ -6,8 +6,10 @@ Provider selection via environment variables or API parameters
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import AsyncIterator, Optional
+import asyncio
 import os
+import weakref
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from services.llm_models import (
     DEFAULT_MODEL_BY_PROVIDER,
@@ -61,6 +63,36 @@ class LLMProvider(ABC):
         """
         pass
 
+    async def agenerate(self, prompt: str) -> str:
+        """
+        Generate LLM response from prompt without blocking the event loop
+
+        Providers with an async SDK client override this. The default
+        falls back to running generate() in a worker thread.
+
+        Args:
+            prompt: Input prompt
+
+        Returns:
+            LLM response text
+        """
+        return await asyncio.to_thread(self.generate, prompt)
+
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        """
+        Stream LLM response text chunks as they are generated
+
+        Providers with a streaming API override this. The default yields
+        the whole agenerate() response as a single chunk.
+
+        Args:
+            prompt: Input prompt
+
+        Yields:
+            Response text chunks (concatenated = full response)
+        """
+        yield await self.agenerate(prompt)
+
     @property
     @abstractmethod
     def model_name(self) -> str:
@@ -68,6 +100,26 @@ class LLMProvider(ABC):
         pass
 
 
+class _PerLoopClientCache:
+    """
+    Async SDK clients hold connection pools bound to the event loop they
+    were first used on. Keep one client per running loop so a provider can be
+    shared by the job queue loop and by scripts calling asyncio.run().
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._clients = weakref.WeakKeyDictionary()
+
+    def get(self):
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = self._factory()
+            self._clients[loop] = client
+        return client
+
+
 class OpenAIProvider(LLMProvider):
     """OpenAI API provider"""
 
@@ -83,8 +135,14 @@ class OpenAIProvider(LLMProvider):
             raise ValueError("OPENAI_API_KEY environment variable not set")
 
         self.client = OpenAI(api_key=api_key)
+        self._async_clients = _PerLoopClientCache(lambda: self._create_async_client(api_key))
         self._model = model
 
+    @staticmethod
+    def _create_async_client(api_key: str):
+        from openai import AsyncOpenAI
+        return AsyncOpenAI(api_key=api_key)
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=4, max=10),
@@ -104,6 +162,51 @@ class OpenAIProvider(LLMProvider):
             print(f"OpenAI API call error: {e}")
             raise
 
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type(Exception),
+        reraise=True
+    )
+    async def agenerate(self, prompt: str) -> str:
+        """Call OpenAI API with AsyncOpenAI and retry"""
+        try:
+            response = await self._async_clients.get().chat.completions.create(
+                model=self._model,
+                messages=[{"role": "user", "content": prompt}]
+            )
+            return response.choices[0].message.content
+
+        except Exception as e:
+            print(f"OpenAI API call error: {e}")
+            raise
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type(Exception),
+        reraise=True
+    )
+    async def _aopen_stream(self, prompt: str):
+        """Open a streaming completion (retried; chunks already received are never replayed)"""
+        try:
+            return await self._async_clients.get().chat.completions.create(
+                model=self._model,
+                messages=[{"role": "user", "content": prompt}],
+                stream=True
+            )
+
+        except Exception as e:
+            print(f"OpenAI API call error: {e}")
+            raise
+
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        """Stream OpenAI completion deltas"""
+        stream = await self._aopen_stream(prompt)
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
     @property
     def model_name(self) -> str:
         return f"openai/{self._model}"
@@ -130,6 +233,7 @@ class GeminiProvider(LLMProvider):
             raise ValueError("GEMINI_API_KEY environment variable not set")
 
         self.client = genai.Client(api_key=api_key)
+        self._async_clients = _PerLoopClientCache(lambda: genai.Client(api_key=api_key).aio)
         self._model = model
 
     @retry(
@@ -151,6 +255,50 @@ class GeminiProvider(LLMProvider):
             print(f"Gemini API call error: {e}")
             raise
 
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type(Exception),
+        reraise=True
+    )
+    async def agenerate(self, prompt: str) -> str:
+        """Call Gemini API with the async client (client.aio) and retry"""
+        try:
+            response = await self._async_clients.get().models.generate_content(
+                model=self._model,
+                contents=prompt
+            )
+            return response.text
+
+        except Exception as e:
+            print(f"Gemini API call error: {e}")
+            raise
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type(Exception),
+        reraise=True
+    )
+    async def _aopen_stream(self, prompt: str):
+        """Open a streaming generation (retried; chunks already received are never replayed)"""
+        try:
+            return await self._async_clients.get().models.generate_content_stream(
+                model=self._model,
+                contents=prompt
+            )
+
+        except Exception as e:
+            print(f"Gemini API call error: {e}")
+            raise
+
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        """Stream Gemini response chunks"""
+        stream = await self._aopen_stream(prompt)
+        async for chunk in stream:
+            if chunk.text:
+                yield chunk.text
+
     @property
     def model_name(self) -> str:
         return f"gemini/{self._model}"
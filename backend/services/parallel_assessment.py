@@ -0,0 +1,119 @@
+"""
+Parallel section generation for Phase 3 (assessment_v1)
+
+With PHASE3_PARALLEL_SECTIONS=true the assessment is generated as concurrent
+LLM calls, one per section group, all from the same annotated_facts_v1
+context. Each call uses the regular Phase 3 prompt plus a closing instruction
+restricting the output to its keys, so every call shares one long prompt
+prefix (provider-side prompt caching applies).
+
+Sections that must read as one story stay in the same group (intentions ->
+long-term goal -> short-term goals). The groups are merged back into the
+assessment_v1 schema consumed by sync_assessment_to_support_plan and
+build_display_rows. The critical path becomes the slowest group instead of
+the whole document.
+"""
+
+import asyncio
+import os
+from typing import Any, Dict, List, Optional
+
+from services.llm_pipeline import (
+    PhaseProgress,
+    agenerate_bounded,
+    extract_from_wrapped_result,
+    parse_llm_output,
+)
+from services.prompts import build_assessment_prompt
+
+
+PHASE3_PARALLEL_SECTIONS = os.getenv("PHASE3_PARALLEL_SECTIONS", "false").lower() == "true"
+
+# assessment_v1 keys in schema order
+ASSESSMENT_SECTIONS = [
+    'support_policy',
+    'family_child_intentions',
+    'long_term_goal',
+    'short_term_goals',
+    'support_items',
+    'family_support',
+    'transition_support',
+]
+
+SECTION_GROUPS: List[List[str]] = [
+    ['family_child_intentions', 'long_term_goal', 'short_term_goals'],
+    ['support_policy'],
+    ['support_items'],
+    ['family_support', 'transition_support'],
+]
+
+
+def build_section_prompt(base_prompt: str, sections: List[str]) -> str:
+    keys = ', '.join(f'`{section}`' for section in sections)
+    return base_prompt + f"""
+---
+
+# 今回の出力範囲
+
+この呼び出しでは、上記の出力形式のうち {keys} のみを含む `assessment_v1` を出力してください。
+他のセクションは別の担当が同じ入力データから並行して作成するため、出力しないでください。
+形式: {{"assessment_v1": {{ {keys} }}}}
+"""
+
+
+async def _generate_group(
+    llm_service,
+    base_prompt: str,
+    sections: List[str],
+    progress: PhaseProgress
+) -> Dict[str, Any]:
+    prompt = build_section_prompt(base_prompt, sections)
+    for attempt in range(2):
+        if attempt:
+            # Distinct prompt: a cached copy of the incomplete response must not come back
+            prompt += f"\n※ 前回の出力にはキーが不足していました。{', '.join(sections)} を必ず全て含めてください。\n"
+        output = await agenerate_bounded(llm_service, prompt)
+        progress.add(output or '')
+        assessment = extract_from_wrapped_result(parse_llm_output(output or ''), 'assessment_v1')
+        if isinstance(assessment, dict) and all(section in assessment for section in sections):
+            return {section: assessment[section] for section in sections}
+        print(f"[Background] Phase 3 sections {sections}: missing in LLM response (attempt {attempt + 1})")
+    raise ValueError(f"Phase 3 sections not generated: {', '.join(sections)}")
+
+
+async def arun_parallel_assessment(
+    llm_service,
+    session_data: Dict[str, Any],
+    progress: PhaseProgress
+) -> Optional[Dict[str, Any]]:
+    """
+    Generate section groups concurrently and assemble {"assessment_v1": ...}
+    (parallel_runner of aexecute_llm_phase)
+
+    Returns:
+        The assembled result, or None when parallel sections are disabled
+
+    Raises:
+        ValueError: If a section group is missing from its response twice
+    """
+    if not PHASE3_PARALLEL_SECTIONS:
+        return None
+
+    base_prompt = build_assessment_prompt(session_data)
+
+    await progress.start()
+    tasks = [
+        asyncio.ensure_future(_generate_group(llm_service, base_prompt, sections, progress))
+        for sections in SECTION_GROUPS
+    ]
+    try:
+        parts = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    generated: Dict[str, Any] = {}
+    for part in parts:
+        generated.update(part)
+    return {'assessment_v1': {section: generated[section] for section in ASSESSMENT_SECTIONS}}
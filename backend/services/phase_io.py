@@ -0,0 +1,190 @@
+"""
+Phase I/O - business_interview_sessions access for LLM phases
+
+Each phase touches the session row with at most:
+- 1 read:  input columns + stored prompt in one projected select
+           (skipped entirely when the previous phase hands over its result)
+- 1 write: prompt, result, model_used, cleared error_message and updated_at
+           in a single update
+
+Streaming progress (partial output, tokens so far, elapsed time) goes to the
+separate business_phase_progress table so the large session row is never
+rewritten mid-generation; the final result write stays a single update.
+
+Every result write also stores a short version token for that result
+("<content hash>:<write time ms>") so /api/sessions/{id}/status can tell
+clients which phases changed without shipping the results themselves.
+
+Per-phase counters prove the budget and are exposed via /api/metrics.
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict
+
+from supabase import Client
+
+
+SESSIONS_TABLE = 'business_interview_sessions'
+PROGRESS_TABLE = 'business_phase_progress'
+
+# Result column -> version column (see migrations/008_session_versions.sql)
+VERSION_COLUMNS = {
+    'transcription': 'transcription_version',
+    'fact_extraction_result_v1': 'fact_extraction_version',
+    'fact_structuring_result_v1': 'fact_structuring_version',
+    'assessment_result_v1': 'assessment_version',
+}
+
+_stats: Dict[str, Dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+def _count(phase_name: str, key: str) -> None:
+    with _stats_lock:
+        phase_stats = _stats.setdefault(
+            phase_name,
+            {'runs': 0, 'reads': 0, 'writes': 0, 'status_writes': 0, 'error_writes': 0, 'progress_writes': 0}
+        )
+        phase_stats[key] += 1
+
+
+def content_version(value: Any) -> str:
+    """
+    Version token of a result: "<sha256 prefix of canonical JSON>:<write time ms>"
+
+    The hash part changes only when the content changes; the whole token
+    changes on every write (a re-run with identical output is still visible).
+    """
+    canonical = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str)
+    digest = hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+    return f"{digest}:{int(time.time() * 1000)}"
+
+
+def with_content_versions(update_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Add the version column of every result column present in update_data"""
+    versioned = dict(update_data)
+    for column, version_column in VERSION_COLUMNS.items():
+        if column in update_data:
+            versioned[version_column] = content_version(update_data[column]) if update_data[column] is not None else None
+    return versioned
+
+
+def start_phase(phase_name: str) -> None:
+    """Count one execution of a phase"""
+    _count(phase_name, 'runs')
+
+
+def build_projection(*columns: str) -> str:
+    """Merge select clauses into one, dropping duplicates and blanks"""
+    projected = []
+    for clause in columns:
+        for part in (clause or '').split(','):
+            part = part.strip()
+            if part and part not in projected:
+                projected.append(part)
+    return ', '.join(projected)
+
+
+async def read_phase_input(
+    supabase: Client,
+    session_id: str,
+    phase_name: str,
+    select_clause: str
+) -> Dict[str, Any]:
+    """
+    Load the columns a phase needs in one projected select
+
+    Raises:
+        ValueError: If the session does not exist
+    """
+    _count(phase_name, 'reads')
+    result = await asyncio.to_thread(
+        supabase.table(SESSIONS_TABLE)
+        .select(select_clause)
+        .eq('id', session_id)
+        .single()
+        .execute
+    )
+    if not result.data:
+        raise ValueError(f"Session not found: {session_id}")
+    return result.data
+
+
+async def write_phase_result(
+    supabase: Client,
+    session_id: str,
+    phase_name: str,
+    data: Dict[str, Any]
+) -> None:
+    """Persist prompt, result (+ its version), model and cleared error_message in one update"""
+    _count(phase_name, 'writes')
+    update_data = with_content_versions(data)
+    update_data.setdefault('error_message', None)
+    update_data['updated_at'] = datetime.now().isoformat()
+    await asyncio.to_thread(
+        supabase.table(SESSIONS_TABLE).update(update_data).eq('id', session_id).execute
+    )
+
+
+async def write_session_status(
+    supabase: Client,
+    session_id: str,
+    phase_name: str,
+    data: Dict[str, Any]
+) -> None:
+    """Status transition written before a phase starts (visible progress)"""
+    _count(phase_name, 'status_writes')
+    update_data = dict(data)
+    update_data['updated_at'] = datetime.now().isoformat()
+    await asyncio.to_thread(
+        supabase.table(SESSIONS_TABLE).update(update_data).eq('id', session_id).execute
+    )
+
+
+async def write_phase_error(
+    supabase: Client,
+    session_id: str,
+    phase_name: str,
+    error_message: str
+) -> None:
+    _count(phase_name, 'error_writes')
+    await asyncio.to_thread(
+        supabase.table(SESSIONS_TABLE).update({
+            'error_message': error_message,
+            'updated_at': datetime.now().isoformat()
+        }).eq('id', session_id).execute
+    )
+
+
+async def write_phase_progress(
+    supabase: Client,
+    session_id: str,
+    phase_name: str,
+    data: Dict[str, Any]
+) -> None:
+    """Upsert the progress row of (session, phase) - never touches the session row"""
+    _count(phase_name, 'progress_writes')
+    progress_data = dict(data)
+    progress_data['session_id'] = session_id
+    progress_data['phase'] = phase_name
+    progress_data['updated_at'] = datetime.now().isoformat()
+    await asyncio.to_thread(
+        supabase.table(PROGRESS_TABLE).upsert(progress_data, on_conflict='session_id,phase').execute
+    )
+
+
+def get_phase_io_stats() -> Dict[str, Dict[str, Any]]:
+    """Return per-phase counters with per-run averages"""
+    with _stats_lock:
+        snapshot = {phase: dict(counts) for phase, counts in _stats.items()}
+
+    for counts in snapshot.values():
+        runs = counts['runs'] or 1
+        counts['reads_per_run'] = round(counts['reads'] / runs, 2)
+        counts['writes_per_run'] = round(counts['writes'] / runs, 2)
+    return snapshot
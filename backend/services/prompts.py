@@ -19,7 +19,9 @@ def build_fact_extraction_prompt(
     age_text: str = "不明",
     attendees: dict = None,
     staff_name: str = "不明",
-    recorded_at: str = "不明"
+    recorded_at: str = "不明",
+    part_index: int = None,
+    part_count: int = None
 ) -> str:
     """
     Build prompt for Phase 1: Fact Extraction
@@ -34,6 +36,8 @@ def build_fact_extraction_prompt(
         attendees: Attendees dict (father, mother flags)
         staff_name: Interviewer name
         recorded_at: Interview date/time
+        part_index: 1-based part number when transcription is one chunk of a long interview
+        part_count: Total number of parts (chunked extraction)
 
     Returns:
         Prompt string for LLM
@@ -53,6 +57,13 @@ def build_fact_extraction_prompt(
 
     diagnosis_str = ', '.join(subject.get('diagnosis', [])) if subject.get('diagnosis') else '不明'
 
+    part_note = ""
+    if part_index and part_count:
+        part_note = (
+            f"\n※ 長いヒアリングを分割した {part_index}/{part_count} パート目です。"
+            "このパートに含まれる内容のみを抽出してください（他パートの内容は推測しないこと）。\n"
+        )
+
     prompt = f"""あなたは児童発達支援の専門アセスメント担当者です。
 
 # あなたの役割（Phase 1: Fact Extraction）
@@ -220,7 +231,7 @@ def build_fact_extraction_prompt(
 - 必ず上記のJSON形式**のみ**を出力してください
 - 説明・前置き・後書きは不要です
 
-【ヒアリングのトランスクリプション】
+【ヒアリングのトランスクリプション】{part_note}
 {transcription}
 """
 
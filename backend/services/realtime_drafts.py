@@ -0,0 +1,191 @@
+"""
+Realtime transcript drafts (Phase 1 right after the recording ends)
+
+A recording used to wait for upload -> S3 event Lambda -> batch ASR -> SQS
+-> Lambda -> /api/analyze before Phase 1 started, although the recording
+screen had already transcribed every chunk over /ws/transcribe/realtime.
+
+- The recording screen opens the WebSocket with ?draft_id=<uuid>. When the
+  client ends the stream, the channel stores the deduped transcript in
+  business_realtime_drafts (only a complete stream is stored; a stream that
+  fell back to HTTP leaves no draft).
+- /api/upload with draft_id creates the session as 'transcribed' with the
+  draft and queues the analyze job at once.
+- The batch ASR that follows (S3 event Lambda -> /api/transcribe) refines the
+  draft: the transcription is replaced without touching the status or
+  sending SQS (REALTIME_DRAFT_REFINE=false skips batch ASR for such sessions).
+  A transcription edited in the meantime is kept (compare-and-set on
+  transcription_version).
+
+The same draft row carries the recording itself when it was streamed to S3
+during the recording (recording_upload: multipart upload state, see
+services/recording_stream.py); /api/recordings/finalize then completes it
+instead of a second upload of the whole file.
+"""
+
+import os
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from supabase import Client
+
+from services.phase_io import with_content_versions
+
+
+REALTIME_DRAFTS_ENABLED = os.getenv("REALTIME_DRAFTS_ENABLED", "true").lower() == "true"
+REALTIME_DRAFT_REFINE = os.getenv("REALTIME_DRAFT_REFINE", "true").lower() == "true"
+# Shorter drafts go through batch ASR as before (nothing useful to analyze yet)
+REALTIME_DRAFT_MIN_CHARS = int(os.getenv("REALTIME_DRAFT_MIN_CHARS", "100"))
+
+REALTIME_DRAFT_TABLE = 'business_realtime_drafts'
+# transcription_metadata.source of a session transcribed from a draft
+DRAFT_SOURCE = 'realtime_draft'
+
+_stats_lock = threading.Lock()
+_stats = {
+    'saved': 0,
+    'used': 0,
+    'too_short': 0,
+    'missing': 0,
+    'refined': 0,
+    'refine_skipped': 0,
+    'errors': 0,
+}
+
+
+def count_draft(key: str) -> None:
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def get_realtime_draft_stats() -> Dict[str, Any]:
+    with _stats_lock:
+        stats = dict(_stats)
+    stats['enabled'] = REALTIME_DRAFTS_ENABLED
+    stats['refine'] = REALTIME_DRAFT_REFINE
+    return stats
+
+
+def parse_draft_id(value: Optional[str]) -> Optional[str]:
+    """Canonical draft id, or None when drafts are disabled or the value is not a UUID"""
+    if not REALTIME_DRAFTS_ENABLED or not value:
+        return None
+    try:
+        return str(uuid.UUID(value))
+    except ValueError:
+        return None
+
+
+def save_realtime_draft(
+    supabase: Optional[Client],
+    draft_id: Optional[str],
+    transcript: str,
+    chunks: int,
+    model: Optional[str]
+) -> bool:
+    """Store the transcript of a finished realtime stream (blocking)"""
+    if not supabase or not draft_id:
+        return False
+    try:
+        supabase.table(REALTIME_DRAFT_TABLE).upsert({
+            'id': draft_id,
+            'transcript': transcript,
+            'transcript_chunks': chunks,
+            'model': model,
+            'updated_at': datetime.now(timezone.utc).isoformat()
+        }, on_conflict='id').execute()
+    except Exception as e:
+        print(f"[RealtimeDraft] Could not save draft {draft_id}: {e}")
+        count_draft('errors')
+        return False
+    count_draft('saved')
+    print(f"[RealtimeDraft] Saved draft {draft_id} ({chunks} chunks, {len(transcript)} chars)")
+    return True
+
+
+def save_recording_upload(supabase: Optional[Client], draft_id: Optional[str], state: Optional[Dict[str, Any]]) -> bool:
+    """Store (None: clear) the multipart upload state of a streamed recording (blocking)"""
+    if not supabase or not draft_id:
+        return False
+    try:
+        supabase.table(REALTIME_DRAFT_TABLE).upsert({
+            'id': draft_id,
+            'recording_upload': state,
+            'updated_at': datetime.now(timezone.utc).isoformat()
+        }, on_conflict='id').execute()
+    except Exception as e:
+        print(f"[RealtimeDraft] Could not save recording upload of draft {draft_id}: {e}")
+        count_draft('errors')
+        return False
+    return True
+
+
+def fetch_realtime_draft(supabase: Optional[Client], draft_id: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Draft row (transcript and recording upload), or None (blocking)"""
+    if not supabase or not draft_id:
+        return None
+    try:
+        result = supabase.table(REALTIME_DRAFT_TABLE)\
+            .select('id, transcript, transcript_chunks, model, recording_upload')\
+            .eq('id', draft_id)\
+            .limit(1)\
+            .execute()
+    except Exception as e:
+        print(f"[RealtimeDraft] Could not load draft {draft_id}: {e}")
+        count_draft('errors')
+        return None
+    return result.data[0] if result.data else None
+
+
+def transcript_draft(draft: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """The draft if its transcript can stand in for batch ASR, else None"""
+    if not draft or not draft.get('transcript_chunks'):
+        count_draft('missing')
+        return None
+    if len((draft.get('transcript') or '').strip()) < REALTIME_DRAFT_MIN_CHARS:
+        count_draft('too_short')
+        return None
+    return draft
+
+
+def load_realtime_draft(supabase: Optional[Client], draft_id: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Draft row usable for a session, or None (missing, too short, lookup failed; blocking)"""
+    return transcript_draft(fetch_realtime_draft(supabase, draft_id))
+
+
+def delete_realtime_draft(supabase: Optional[Client], draft_id: Optional[str]) -> None:
+    """Drop a draft once a session was created from it (blocking)"""
+    if not supabase or not draft_id:
+        return
+    try:
+        supabase.table(REALTIME_DRAFT_TABLE).delete().eq('id', draft_id).execute()
+    except Exception as e:
+        print(f"[RealtimeDraft] Could not delete draft {draft_id}: {e}")
+        count_draft('errors')
+
+
+def draft_session_columns(draft: Dict[str, Any]) -> Dict[str, Any]:
+    """Session columns of a session transcribed from a draft (status: transcribed)"""
+    columns = with_content_versions({
+        'transcription': draft['transcript'].strip(),
+        'transcription_metadata': {
+            'source': DRAFT_SOURCE,
+            'provider': 'openai',
+            'model': draft.get('model') or 'unknown',
+            'chunks': draft.get('transcript_chunks', 0),
+        },
+        'status': 'transcribed',
+    })
+    # Batch ASR replaces the transcription only while it still has this version
+    columns['transcription_metadata']['draft_version'] = columns['transcription_version']
+    return columns
+
+
+def draft_version(session: Dict[str, Any]) -> Optional[str]:
+    """transcription_version a refinement may replace, or None if the session is not on a draft"""
+    metadata = session.get('transcription_metadata')
+    if not isinstance(metadata, dict) or metadata.get('source') != DRAFT_SOURCE:
+        return None
+    return metadata.get('draft_version')
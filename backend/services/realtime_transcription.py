@@ -0,0 +1,461 @@
+"""
+Near-realtime transcription of recording chunks (RecordingSession.tsx)
+
+The recording screen cuts the microphone stream into chunks of a few seconds.
+Every chunk used to be a separate multipart POST that built a new OpenAI
+client (TLS handshake, thread) per request, and the browser reordered the
+results itself. Chunks now stream over one WebSocket per recording
+(/ws/transcribe/realtime):
+
+- RealtimeTranscriber: one AsyncOpenAI client per process (connection pool
+  reused by every chunk and connection; LoopClientPool), at most
+  REALTIME_MAX_IN_FLIGHT requests across all connections
+- RealtimeChannel: one connection; up to REALTIME_CHUNKS_IN_FLIGHT chunks
+  are transcribed concurrently and results are pushed in chunk order
+
+Chunks are independent files, so words cut at a boundary used to come back
+garbled or twice. The channel keeps per-recording state:
+
+- rolling context: the last REALTIME_CONTEXT_CHARS characters of the
+  transcript delivered so far are appended to the prompt of the next chunk
+  (with chunks in flight the context lags by at most that many chunks)
+- audio overlap: each chunk is decoded (ffmpeg, 16 kHz mono) and sent as WAV
+  with the last REALTIME_OVERLAP_MS of the previous chunk in front, so a
+  boundary word is heard whole at least once
+- boundary dedupe: text repeated from the end of the transcript (the
+  overlap, or a context echo) is cut from the start of the next chunk with a
+  suffix/prefix match on normalized text
+
+Protocol (JSON text frames unless noted):
+
+    client -> server
+      <binary>                        one self-contained audio chunk (webm/ogg)
+      {"type": "config", "language": "ja", "prompt": "..."}
+      {"type": "end"}                 flush remaining chunks, then close
+    server -> client
+      {"type": "ready", "max_in_flight": 3, "model": "..."}
+      {"type": "transcript", "chunk_index": 0, "text": "...", "raw_text": "...", "skipped": false, "error": null}
+      {"type": "backpressure", "paused": true, "in_flight": 3}
+      {"type": "backpressure", "paused": false, "in_flight": 2}
+      {"type": "done", "chunks": 42, "draft_saved": true}
+
+chunk_index counts binary frames from 0; text is the chunk's new text
+after dedupe (raw_text as transcribed). While REALTIME_CHUNKS_IN_FLIGHT
+chunks are pending the server stops reading (TCP backpressure) and sends
+paused: true; the client should hold or lengthen chunks until paused: false.
+With ?draft_id= the transcript is stored as a session draft on "end"
+(services/realtime_drafts.py); draft_saved tells whether /api/upload can use it.
+"""
+
+import asyncio
+import io
+import json
+import os
+import re
+import tempfile
+import threading
+import unicodedata
+import wave
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.asr_providers.pool import LoopClientPool
+from services.audio_preprocess import SAMPLE_BYTES, decode_to_pcm
+from services.audio_source import AUDIO_SPOOL_DIR
+from services.realtime_drafts import save_realtime_draft
+
+
+REALTIME_TRANSCRIBE_MODEL = os.getenv("REALTIME_TRANSCRIBE_MODEL", "gpt-4o-mini-transcribe")
+REALTIME_CHUNKS_IN_FLIGHT = int(os.getenv("REALTIME_CHUNKS_IN_FLIGHT", "3"))
+REALTIME_MAX_IN_FLIGHT = int(os.getenv("REALTIME_MAX_IN_FLIGHT", "32"))
+REALTIME_MAX_CHUNK_BYTES = int(os.getenv("REALTIME_MAX_CHUNK_BYTES", str(5 * 1024 * 1024)))
+REALTIME_TIMEOUT_SECONDS = float(os.getenv("REALTIME_TIMEOUT_SECONDS", "30"))
+REALTIME_CONTEXT_CHARS = int(os.getenv("REALTIME_CONTEXT_CHARS", "200"))
+REALTIME_OVERLAP_MS = int(os.getenv("REALTIME_OVERLAP_MS", "600"))
+REALTIME_DEDUPE_MAX_CHARS = int(os.getenv("REALTIME_DEDUPE_MAX_CHARS", "40"))
+
+REALTIME_SAMPLE_RATE = 16000
+# Shortest repeat that is cut: shorter with audio overlap (a repeat is expected there)
+DEDUPE_MIN_CHARS_OVERLAP = 3
+DEDUPE_MIN_CHARS = 6
+# Garbled leading characters (half a word) skipped before the repeat
+DEDUPE_MAX_SKIP = 2
+
+_ALNUM_END = re.compile(r'[A-Za-z0-9]$')
+_ALNUM_START = re.compile(r'^[A-Za-z0-9]')
+
+
+def is_invalid_chunk_error(error: Exception) -> bool:
+    """Chunks the API cannot decode (cut mid-frame, silence-only) are skipped, not failed"""
+    lowered = str(error).lower()
+    return "corrupted or unsupported" in lowered or "invalid_value" in lowered
+
+
+# ------------------------------------------------------------------
+# Text
+# ------------------------------------------------------------------
+
+def _normalized(text: str) -> Tuple[str, List[int]]:
+    """Comparison form (NFKC, lower case, no whitespace / punctuation / symbols) and original index per char"""
+    chars: List[str] = []
+    positions: List[int] = []
+    for index, char in enumerate(text):
+        for normalized in unicodedata.normalize('NFKC', char):
+            if normalized.isspace() or unicodedata.category(normalized)[0] in 'PZS':
+                continue
+            chars.append(normalized.lower())
+            positions.append(index)
+    return ''.join(chars), positions
+
+
+def trim_repeated_prefix(
+    previous: str,
+    text: str,
+    min_chars: int = DEDUPE_MIN_CHARS,
+    max_chars: int = REALTIME_DEDUPE_MAX_CHARS
+) -> Tuple[str, int]:
+    """
+    Cut the start of `text` that repeats the end of `previous`
+
+    Longest suffix/prefix match of the normalized texts (at least min_chars,
+    at most max_chars), allowing up to DEDUPE_MAX_SKIP garbled characters
+    before it. Returns (remaining text, number of original characters cut).
+    """
+    previous_norm, _ = _normalized(previous[-max_chars * 3:])
+    text_norm, positions = _normalized(text)
+    for skip in range(DEDUPE_MAX_SKIP + 1):
+        longest = min(len(previous_norm), len(text_norm) - skip, max_chars)
+        for length in range(longest, min_chars - 1, -1):
+            if previous_norm.endswith(text_norm[skip:skip + length]):
+                cut = positions[skip + length - 1] + 1
+                # Punctuation right after the repeat belonged to it
+                while cut < len(text) and not _normalized(text[cut])[0]:
+                    cut += 1
+                return text[cut:], cut
+    return text, 0
+
+
+def join_transcript(current: str, text: str) -> str:
+    """Append chunk text (a space only between two alphanumeric ends)"""
+    if not current:
+        return text
+    if not text:
+        return current
+    if _ALNUM_END.search(current) and _ALNUM_START.search(text):
+        return f"{current} {text}"
+    return f"{current}{text}"
+
+
+def rolling_prompt(base_prompt: Optional[str], transcript: str, context_chars: int = REALTIME_CONTEXT_CHARS) -> Optional[str]:
+    """Client prompt (vocabulary, names) followed by the end of the transcript so far"""
+    context = transcript[-context_chars:].strip() if context_chars > 0 else ''
+    parts = [part for part in ((base_prompt or '').strip(), context) if part]
+    return '\n'.join(parts) or None
+
+
+# ------------------------------------------------------------------
+# Audio
+# ------------------------------------------------------------------
+
+def decode_chunk(audio: bytes, sample_rate: int = REALTIME_SAMPLE_RATE) -> bytes:
+    """Chunk (webm / ogg / mp4) -> mono s16le PCM (blocking)"""
+    with tempfile.TemporaryFile(prefix='rt-pcm-', dir=AUDIO_SPOOL_DIR) as pcm_file:
+        decode_to_pcm(io.BytesIO(audio), pcm_file, sample_rate)
+        pcm_file.seek(0)
+        return pcm_file.read()
+
+
+def pcm_to_wav(pcm: bytes, sample_rate: int = REALTIME_SAMPLE_RATE) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(SAMPLE_BYTES)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+
+# ------------------------------------------------------------------
+# Client / connection
+# ------------------------------------------------------------------
+
+class RealtimeTranscriber:
+    """Shared transcription client for realtime chunks"""
+
+    def __init__(self, model: str = REALTIME_TRANSCRIBE_MODEL, max_in_flight: int = REALTIME_MAX_IN_FLIGHT):
+        self.model = model
+        self.max_in_flight = max_in_flight
+        self._clients = LoopClientPool(self._create_client, lambda client: client.close())
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._counters = {
+            'chunks': 0,
+            'skipped': 0,
+            'errors': 0,
+            'bytes': 0,
+            'connections': 0,
+            'backpressure': 0,
+            'deduped_chars': 0,
+            'overlap_fallbacks': 0,
+        }
+
+    @staticmethod
+    def _create_client():
+        from openai import AsyncOpenAI
+
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY environment variable not set")
+        # One quick retry: a late chunk is worth less than the next one
+        return AsyncOpenAI(api_key=api_key, max_retries=1, timeout=REALTIME_TIMEOUT_SECONDS)
+
+    @property
+    def configured(self) -> bool:
+        return bool(os.getenv("OPENAI_API_KEY"))
+
+    def count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[key] += amount
+
+    async def transcribe(
+        self,
+        audio: bytes,
+        filename: str = "chunk.webm",
+        language: Optional[str] = "ja",
+        prompt: Optional[str] = None
+    ) -> str:
+        """Transcribe one chunk (waits for a process-wide slot)"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+
+        request_data: Dict[str, Any] = {
+            "model": self.model,
+            "file": (filename, audio),
+        }
+        if language:
+            request_data["language"] = language
+        if prompt and prompt.strip():
+            request_data["prompt"] = prompt.strip()
+
+        async with self._slots:
+            with self._lock:
+                self._in_flight += 1
+            try:
+                response = await self._clients.get().audio.transcriptions.create(**request_data)
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+        self.count('chunks')
+        self.count('bytes', len(audio))
+        return (response.text or "").strip()
+
+    async def aclose(self) -> None:
+        await self._clients.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats['in_flight'] = self._in_flight
+        stats['max_in_flight'] = self.max_in_flight
+        stats['model'] = self.model
+        stats['pool'] = self._clients.stats()
+        return stats
+
+
+realtime_transcriber = RealtimeTranscriber()
+
+
+class RealtimeChannel:
+    """One /ws/transcribe/realtime connection (one recording)"""
+
+    def __init__(
+        self,
+        websocket,
+        transcriber: RealtimeTranscriber = realtime_transcriber,
+        language: Optional[str] = "ja",
+        prompt: Optional[str] = None,
+        max_in_flight: int = REALTIME_CHUNKS_IN_FLIGHT,
+        overlap_ms: int = REALTIME_OVERLAP_MS,
+        draft_id: Optional[str] = None,
+        supabase=None
+    ):
+        self.websocket = websocket
+        self.transcriber = transcriber
+        self.language = language
+        self.prompt = prompt
+        self.max_in_flight = max_in_flight
+        self.overlap_ms = overlap_ms
+        # Deduped transcript delivered so far (rolling context, dedupe reference)
+        self.transcript = ''
+        # Stored as a session draft when the client ends the stream (services/realtime_drafts.py)
+        self.draft_id = draft_id
+        self.supabase = supabase
+
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._send_lock = asyncio.Lock()
+        self._tasks: set = set()
+        self._results: Dict[int, Dict[str, Any]] = {}
+        self._next_index = 0
+        self._next_to_send = 0
+        self._tail_pcm = b''
+        self._client_gone = False
+        self._failed_chunks = 0
+
+    async def _send(self, message: Dict[str, Any]) -> None:
+        async with self._send_lock:
+            await self._send_unlocked(message)
+
+    async def _send_unlocked(self, message: Dict[str, Any]) -> None:
+        if self._client_gone:
+            return
+        try:
+            await self.websocket.send_text(json.dumps(message, ensure_ascii=False))
+        except Exception:
+            # Client closed after "end": keep reading and committing, the draft needs every chunk
+            self._client_gone = True
+
+    async def run(self) -> None:
+        """Serve the connection until the client ends or disconnects"""
+        from starlette.websockets import WebSocketDisconnect
+
+        self.transcriber.count('connections')
+        await self._send({"type": "ready", "max_in_flight": self.max_in_flight, "model": self.transcriber.model})
+        try:
+            while True:
+                message = await self.websocket.receive()
+                if message.get('type') == 'websocket.disconnect':
+                    return
+                if message.get('bytes') is not None:
+                    await self._submit(message['bytes'])
+                elif message.get('text'):
+                    if not self._handle_control(message['text']):
+                        break
+
+            # "end": deliver what is still in flight, then close
+            if self._tasks:
+                await asyncio.gather(*list(self._tasks), return_exceptions=True)
+            draft_saved = False
+            # A chunk that failed leaves a gap: batch ASR has to do the whole recording then
+            if self.draft_id and not self._failed_chunks:
+                draft_saved = await asyncio.to_thread(
+                    save_realtime_draft,
+                    self.supabase,
+                    self.draft_id,
+                    self.transcript,
+                    self._next_to_send,
+                    self.transcriber.model
+                )
+            await self._send({"type": "done", "chunks": self._next_index, "draft_saved": draft_saved})
+            if not self._client_gone:
+                await self.websocket.close()
+        except WebSocketDisconnect:
+            pass
+        finally:
+            for task in list(self._tasks):
+                task.cancel()
+
+    def _handle_control(self, text: str) -> bool:
+        """Apply a JSON control message; False on "end" """
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return True
+        if not isinstance(data, dict):
+            return True
+        if data.get('type') == 'end':
+            return False
+        if data.get('type') == 'config':
+            if 'language' in data:
+                self.language = data['language'] or None
+            if 'prompt' in data:
+                self.prompt = data['prompt'] or None
+        return True
+
+    def _with_overlap(self, audio: bytes) -> Tuple[bytes, str, bool]:
+        """
+        (payload, extension, overlapped): the chunk as WAV behind the previous
+        chunk's tail; the original chunk if it cannot be decoded (blocking)
+        """
+        try:
+            pcm = decode_chunk(audio)
+        except Exception as e:
+            self.transcriber.count('overlap_fallbacks')
+            print(f"[Realtime] Could not decode chunk for overlap, sending as is: {e}")
+            self._tail_pcm = b''
+            return audio, "webm", False
+
+        tail, overlapped = self._tail_pcm, bool(self._tail_pcm)
+        tail_bytes = REALTIME_SAMPLE_RATE * self.overlap_ms // 1000 * SAMPLE_BYTES
+        self._tail_pcm = pcm[-tail_bytes:] if tail_bytes else b''
+        return pcm_to_wav(tail + pcm), "wav", overlapped
+
+    async def _submit(self, audio: bytes) -> None:
+        if self._slots.locked():
+            # Stop reading until a chunk finishes; tell the client to slow down meanwhile
+            self.transcriber.count('backpressure')
+            await self._send({"type": "backpressure", "paused": True, "in_flight": self.max_in_flight})
+            await self._slots.acquire()
+            await self._send({"type": "backpressure", "paused": False, "in_flight": len(self._tasks)})
+        else:
+            await self._slots.acquire()
+
+        index = self._next_index
+        self._next_index += 1
+        extension, overlapped = "webm", False
+        if audio and self.overlap_ms > 0 and len(audio) <= REALTIME_MAX_CHUNK_BYTES:
+            # Sequential (the reader): each chunk needs the previous chunk's tail
+            audio, extension, overlapped = await asyncio.to_thread(self._with_overlap, audio)
+        filename = f"chunk-{index}.{extension}"
+
+        # Context = transcript delivered so far (chunks still in flight are not in it yet)
+        prompt = rolling_prompt(self.prompt, self.transcript)
+        task = asyncio.create_task(self._transcribe(index, audio, filename, prompt, overlapped))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _transcribe(self, index: int, audio: bytes, filename: str, prompt: Optional[str], overlapped: bool) -> None:
+        result: Dict[str, Any] = {"raw_text": "", "skipped": False, "error": None, "overlapped": overlapped}
+        try:
+            if not audio:
+                result['skipped'] = True
+            elif len(audio) > REALTIME_MAX_CHUNK_BYTES:
+                result['error'] = f"Chunk exceeds {REALTIME_MAX_CHUNK_BYTES} bytes"
+            else:
+                result['raw_text'] = await self.transcriber.transcribe(audio, filename, self.language, prompt)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if is_invalid_chunk_error(e):
+                self.transcriber.count('skipped')
+                result['skipped'] = True
+            else:
+                self.transcriber.count('errors')
+                print(f"[Realtime] Chunk {index} failed: {e}")
+                result['error'] = str(e)
+        finally:
+            self._slots.release()
+
+        self._results[index] = result
+        await self._flush()
+
+    def _commit(self, result: Dict[str, Any]) -> str:
+        """Dedupe a chunk against the transcript so far and append it (chunk order)"""
+        if result['error']:
+            self._failed_chunks += 1
+        min_chars = DEDUPE_MIN_CHARS_OVERLAP if result.pop('overlapped') else DEDUPE_MIN_CHARS
+        text, cut = trim_repeated_prefix(self.transcript, result['raw_text'], min_chars)
+        if cut:
+            self.transcriber.count('deduped_chars', cut)
+        text = text.strip()
+        self.transcript = join_transcript(self.transcript, text)
+        return text
+
+    async def _flush(self) -> None:
+        """Push finished chunks in order (a slow chunk holds back the ones after it)"""
+        async with self._send_lock:
+            while self._next_to_send in self._results:
+                index = self._next_to_send
+                result = self._results.pop(index)
+                self._next_to_send += 1
+                text = self._commit(result)
+                await self._send_unlocked({"type": "transcript", "chunk_index": index, "text": text, **result})
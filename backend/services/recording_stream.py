@@ -0,0 +1,187 @@
+"""
+Recording streamed to S3 while it is recorded (/ws/recordings/stream)
+
+The browser used to send every chunk for realtime transcription during the
+recording and then upload the whole recording again through /api/upload
+(twice the bytes over facility Wi-Fi, and the session only started after the
+second upload). Now the continuous recorder's slices (MediaRecorder
+timeslice; concatenated they are the recording file) stream over a WebSocket
+straight into an S3 multipart upload at the final key
+recordings/{facility}/{subject}/{date}/{draft_id}.webm:
+
+- slices are buffered into parts of S3_PART_SIZE and uploaded as they fill
+  (memory: about one part per recording; reading pauses during a part upload)
+- on "end" the last part is uploaded and the upload state is stored on the
+  draft (business_realtime_drafts.recording_upload), then "stored" is sent
+- /api/recordings/finalize completes the upload and creates the session
+  (session id = draft id), so no second upload is needed
+- a stream that breaks off is aborted; the client uploads the recording it
+  kept locally with /api/upload as before
+
+Protocol (JSON text frames unless noted):
+
+    client -> server
+      <binary>                        next slice of the recording
+      {"type": "end"}                 recording finished
+    server -> client
+      {"type": "ready", "s3_path": "recordings/..."}
+      {"type": "part", "part_number": 1, "bytes": 8388608}
+      {"type": "stored", "bytes": 12345678, "parts": 2}
+      {"type": "error", "message": "..."}
+"""
+
+import asyncio
+import json
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from services.realtime_drafts import save_recording_upload
+from services.s3_multipart import S3_PART_SIZE, MultipartUpload
+
+
+_stats_lock = threading.Lock()
+_stats = {
+    'streams': 0,
+    'stored': 0,
+    'aborted': 0,
+    'bytes': 0,
+    'errors': 0,
+}
+
+
+def _count(key: str, amount: int = 1) -> None:
+    with _stats_lock:
+        _stats[key] += amount
+
+
+def get_recording_stream_stats() -> Dict[str, Any]:
+    with _stats_lock:
+        return dict(_stats)
+
+
+def recording_s3_key(facility_id: str, subject_id: str, session_id: str, recorded_on: Optional[datetime] = None) -> str:
+    """S3 key of a session's recording"""
+    date = (recorded_on or datetime.now()).strftime('%Y-%m-%d')
+    return f"recordings/{facility_id}/{subject_id}/{date}/{session_id}.webm"
+
+
+def is_uuid(value: Optional[str]) -> bool:
+    try:
+        uuid.UUID(value or '')
+    except ValueError:
+        return False
+    return True
+
+
+class RecordingUploadChannel:
+    """One /ws/recordings/stream connection (one recording)"""
+
+    def __init__(
+        self,
+        websocket,
+        s3_client,
+        s3_bucket: str,
+        supabase,
+        draft_id: str,
+        s3_key: str,
+        content_type: str = 'audio/webm',
+        part_size: int = S3_PART_SIZE
+    ):
+        self.websocket = websocket
+        self.s3_client = s3_client
+        self.s3_bucket = s3_bucket
+        self.supabase = supabase
+        self.draft_id = draft_id
+        self.s3_key = s3_key
+        self.content_type = content_type
+        self.part_size = part_size
+
+        self.upload: Optional[MultipartUpload] = None
+        self._buffer = bytearray()
+        self._part_number = 0
+
+    async def _send(self, message: Dict[str, Any]) -> None:
+        await self.websocket.send_text(json.dumps(message, ensure_ascii=False))
+
+    def _state(self, complete: bool) -> Dict[str, Any]:
+        return {**self.upload.to_state(), 'content_type': self.content_type, 'complete': complete}
+
+    async def run(self) -> None:
+        """Serve the connection; the upload is aborted unless it was stored"""
+        from starlette.websockets import WebSocketDisconnect
+
+        _count('streams')
+        try:
+            self.upload = await asyncio.to_thread(
+                MultipartUpload.create, self.s3_client, self.s3_bucket, self.s3_key, self.content_type
+            )
+        except Exception as e:
+            print(f"[RecordingStream] Could not start upload of {self.s3_key}: {e}")
+            _count('errors')
+            await self.websocket.close(code=1011, reason="Could not start the upload")
+            return
+
+        stored = False
+        try:
+            # Upload id on the draft first: finalize (any process) and cleanup can find it
+            if not await asyncio.to_thread(save_recording_upload, self.supabase, self.draft_id, self._state(False)):
+                raise RuntimeError("Could not save the upload state")
+            await self._send({"type": "ready", "s3_path": self.s3_key})
+
+            while True:
+                message = await self.websocket.receive()
+                if message.get('type') == 'websocket.disconnect':
+                    return
+                if message.get('bytes') is not None:
+                    self._buffer.extend(message['bytes'])
+                    while len(self._buffer) >= self.part_size:
+                        await self._upload_part(self.part_size)
+                elif message.get('text') and self._is_end(message['text']):
+                    break
+
+            # Last part may be smaller than the minimum part size
+            if self._buffer:
+                await self._upload_part(len(self._buffer))
+            if not self.upload.size:
+                raise ValueError("Empty recording")
+            if not await asyncio.to_thread(save_recording_upload, self.supabase, self.draft_id, self._state(True)):
+                raise RuntimeError("Could not save the upload state")
+            stored = True
+            _count('stored')
+            print(f"[RecordingStream] Stored {self.upload.size} bytes in {self._part_number} parts: {self.s3_key}")
+            await self._send({"type": "stored", "bytes": self.upload.size, "parts": self._part_number})
+            await self.websocket.close()
+        except WebSocketDisconnect:
+            pass
+        except Exception as e:
+            print(f"[RecordingStream] Upload of {self.s3_key} failed: {e}")
+            _count('errors')
+            try:
+                await self._send({"type": "error", "message": str(e)})
+                await self.websocket.close(code=1011)
+            except Exception:
+                pass
+        finally:
+            if not stored:
+                # The client falls back to /api/upload with its local copy
+                _count('aborted')
+                await asyncio.to_thread(self.upload.abort)
+                await asyncio.to_thread(save_recording_upload, self.supabase, self.draft_id, None)
+
+    @staticmethod
+    def _is_end(text: str) -> bool:
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return False
+        return isinstance(data, dict) and data.get('type') == 'end'
+
+    async def _upload_part(self, size: int) -> None:
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        self._part_number += 1
+        await asyncio.to_thread(self.upload.upload_part, self._part_number, data)
+        _count('bytes', len(data))
+        await self._send({"type": "part", "part_number": self._part_number, "bytes": self.upload.size})
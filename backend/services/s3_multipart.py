@@ -0,0 +1,200 @@
+"""
+S3 multipart uploads of recordings
+
+A recording is written to its final key part by part (CreateMultipartUpload
+-> UploadPart... -> CompleteMultipartUpload) instead of one put_object of the
+whole file. Parts are at least S3_MULTIPART_PART_MB (S3 requires 5 MiB for
+every part but the last).
+
+The upload id and part ETags are plain data (to_state / from_state), so an
+upload started by one process (the recording WebSocket) can be completed by
+another (the finalize request). MultipartUpload methods are blocking; async
+callers run them with asyncio.to_thread.
+
+aupload_stream() uploads a file object (/api/upload's UploadFile) part by
+part with S3_UPLOAD_CONCURRENCY parts in flight in threads: the event loop
+never waits on S3 and memory stays at a few parts whatever the file size.
+"""
+
+import asyncio
+import os
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+MIN_PART_SIZE = 5 * 1024 * 1024
+S3_MULTIPART_PART_MB = int(os.getenv("S3_MULTIPART_PART_MB", "8"))
+S3_PART_SIZE = max(MIN_PART_SIZE, S3_MULTIPART_PART_MB * 1024 * 1024)
+S3_UPLOAD_CONCURRENCY = int(os.getenv("S3_UPLOAD_CONCURRENCY", "4"))
+
+_stats_lock = threading.Lock()
+_stats = {
+    'uploads': 0,
+    'single_puts': 0,
+    'parts': 0,
+    'bytes': 0,
+    'completed': 0,
+    'aborted': 0,
+    'errors': 0,
+}
+
+
+def _count(key: str, amount: int = 1) -> None:
+    with _stats_lock:
+        _stats[key] += amount
+
+
+def get_multipart_stats() -> Dict[str, Any]:
+    with _stats_lock:
+        stats = dict(_stats)
+    stats['part_size'] = S3_PART_SIZE
+    stats['concurrency'] = S3_UPLOAD_CONCURRENCY
+    return stats
+
+
+class MultipartUpload:
+    """One S3 multipart upload (parts may be uploaded from several threads)"""
+
+    def __init__(self, s3_client, bucket: str, key: str, upload_id: str, parts: Optional[List[Dict[str, Any]]] = None, size: int = 0):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.upload_id = upload_id
+        self.size = size
+        self._parts: Dict[int, str] = {part['PartNumber']: part['ETag'] for part in parts or []}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, s3_client, bucket: str, key: str, content_type: str = 'audio/webm') -> 'MultipartUpload':
+        try:
+            response = s3_client.create_multipart_upload(Bucket=bucket, Key=key, ContentType=content_type)
+        except Exception:
+            _count('errors')
+            raise
+        _count('uploads')
+        return cls(s3_client, bucket, key, response['UploadId'])
+
+    @classmethod
+    def from_state(cls, s3_client, bucket: str, state: Dict[str, Any]) -> 'MultipartUpload':
+        return cls(s3_client, bucket, state['key'], state['upload_id'], state.get('parts'), state.get('size', 0))
+
+    def to_state(self) -> Dict[str, Any]:
+        return {'key': self.key, 'upload_id': self.upload_id, 'parts': self.parts, 'size': self.size}
+
+    @property
+    def parts(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [{'PartNumber': number, 'ETag': etag} for number, etag in sorted(self._parts.items())]
+
+    def upload_part(self, part_number: int, data: bytes) -> None:
+        """Upload part part_number (1-based); every part but the last must be >= 5 MiB"""
+        try:
+            response = self.s3_client.upload_part(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self.upload_id,
+                PartNumber=part_number,
+                Body=data
+            )
+        except Exception:
+            _count('errors')
+            raise
+        with self._lock:
+            self._parts[part_number] = response['ETag']
+            self.size += len(data)
+        _count('parts')
+        _count('bytes', len(data))
+
+    def complete(self) -> None:
+        """Assemble the parts into the object at key (this is when S3 events fire)"""
+        try:
+            self.s3_client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self.upload_id,
+                MultipartUpload={'Parts': self.parts}
+            )
+        except Exception:
+            _count('errors')
+            raise
+        _count('completed')
+
+    def abort(self) -> None:
+        """Discard the uploaded parts (never raises)"""
+        try:
+            self.s3_client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id)
+        except Exception as e:
+            print(f"[S3Multipart] Could not abort upload of {self.key}: {e}")
+            _count('errors')
+            return
+        _count('aborted')
+
+
+async def _aread_part(read: Callable[[int], Awaitable[bytes]], size: int) -> bytes:
+    """Up to size bytes (less only at the end of the file)"""
+    data = await read(size)
+    if not data or len(data) >= size:
+        return data
+    buffer = bytearray(data)
+    while len(buffer) < size:
+        more = await read(size - len(buffer))
+        if not more:
+            break
+        buffer.extend(more)
+    return bytes(buffer)
+
+
+async def aupload_stream(
+    s3_client,
+    bucket: str,
+    key: str,
+    read: Callable[[int], Awaitable[bytes]],
+    content_type: str = 'audio/webm',
+    part_size: int = S3_PART_SIZE,
+    concurrency: int = S3_UPLOAD_CONCURRENCY
+) -> int:
+    """
+    Upload what the async read(n) returns (e.g. UploadFile.read) to key; returns the size
+
+    Reads one part at a time while up to `concurrency` parts upload in
+    threads (memory: about concurrency + 1 parts). A body smaller than one
+    part is a single put_object. The upload is aborted on any failure,
+    including cancellation.
+    """
+    data = await _aread_part(read, part_size)
+    if len(data) < part_size:
+        await asyncio.to_thread(s3_client.put_object, Bucket=bucket, Key=key, Body=data, ContentType=content_type)
+        _count('single_puts')
+        _count('bytes', len(data))
+        return len(data)
+
+    upload = await asyncio.to_thread(MultipartUpload.create, s3_client, bucket, key, content_type)
+    slots = asyncio.Semaphore(max(1, concurrency))
+    tasks: List[asyncio.Task] = []
+
+    async def send(part_number: int, part: bytes) -> None:
+        try:
+            await asyncio.to_thread(upload.upload_part, part_number, part)
+        finally:
+            slots.release()
+
+    try:
+        part_number = 0
+        while data:
+            part_number += 1
+            await slots.acquire()
+            # Stop reading as soon as a part failed
+            for task in tasks:
+                if task.done() and task.exception():
+                    raise task.exception()
+            tasks.append(asyncio.create_task(send(part_number, data)))
+            data = await _aread_part(read, part_size)
+        await asyncio.gather(*tasks)
+        await asyncio.to_thread(upload.complete)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.to_thread(upload.abort)
+        raise
+    return upload.size
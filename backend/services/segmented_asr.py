@@ -0,0 +1,422 @@
+"""
+Segmented (parallel) ASR for long recordings (ASR_SEGMENTED_ENABLED=true)
+
+One provider request over a 90 minute interview serializes the whole
+provider latency. Recordings longer than 1.5 x ASR_SEGMENT_SECONDS are:
+
+1. decoded by ffmpeg to 16 kHz mono PCM (temp file) and scanned for silence
+   (services/audio_preprocess.py)
+2. cut near every ASR_SEGMENT_SECONDS (evenly spread) at the longest silence
+   within +-ASR_SEGMENT_SEARCH_SECONDS of the target (quietest frame if none)
+3. encoded per segment to Opus, extended by ASR_SEGMENT_OVERLAP_SECONDS into
+   both neighbours, and transcribed concurrently (ASR_SEGMENT_CONCURRENCY)
+   with the shared provider instance
+4. stitched: times are shifted to the original recording (the same time
+   remap table as pre-processing, so AUDIO_PREPROCESS_ENABLED trims silences
+   inside each segment too), each utterance / paragraph is kept by the
+   segment that owns its midpoint, and speaker labels are reconciled
+
+Speaker labels are per request, so "S1" of segment 2 need not be "S1" of
+segment 1. Both segments transcribe the overlap around a cut; local labels
+are matched to the previous segment's (global) labels by how long their
+utterances coincide there. Unmatched labels take the remaining known
+labels (most talkative first), then new ones.
+
+Wall-clock time follows the slowest segment instead of the total length.
+"""
+
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from services.audio_preprocess import (
+    AUDIO_PREPROCESS_ENABLED,
+    AUDIO_PREPROCESS_SAMPLE_RATE,
+    AUDIO_VAD_FRAME_MS,
+    SAMPLE_BYTES,
+    build_time_remap,
+    decode_to_pcm,
+    detect_speech,
+    encode_spans,
+    frame_energies_db,
+    keep_spans,
+    remap_transcription,
+)
+from services.audio_source import AUDIO_SPOOL_DIR, SpooledAudioFile
+
+
+ASR_SEGMENTED_ENABLED = os.getenv("ASR_SEGMENTED_ENABLED", "false").lower() == "true"
+ASR_SEGMENT_SECONDS = float(os.getenv("ASR_SEGMENT_SECONDS", "600"))
+ASR_SEGMENT_SEARCH_SECONDS = float(os.getenv("ASR_SEGMENT_SEARCH_SECONDS", "60"))
+ASR_SEGMENT_OVERLAP_SECONDS = float(os.getenv("ASR_SEGMENT_OVERLAP_SECONDS", "15"))
+ASR_SEGMENT_CONCURRENCY = int(os.getenv("ASR_SEGMENT_CONCURRENCY", "4"))
+
+# Shorter coincidence than this (seconds) does not tie two speaker labels
+SPEAKER_MATCH_MIN_SECONDS = 0.5
+
+_stats_lock = threading.Lock()
+_stats = {
+    'recordings': 0,
+    'segments': 0,
+    'unsegmented': 0,
+    'failed': 0,
+    'seconds_saved': 0.0,
+}
+
+
+def _count(key: str, amount=1) -> None:
+    with _stats_lock:
+        _stats[key] += amount
+
+
+def get_segmented_stats() -> Dict[str, Any]:
+    with _stats_lock:
+        stats = dict(_stats)
+    stats['enabled'] = ASR_SEGMENTED_ENABLED
+    stats['seconds_saved'] = round(stats['seconds_saved'], 1)
+    return stats
+
+
+# ------------------------------------------------------------------
+# Plan
+# ------------------------------------------------------------------
+
+def plan_cuts(
+    levels_db: np.ndarray,
+    speech: np.ndarray,
+    frame_ms: int = AUDIO_VAD_FRAME_MS,
+    segment_seconds: float = ASR_SEGMENT_SECONDS,
+    search_seconds: float = ASR_SEGMENT_SEARCH_SECONDS
+) -> List[int]:
+    """Cut frames (ascending); empty if the recording is a single segment"""
+    total = len(speech)
+    frame_seconds = frame_ms / 1000
+    count = int(round(total * frame_seconds / segment_seconds))
+    if count <= 1:
+        return []
+
+    # Silent runs [start, end) and their centers
+    silent = np.concatenate(([False], ~speech, [False]))
+    edges = np.flatnonzero(np.diff(silent.astype(np.int8)))
+    run_starts, run_ends = edges[0::2], edges[1::2]
+    run_lengths = run_ends - run_starts
+    centers = (run_starts + run_ends) // 2
+
+    search = int(search_seconds / frame_seconds)
+    cuts: List[int] = []
+    for index in range(1, count):
+        target = index * total // count
+        low, high = max(1, target - search), min(total - 1, target + search)
+        inside = (centers > low) & (centers < high)
+        if inside.any():
+            candidates = centers[inside]
+            # Longest silence first, nearest to the target on ties
+            best = np.lexsort((np.abs(candidates - target), -run_lengths[inside]))[0]
+            cut = int(candidates[best])
+        else:
+            cut = low + int(np.argmin(levels_db[low:high]))
+        if cuts and cut <= cuts[-1]:
+            continue
+        cuts.append(cut)
+    return cuts
+
+
+def segment_spans(
+    cuts: List[int],
+    total_frames: int,
+    overlap_frames: int,
+    kept: Optional[List[Tuple[int, int]]] = None
+) -> List[List[Tuple[int, int]]]:
+    """
+    Frame spans to encode per segment: the segment plus overlap_frames on
+    each side, intersected with `kept` (pre-processing) when given
+    """
+    bounds = [0] + cuts + [total_frames]
+    segments = []
+    for index in range(len(bounds) - 1):
+        start = max(0, bounds[index] - overlap_frames)
+        end = min(total_frames, bounds[index + 1] + overlap_frames)
+        if kept is None:
+            segments.append([(start, end)])
+            continue
+        segments.append([
+            (max(start, span_start), min(end, span_end))
+            for span_start, span_end in kept
+            if span_start < end and span_end > start
+        ])
+    return segments
+
+
+# ------------------------------------------------------------------
+# Stitch
+# ------------------------------------------------------------------
+
+def _midpoint(segment: Dict[str, Any]) -> float:
+    return ((segment.get('start') or 0) + (segment.get('end') or 0)) / 2
+
+
+def _speaking_time(utterances: List[Dict[str, Any]]) -> Dict[Any, float]:
+    totals: Dict[Any, float] = {}
+    for utterance in utterances:
+        speaker = utterance.get('speaker')
+        if speaker is not None:
+            totals[speaker] = totals.get(speaker, 0.0) + max(0.0, (utterance.get('end') or 0) - (utterance.get('start') or 0))
+    return totals
+
+
+def _new_label(used: set) -> Any:
+    if used and all(isinstance(label, int) for label in used):
+        return max(used) + 1
+    number = len(used) + 1
+    while f"S{number}" in used:
+        number += 1
+    return f"S{number}"
+
+
+def match_speakers(
+    reference: List[Dict[str, Any]],
+    utterances: List[Dict[str, Any]],
+    window: Tuple[float, float],
+    known_speakers: Dict[Any, float]
+) -> Dict[Any, Any]:
+    """
+    Local label -> global label for one segment
+
+    reference: the previous segment's utterances (global labels), utterances:
+    this segment's (local labels), window: the overlap both transcribed,
+    known_speakers: global label -> speaking time so far.
+    """
+    low, high = window
+
+    def in_window(items):
+        return [
+            item for item in items
+            if item.get('speaker') is not None and (item.get('end') or 0) > low and (item.get('start') or 0) < high
+        ]
+
+    coincidence: Dict[Tuple[Any, Any], float] = {}
+    for ref in in_window(reference):
+        ref_start, ref_end = max(low, ref['start']), min(high, ref['end'])
+        for utterance in in_window(utterances):
+            seconds = min(ref_end, utterance['end']) - max(ref_start, utterance['start'])
+            if seconds > 0:
+                key = (ref['speaker'], utterance['speaker'])
+                coincidence[key] = coincidence.get(key, 0.0) + seconds
+
+    mapping: Dict[Any, Any] = {}
+    taken = set()
+    for (global_label, local_label), seconds in sorted(coincidence.items(), key=lambda item: -item[1]):
+        if seconds < SPEAKER_MATCH_MIN_SECONDS:
+            break
+        if local_label in mapping or global_label in taken:
+            continue
+        mapping[local_label] = global_label
+        taken.add(global_label)
+
+    # Speakers silent in the overlap: known labels not matched yet, then new ones
+    remaining = [label for label in sorted(known_speakers, key=lambda label: -known_speakers[label]) if label not in taken]
+    local_times = _speaking_time(utterances)
+    used = set(known_speakers) | taken
+    for local_label in sorted(local_times, key=lambda label: -local_times[label]):
+        if local_label in mapping:
+            continue
+        if remaining:
+            mapping[local_label] = remaining.pop(0)
+        else:
+            mapping[local_label] = _new_label(used)
+        used.add(mapping[local_label])
+    return mapping
+
+
+def stitch_segments(results: List[Dict[str, Any]], bounds: List[float], overlap_seconds: float) -> Dict[str, Any]:
+    """
+    Merge per-segment results (times already on the original recording)
+
+    bounds: [0, cut_1, ..., end] seconds; segment i owns [bounds[i], bounds[i+1])
+    """
+    utterances: List[Dict[str, Any]] = []
+    paragraphs: List[Dict[str, Any]] = []
+    texts: List[str] = []
+    speaker_maps: List[Dict[str, Any]] = []
+    known_speakers: Dict[Any, float] = {}
+    previous: List[Dict[str, Any]] = []
+
+    def owned(items, index):
+        last = index == len(results) - 1
+        return [
+            item for item in items
+            if bounds[index] <= _midpoint(item) and (last or _midpoint(item) < bounds[index + 1])
+        ]
+
+    for index, result in enumerate(results):
+        segment_utterances = [dict(utterance) for utterance in result.get('utterances') or []]
+        if index == 0:
+            mapping = {label: label for label in _speaking_time(segment_utterances)}
+        else:
+            cut = bounds[index]
+            mapping = match_speakers(previous, segment_utterances, (cut - overlap_seconds, cut + overlap_seconds), known_speakers)
+        for utterance in segment_utterances:
+            if utterance.get('speaker') is not None:
+                utterance['speaker'] = mapping.get(utterance['speaker'], utterance['speaker'])
+        speaker_maps.append({str(local): global_label for local, global_label in mapping.items()})
+
+        kept = owned(segment_utterances, index)
+        utterances.extend(kept)
+        for speaker, seconds in _speaking_time(kept).items():
+            known_speakers[speaker] = known_speakers.get(speaker, 0.0) + seconds
+        paragraphs.extend(owned(result.get('paragraphs') or [], index))
+        previous = segment_utterances
+
+        if segment_utterances:
+            texts.extend(utterance.get('transcript') or '' for utterance in kept)
+        elif result.get('transcription'):
+            # No utterance timing: the overlap cannot be trimmed from the text
+            texts.append(result['transcription'])
+
+    transcription = '\n'.join(text for text in texts if text)
+    durations = [max(0.0, (u.get('end') or 0) - (u.get('start') or 0)) for u in utterances]
+    if sum(durations) > 0:
+        confidence = sum((u.get('confidence') or 0) * d for u, d in zip(utterances, durations)) / sum(durations)
+    else:
+        spoken = [r for r in results if not r.get('no_speech_detected')]
+        confidence = sum(r.get('confidence') or 0 for r in spoken) / len(spoken) if spoken else 0.0
+
+    first = results[0] if results else {}
+    return {
+        "transcription": transcription,
+        "processing_time": max((r.get('processing_time') or 0 for r in results), default=0.0),
+        "confidence": round(confidence, 2),
+        "word_count": len(transcription),
+        "utterances": utterances,
+        "paragraphs": paragraphs,
+        "speaker_count": len({u['speaker'] for u in utterances if u.get('speaker') is not None}),
+        "no_speech_detected": not transcription,
+        "model": first.get('model', 'unknown'),
+        "provider": first.get('provider', 'unknown'),
+        "asr_segments": {
+            'bounds': [round(bound, 2) for bound in bounds],
+            'overlap_seconds': overlap_seconds,
+            'processing_times': [r.get('processing_time') for r in results],
+            'speaker_maps': speaker_maps,
+        },
+    }
+
+
+# ------------------------------------------------------------------
+# Pipeline
+# ------------------------------------------------------------------
+
+def _analyze(audio_file: BinaryIO):
+    """Decode to a named PCM temp file (reopened per encoder thread); None for a single segment"""
+    frame_samples = AUDIO_PREPROCESS_SAMPLE_RATE * AUDIO_VAD_FRAME_MS // 1000
+    pcm_file = tempfile.NamedTemporaryFile(prefix='asr-seg-', suffix='.pcm', dir=AUDIO_SPOOL_DIR)
+    try:
+        decode_to_pcm(audio_file, pcm_file)
+        pcm_file.flush()
+        total_frames = -(-pcm_file.tell() // (frame_samples * SAMPLE_BYTES))
+        levels = frame_energies_db(pcm_file, frame_samples)
+        speech = detect_speech(levels)
+        cuts = plan_cuts(levels, speech)
+        if not cuts:
+            pcm_file.close()
+            return None
+        kept = keep_spans(speech) if AUDIO_PREPROCESS_ENABLED else None
+        overlap_frames = int(ASR_SEGMENT_OVERLAP_SECONDS * 1000 / AUDIO_VAD_FRAME_MS)
+        spans = segment_spans(cuts, total_frames, overlap_frames, kept)
+    except BaseException:
+        pcm_file.close()
+        raise
+    return pcm_file, frame_samples, total_frames, cuts, spans
+
+
+def _encode_segment(pcm_path: str, spans: List[Tuple[int, int]], frame_samples: int, filename: str) -> BinaryIO:
+    output = SpooledAudioFile(filename, prefix='asr-seg-', suffix='.ogg', dir=AUDIO_SPOOL_DIR)
+    try:
+        with open(pcm_path, 'rb') as pcm_file:
+            encode_spans(pcm_file, spans, frame_samples, output)
+        output.seek(0)
+    except BaseException:
+        output.close()
+        raise
+    return output
+
+
+async def atranscribe_segmented(asr_service, audio_file: BinaryIO, filename: str) -> Optional[Dict[str, Any]]:
+    """
+    Transcribe a long recording as concurrent segments
+
+    Returns:
+        Stitched result (same format as transcribe_audio, times on the original
+        recording), or None when the recording is a single segment or cannot be
+        decoded - the caller then transcribes it as a whole
+
+    Raises:
+        Exception: If a segment's transcription fails
+    """
+    started = time.time()
+    try:
+        plan = await asyncio.to_thread(_analyze, audio_file)
+    except Exception as e:
+        _count('failed')
+        print(f"[ASRSegments] Could not split {filename}, transcribing as a whole: {e}")
+        return None
+    if plan is None:
+        _count('unsegmented')
+        return None
+
+    pcm_file, frame_samples, total_frames, cuts, spans = plan
+    frame_seconds = AUDIO_VAD_FRAME_MS / 1000
+    base, _ = os.path.splitext(os.path.basename(filename))
+    semaphore = asyncio.Semaphore(ASR_SEGMENT_CONCURRENCY)
+    segment_count = len(spans)
+
+    async def transcribe(index: int, segment: List[Tuple[int, int]]) -> Dict[str, Any]:
+        if not segment:
+            return {"transcription": "", "utterances": [], "paragraphs": [], "no_speech_detected": True}
+        async with semaphore:
+            # Encoded only once a slot is free: at most ASR_SEGMENT_CONCURRENCY segment files at a time
+            segment_name = f"{base}.part{index + 1:02d}.ogg"
+            segment_file = await asyncio.to_thread(_encode_segment, pcm_file.name, segment, frame_samples, segment_name)
+            try:
+                result = await asr_service.transcribe_audio(audio_file=segment_file, filename=segment_name)
+            except Exception as e:
+                raise RuntimeError(f"segment {index + 1}/{segment_count}: {e}") from e
+            finally:
+                segment_file.close()
+        return remap_transcription(result, build_time_remap(segment, AUDIO_VAD_FRAME_MS))
+
+    tasks = [asyncio.ensure_future(transcribe(index, segment)) for index, segment in enumerate(spans)]
+    try:
+        # gather() keeps segment order regardless of completion order
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    finally:
+        pcm_file.close()
+
+    bounds = [0.0] + [cut * frame_seconds for cut in cuts] + [total_frames * frame_seconds]
+    stitched = stitch_segments(list(results), bounds, ASR_SEGMENT_OVERLAP_SECONDS)
+    stitched['processing_time'] = round(time.time() - started, 2)
+    if AUDIO_PREPROCESS_ENABLED:
+        # Times are already on the original recording (no time_remap to apply later)
+        stitched['audio_preprocess'] = {
+            'original_seconds': round(total_frames * frame_seconds, 1),
+            'processed_seconds': round(sum(end - start for segment in spans for start, end in segment) * frame_seconds, 1),
+        }
+
+    sequential = sum(r.get('processing_time') or 0 for r in results)
+    _count('recordings')
+    _count('segments', segment_count)
+    _count('seconds_saved', max(0.0, sequential - stitched['processing_time']))
+    print(
+        f"[ASRSegments] Transcribed {filename} as {segment_count} segments in {stitched['processing_time']}s "
+        f"(sum of segments {sequential:.1f}s), {stitched['speaker_count']} speakers"
+    )
+    return stitched
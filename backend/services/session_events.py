@@ -0,0 +1,192 @@
+"""
+Session events - in-process pub/sub for session status / phase transitions
+
+Publishers (background_tasks.py, llm_pipeline.py) run on job worker threads
+or the job queue event loop; subscribers are SSE handlers on the uvicorn
+event loop. publish() is thread-safe and hands events to each subscriber's
+loop with call_soon_threadsafe.
+
+Each session keeps a short ring buffer of recent events so a reconnecting
+client can resume with Last-Event-ID. Event ids are "<process>-<seq>": an id
+from another worker process (or an evicted buffer) cannot be replayed, and
+the SSE handler sends a fresh snapshot instead.
+"""
+
+import asyncio
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional, Tuple
+
+
+EVENT_BUFFER_SIZE = 100
+MAX_BUFFERED_SESSIONS = 1000
+SUBSCRIBER_QUEUE_SIZE = 200
+
+
+class SessionEvent:
+    __slots__ = ('id', 'seq', 'session_id', 'event', 'data', 'created_at')
+
+    def __init__(self, event_id: str, seq: int, session_id: str, event: str, data: Dict[str, Any]):
+        self.id = event_id
+        self.seq = seq
+        self.session_id = session_id
+        self.event = event
+        self.data = data
+        self.created_at = time.time()
+
+    def to_sse(self) -> str:
+        payload = json.dumps({'session_id': self.session_id, **self.data}, ensure_ascii=False, default=str)
+        return f"id: {self.id}\nevent: {self.event}\ndata: {payload}\n\n"
+
+
+class _EventBuffer:
+    """Recent events of one session; trimmed_seq = newest seq pushed out"""
+    __slots__ = ('events', 'trimmed_seq')
+
+    def __init__(self, size: int):
+        self.events = deque(maxlen=size)
+        self.trimmed_seq = 0
+
+    def append(self, event: SessionEvent) -> None:
+        if len(self.events) == self.events.maxlen:
+            self.trimmed_seq = self.events[0].seq
+        self.events.append(event)
+
+
+class _Subscriber:
+    __slots__ = ('loop', 'queue', 'overflowed')
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.overflowed = False
+
+    def deliver(self, event: Optional[SessionEvent]) -> None:
+        # Runs on the subscriber's loop. A slow client is cut off (None) and
+        # resumes from the ring buffer via Last-Event-ID on reconnect.
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class SessionEventBus:
+    """Fan-out of session events to SSE subscribers (per process)"""
+
+    def __init__(self, buffer_size: int = EVENT_BUFFER_SIZE, max_sessions: int = MAX_BUFFERED_SESSIONS):
+        self.buffer_size = buffer_size
+        self.max_sessions = max_sessions
+        self.process_id = uuid.uuid4().hex[:8]
+
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._buffers: "OrderedDict[str, _EventBuffer]" = OrderedDict()
+        self._evicted_seq = 0
+        self._subscribers: Dict[str, List[_Subscriber]] = {}
+        self._published = 0
+        self._dropped_subscribers = 0
+
+    def publish(self, session_id: str, event: str, data: Optional[Dict[str, Any]] = None) -> SessionEvent:
+        """Record an event and fan it out (safe from any thread)"""
+        with self._lock:
+            self._seq += 1
+            session_event = SessionEvent(f"{self.process_id}-{self._seq}", self._seq, session_id, event, data or {})
+
+            buffer = self._buffers.pop(session_id, None)
+            if buffer is None:
+                buffer = _EventBuffer(self.buffer_size)
+            buffer.append(session_event)
+            self._buffers[session_id] = buffer
+            while len(self._buffers) > self.max_sessions:
+                _, evicted = self._buffers.popitem(last=False)
+                self._evicted_seq = max(self._evicted_seq, evicted.events[-1].seq)
+
+            subscribers = list(self._subscribers.get(session_id, ()))
+            self._published += 1
+
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(subscriber.deliver, session_event)
+            except RuntimeError:
+                # Subscriber loop already closed
+                self._remove(session_id, subscriber)
+        return session_event
+
+    def subscribe(
+        self,
+        session_id: str,
+        last_event_id: Optional[str] = None
+    ) -> Tuple[_Subscriber, Optional[List[SessionEvent]], str]:
+        """
+        Register a subscriber on the running loop
+
+        Returns:
+            (subscriber, replay, cursor_id) - replay is the list of buffered
+            events after last_event_id, or None if the id cannot be resumed
+            here (no id, other process, or already evicted) and a snapshot is
+            needed. cursor_id is the id to stamp on that snapshot: every
+            later event reaches the subscriber queue.
+        """
+        subscriber = _Subscriber(asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.setdefault(session_id, []).append(subscriber)
+            replay = self._replay_after(session_id, last_event_id)
+            cursor_id = f"{self.process_id}-{self._seq}"
+        return subscriber, replay, cursor_id
+
+    def unsubscribe(self, session_id: str, subscriber: _Subscriber) -> None:
+        if subscriber.overflowed:
+            with self._lock:
+                self._dropped_subscribers += 1
+        self._remove(session_id, subscriber)
+
+    def _remove(self, session_id: str, subscriber: _Subscriber) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(session_id)
+            if subscribers and subscriber in subscribers:
+                subscribers.remove(subscriber)
+                if not subscribers:
+                    del self._subscribers[session_id]
+
+    def _replay_after(self, session_id: str, last_event_id: Optional[str]) -> Optional[List[SessionEvent]]:
+        if not last_event_id:
+            return None
+        process_id, _, seq = last_event_id.partition('-')
+        if process_id != self.process_id or not seq.isdigit():
+            return None
+
+        last_seq = int(seq)
+        buffer = self._buffers.get(session_id)
+        if last_seq < self._evicted_seq or (buffer and last_seq < buffer.trimmed_seq):
+            # Events after last_event_id may have been evicted
+            return None
+        if not buffer:
+            return []
+        return [event for event in buffer.events if event.seq > last_seq]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'published': self._published,
+                'buffered_sessions': len(self._buffers),
+                'subscribers': sum(len(subs) for subs in self._subscribers.values()),
+                'dropped_subscribers': self._dropped_subscribers,
+            }
+
+
+session_event_bus = SessionEventBus()
+
+
+def publish_session_event(session_id: str, event: str, data: Optional[Dict[str, Any]] = None) -> None:
+    """Publish to the process-wide bus; never raises into the pipeline"""
+    try:
+        session_event_bus.publish(session_id, event, data)
+    except Exception as e:
+        print(f"[Events] Failed to publish {event} for session {session_id}: {e}")
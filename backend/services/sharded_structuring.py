@@ -0,0 +1,202 @@
+"""
+Sharded Phase 2 fact annotation
+
+Phase 2 annotates each Phase 1 fact 1:1, so the facts can be annotated in
+independent shards:
+
+- profile shard: basic_info (child_profile), parent/child intentions and
+  unresolved_items
+- fact shards: the remaining categories in schema order, packed into
+  batches of at most PHASE2_SHARD_MAX_FACTS (large categories are split)
+
+Shards run concurrently (PHASE2_SHARD_CONCURRENCY) with the regular Phase 2
+prompt over their subset of extraction_v1, and are reassembled in shard
+order into one annotated_facts_v1. Each shard's output item count must match
+its input count; a mismatched shard is retried once with the expected count
+spelled out. If it still differs, the sharded run is abandoned (recorded in
+the progress notes) and Phase 2 falls back to the single call.
+"""
+
+import asyncio
+import os
+from typing import Any, Dict, List, Optional
+
+from services.chunked_extraction import EXTRACTION_CATEGORIES
+from services.llm_pipeline import (
+    PhaseProgress,
+    agenerate_bounded,
+    extract_from_wrapped_result,
+    parse_llm_output,
+)
+from services.prompts import build_fact_structuring_prompt
+
+
+PHASE2_SHARDING_ENABLED = os.getenv("PHASE2_SHARDING_ENABLED", "true").lower() == "true"
+PHASE2_SHARD_MIN_FACTS = int(os.getenv("PHASE2_SHARD_MIN_FACTS", "24"))
+PHASE2_SHARD_MAX_FACTS = int(os.getenv("PHASE2_SHARD_MAX_FACTS", "12"))
+PHASE2_SHARD_CONCURRENCY = int(os.getenv("PHASE2_SHARD_CONCURRENCY", "4"))
+
+PROFILE_CATEGORIES = ['basic_info', 'parent_intentions', 'child_intentions', 'unresolved_items']
+OUTPUT_LISTS = ['annotated_items', 'parent_child_intentions', 'unresolved_items']
+
+
+class ShardCountMismatch(ValueError):
+    """A shard's output item count still differs from its input after the retry"""
+
+    def __init__(self, label: str, expected: int, actual: int):
+        super().__init__(f"Phase 2 {label}: item count mismatch (input {expected}, output {actual})")
+        self.label = label
+        self.expected = expected
+        self.actual = actual
+
+
+def _count_facts(shard: Dict[str, List[Any]]) -> int:
+    """Phase 1 items that must come back 1:1 (basic_info feeds child_profile)"""
+    return sum(len(items) for category, items in shard.items() if category != 'basic_info')
+
+
+def plan_shards(extraction_v1: Dict[str, Any], max_facts: int = PHASE2_SHARD_MAX_FACTS) -> List[Dict[str, List[Any]]]:
+    """Split extraction_v1 into the profile shard + fact-count batches"""
+    shards: List[Dict[str, List[Any]]] = []
+
+    profile = {category: list(extraction_v1.get(category) or []) for category in PROFILE_CATEGORIES}
+    if any(profile.values()):
+        shards.append(profile)
+
+    extra_categories = sorted(category for category in extraction_v1 if category not in EXTRACTION_CATEGORIES)
+    current: Dict[str, List[Any]] = {}
+    current_count = 0
+    for category in EXTRACTION_CATEGORIES + extra_categories:
+        if category in PROFILE_CATEGORIES:
+            continue
+        items = extraction_v1.get(category) or []
+        for start in range(0, len(items), max_facts):
+            batch = items[start:start + max_facts]
+            if current and current_count + len(batch) > max_facts:
+                shards.append(current)
+                current, current_count = {}, 0
+            current.setdefault(category, []).extend(batch)
+            current_count += len(batch)
+    if current:
+        shards.append(current)
+    return shards
+
+
+def plan_sharded_structuring(session_data: Dict[str, Any]) -> Optional[List[Dict[str, List[Any]]]]:
+    """Shards for this session, or None when a single Phase 2 call is preferable"""
+    if not PHASE2_SHARDING_ENABLED:
+        return None
+    extraction_v1 = extract_from_wrapped_result(session_data.get('fact_extraction_result_v1'), 'extraction_v1')
+    if not isinstance(extraction_v1, dict):
+        return None
+    if _count_facts(extraction_v1) < PHASE2_SHARD_MIN_FACTS:
+        return None
+
+    shards = plan_shards(extraction_v1)
+    return shards if len(shards) > 1 else None
+
+
+def _output_count(annotated: Dict[str, Any]) -> int:
+    return sum(len(annotated.get(key) or []) for key in OUTPUT_LISTS)
+
+
+def _count_matches(shard: Dict[str, List[Any]], annotated: Dict[str, Any]) -> bool:
+    expected = _count_facts(shard)
+    actual = _output_count(annotated)
+    # basic_info may additionally be echoed as annotated items
+    return expected <= actual <= expected + len(shard.get('basic_info') or [])
+
+
+async def _annotate_shard(
+    llm_service,
+    shard: Dict[str, List[Any]],
+    label: str,
+    progress: PhaseProgress
+) -> Dict[str, Any]:
+    prompt = build_fact_structuring_prompt({'fact_extraction_result_v1': {'extraction_v1': shard}})
+    expected = _count_facts(shard)
+    actual: Optional[int] = None
+
+    for attempt in range(2):
+        if attempt:
+            print(f"[Background] Phase 2 {label}: item count mismatch, retrying (expected {expected})")
+            prompt += (
+                f"\n\n※ 入力の事実は {expected} 件です（basic_info を除く）。"
+                f"annotated_items / parent_child_intentions / unresolved_items の合計を必ず {expected} 件にしてください。"
+            )
+
+        output = await agenerate_bounded(llm_service, prompt)
+        progress.add(output or '')
+        annotated = extract_from_wrapped_result(parse_llm_output(output or ''), 'annotated_facts_v1')
+        if not isinstance(annotated, dict):
+            continue
+        if _count_matches(shard, annotated):
+            return annotated
+        actual = _output_count(annotated)
+
+    if actual is None:
+        raise ValueError(f"Phase 2 {label}: annotated_facts_v1 not found in LLM response")
+    raise ShardCountMismatch(label, expected, actual)
+
+
+async def arun_sharded_structuring(
+    llm_service,
+    session_data: Dict[str, Any],
+    progress: PhaseProgress
+) -> Optional[Dict[str, Any]]:
+    """
+    Annotate shards concurrently and reassemble {"annotated_facts_v1": ...}
+    (parallel_runner of aexecute_llm_phase)
+
+    Returns:
+        The assembled result, or None when sharding does not apply or a
+        shard's item count still differs after its retry (single-call fallback)
+
+    Raises:
+        ValueError: If a shard returns no annotated_facts_v1
+    """
+    shards = plan_sharded_structuring(session_data)
+    if not shards:
+        return None
+
+    semaphore = asyncio.Semaphore(PHASE2_SHARD_CONCURRENCY)
+
+    async def annotate(index: int, shard: Dict[str, List[Any]]) -> Dict[str, Any]:
+        async with semaphore:
+            return await _annotate_shard(llm_service, shard, f"shard {index + 1}/{len(shards)}", progress)
+
+    await progress.start()
+    tasks = [asyncio.ensure_future(annotate(index, shard)) for index, shard in enumerate(shards)]
+    try:
+        parts = await asyncio.gather(*tasks)
+    except ShardCountMismatch as e:
+        for task in tasks:
+            task.cancel()
+        print(f"[Background] WARNING: {e}; falling back to a single Phase 2 call")
+        progress.note('sharding', {
+            'shards': len(shards),
+            'mismatch': {'shard': e.label, 'expected': e.expected, 'actual': e.actual},
+            'fallback': 'single_call',
+        })
+        progress.discard_output()
+        return None
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    assembled: Dict[str, Any] = {'child_profile': None}
+    for key in OUTPUT_LISTS:
+        assembled[key] = []
+    for shard, part in zip(shards, parts):
+        if assembled['child_profile'] is None and shard.get('basic_info'):
+            assembled['child_profile'] = part.get('child_profile')
+        for key in OUTPUT_LISTS:
+            assembled[key].extend(part.get(key) or [])
+    if assembled['child_profile'] is None:
+        assembled['child_profile'] = next((part.get('child_profile') for part in parts if part.get('child_profile')), None)
+
+    expected = sum(_count_facts(shard) for shard in shards)
+    print(f"[Background] Phase 2 sharded: {len(shards)} shards, {expected} facts in, {_output_count(assembled)} items out")
+    progress.note('sharding', {'shards': len(shards), 'facts': expected, 'items': _output_count(assembled)})
+    return {'annotated_facts_v1': assembled}
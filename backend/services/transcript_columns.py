@@ -0,0 +1,208 @@
+"""
+Compact columnar storage of diarized utterances (transcription_metadata)
+
+transcription_metadata.utterances used to be a JSON list of dicts repeating
+start / end / confidence / transcript / speaker for every utterance. Sessions
+now store transcription_metadata.utterance_columns instead:
+
+    {
+      "v": 1,
+      "count": 3,
+      "start": [0, 152, 88],        # centiseconds, delta from previous start
+      "duration": [140, 80, 310],   # centiseconds (end - start)
+      "confidence": [92, 88, 95],   # percent
+      "speaker": [0, 1, 0],         # index into speakers (-1: none)
+      "speakers": ["S1", "S2"],
+      "text": "...",                # all transcripts concatenated
+      "offsets": [12, 20, 41]       # end of each transcript in text (code points)
+    }
+
+Above UTTERANCE_COMPRESS_MIN_BYTES the columns are stored as
+{"v": 1, "count": n, "zlib": "<base64>"} instead.
+
+UtteranceColumns decodes on first access and yields lightweight
+UtteranceView objects (transcript sliced from the text blob on demand);
+boundaries() gives start/end times without touching the text. Rows written
+before this change (utterances list) are read through the same interface.
+"""
+
+import base64
+import json
+import os
+import zlib
+from itertools import accumulate
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+UTTERANCE_COMPRESS_MIN_BYTES = int(os.getenv("UTTERANCE_COMPRESS_MIN_BYTES", "16384"))
+
+COLUMNS_VERSION = 1
+
+
+def _centiseconds(value: Any) -> int:
+    return int(round(float(value or 0) * 100))
+
+
+def encode_utterances(
+    utterances: List[Dict[str, Any]],
+    compress_min_bytes: int = UTTERANCE_COMPRESS_MIN_BYTES
+) -> Dict[str, Any]:
+    """Provider utterance dicts -> utterance_columns"""
+    speakers: List[Any] = []
+    speaker_index: Dict[Any, int] = {}
+    starts: List[int] = []
+    durations: List[int] = []
+    confidences: List[int] = []
+    speaker_codes: List[int] = []
+    texts: List[str] = []
+
+    previous_start = 0
+    for utterance in utterances:
+        start = _centiseconds(utterance.get('start'))
+        starts.append(start - previous_start)
+        previous_start = start
+        durations.append(max(0, _centiseconds(utterance.get('end')) - start))
+        confidences.append(_centiseconds(utterance.get('confidence')))
+
+        speaker = utterance.get('speaker')
+        if speaker is None:
+            speaker_codes.append(-1)
+        else:
+            code = speaker_index.get(speaker)
+            if code is None:
+                code = speaker_index[speaker] = len(speakers)
+                speakers.append(speaker)
+            speaker_codes.append(code)
+
+        texts.append(utterance.get('transcript') or '')
+
+    columns = {
+        'start': starts,
+        'duration': durations,
+        'confidence': confidences,
+        'speaker': speaker_codes,
+        'speakers': speakers,
+        'text': ''.join(texts),
+        'offsets': list(accumulate(len(text) for text in texts)),
+    }
+
+    payload = json.dumps(columns, ensure_ascii=False, separators=(',', ':'))
+    if compress_min_bytes and len(payload.encode()) >= compress_min_bytes:
+        return {
+            'v': COLUMNS_VERSION,
+            'count': len(texts),
+            'zlib': base64.b64encode(zlib.compress(payload.encode(), 6)).decode('ascii'),
+        }
+    return {'v': COLUMNS_VERSION, 'count': len(texts), **columns}
+
+
+class UtteranceView:
+    """One utterance of UtteranceColumns (fields are read from the columns on access)"""
+
+    __slots__ = ('_columns', '_index')
+
+    def __init__(self, columns: 'UtteranceColumns', index: int):
+        self._columns = columns
+        self._index = index
+
+    @property
+    def start(self) -> float:
+        return self._columns._starts[self._index] / 100
+
+    @property
+    def end(self) -> float:
+        return self._columns._ends[self._index] / 100
+
+    @property
+    def confidence(self) -> float:
+        return self._columns._data['confidence'][self._index] / 100
+
+    @property
+    def speaker(self) -> Any:
+        code = self._columns._data['speaker'][self._index]
+        return self._columns._data['speakers'][code] if code >= 0 else None
+
+    @property
+    def transcript(self) -> str:
+        offsets = self._columns._data['offsets']
+        begin = offsets[self._index - 1] if self._index else 0
+        return self._columns._data['text'][begin:offsets[self._index]]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'start': self.start,
+            'end': self.end,
+            'confidence': self.confidence,
+            'transcript': self.transcript,
+            'speaker': self.speaker,
+        }
+
+
+class UtteranceColumns:
+    """Lazy reader over utterance_columns"""
+
+    def __init__(self, encoded: Dict[str, Any]):
+        self._encoded = encoded
+        self._count = int(encoded.get('count') or 0)
+        self._decoded: Optional[Dict[str, Any]] = None
+        self._start_times: Optional[List[int]] = None
+        self._end_times: Optional[List[int]] = None
+
+    @classmethod
+    def from_metadata(cls, metadata: Optional[Dict[str, Any]]) -> Optional['UtteranceColumns']:
+        """Reader for transcription_metadata (columnar or legacy utterances list); None if absent"""
+        if not isinstance(metadata, dict):
+            return None
+        encoded = metadata.get('utterance_columns')
+        if isinstance(encoded, dict):
+            return cls(encoded)
+        legacy = metadata.get('utterances')
+        if isinstance(legacy, list) and legacy:
+            return cls(encode_utterances(legacy, compress_min_bytes=0))
+        return None
+
+    @property
+    def _data(self) -> Dict[str, Any]:
+        if self._decoded is None:
+            if 'zlib' in self._encoded:
+                self._decoded = json.loads(zlib.decompress(base64.b64decode(self._encoded['zlib'])))
+            else:
+                self._decoded = self._encoded
+        return self._decoded
+
+    @property
+    def _starts(self) -> List[int]:
+        if self._start_times is None:
+            self._start_times = list(accumulate(self._data['start']))
+        return self._start_times
+
+    @property
+    def _ends(self) -> List[int]:
+        if self._end_times is None:
+            self._end_times = [start + duration for start, duration in zip(self._starts, self._data['duration'])]
+        return self._end_times
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> UtteranceView:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return UtteranceView(self, index)
+
+    def __iter__(self) -> Iterator[UtteranceView]:
+        for index in range(self._count):
+            yield UtteranceView(self, index)
+
+    def boundaries(self) -> List[Tuple[float, float]]:
+        """(start, end) seconds of every utterance, without slicing any text"""
+        return [(start / 100, end / 100) for start, end in zip(self._starts, self._ends)]
+
+    def end_time(self) -> float:
+        """End of the last utterance (seconds)"""
+        return self._ends[-1] / 100 if self._count else 0.0
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [view.to_dict() for view in self]
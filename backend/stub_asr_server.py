@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Stub ASR server for local development
+
+Implements the job API used by services/asr_providers/stub_provider.py so the
+async ASR lifecycle (submit -> persist job id -> callback / shared poller ->
+finalize -> SQS) can be exercised without a real ASR account.
+
+    POST /v1/jobs?filename=&url=&callback_url=   (body: audio bytes, unless url is given)
+        -> {"id": "..."}
+    GET  /v1/jobs/{id}
+        -> {"id", "status": "running" | "done" | "rejected", "result"?, "error"?}
+
+A job finishes --delay seconds after submission; if it has a callback_url,
+{"id", "status"} is POSTed there (query ?id=&status= as well).
+A filename containing "reject" produces a rejected job.
+
+Usage:
+    python stub_asr_server.py --port 8090 --delay 5
+    ASR_PROVIDER=stub STUB_ASR_URL=http://localhost:8090 ./run-local.sh
+"""
+
+import argparse
+import json
+import threading
+import time
+import urllib.parse
+import urllib.request
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+JOBS = {}
+LOCK = threading.Lock()
+
+UTTERANCES = [
+    (0, "えーと、本日はよろしくお願いします。"),
+    (1, "よろしくお願いします。最近は保育園にも慣れてきました。"),
+    (0, "ご家庭で気になっていることはありますか。"),
+    (1, "言葉が少し遅いのと、切り替えが苦手なところです。"),
+]
+
+
+def build_result(filename: str, size: int) -> dict:
+    utterances = []
+    position = 0.0
+    for speaker, text in UTTERANCES:
+        end = position + len(text) * 0.25
+        utterances.append({
+            "start": round(position, 2),
+            "end": round(end, 2),
+            "confidence": 0.9,
+            "transcript": text,
+            "speaker": speaker,
+        })
+        position = end + 0.5
+    transcription = "".join(text for _, text in UTTERANCES)
+    return {
+        "transcription": transcription,
+        "processing_time": 0.0,
+        "confidence": 0.9,
+        "word_count": len(transcription),
+        "utterances": utterances,
+        "paragraphs": [],
+        "speaker_count": 2,
+        "no_speech_detected": False,
+        "model": f"stub ({filename}, {size} bytes)",
+        "provider": "stub",
+    }
+
+
+def finish_job(job_id: str, delay: float) -> None:
+    time.sleep(delay)
+    with LOCK:
+        job = JOBS[job_id]
+        if 'reject' in job['filename']:
+            job.update(status='rejected', error='rejected by stub')
+        else:
+            job.update(status='done', result=build_result(job['filename'], job['size']))
+        callback_url = job.get('callback_url')
+        status = job['status']
+
+    if callback_url:
+        separator = '&' if '?' in callback_url else '?'
+        url = f"{callback_url}{separator}{urllib.parse.urlencode({'id': job_id, 'status': status})}"
+        request = urllib.request.Request(
+            url,
+            data=json.dumps({'id': job_id, 'status': status}).encode(),
+            headers={'Content-Type': 'application/json'},
+            method='POST'
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                print(f"[StubASR] Callback for {job_id}: {response.status}")
+        except Exception as e:
+            print(f"[StubASR] Callback for {job_id} failed: {e}")
+
+
+class Handler(BaseHTTPRequestHandler):
+    delay = 5.0
+
+    def _send(self, status: int, body: dict) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        parsed = urllib.parse.urlparse(self.path)
+        if parsed.path != '/v1/jobs':
+            return self._send(404, {'error': 'not found'})
+
+        query = dict(urllib.parse.parse_qsl(parsed.query))
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        if not body and not query.get('url'):
+            return self._send(400, {'error': 'audio body or url required'})
+
+        job_id = uuid.uuid4().hex
+        with LOCK:
+            JOBS[job_id] = {
+                'id': job_id,
+                'status': 'running',
+                'filename': query.get('filename', 'audio'),
+                'size': len(body),
+                'callback_url': query.get('callback_url'),
+            }
+        threading.Thread(target=finish_job, args=(job_id, self.delay), daemon=True).start()
+        print(f"[StubASR] Job {job_id} submitted ({'url' if query.get('url') else f'{len(body)} bytes'})")
+        self._send(201, {'id': job_id})
+
+    def do_GET(self):
+        parts = urllib.parse.urlparse(self.path).path.strip('/').split('/')
+        if len(parts) != 3 or parts[:2] != ['v1', 'jobs']:
+            return self._send(404, {'error': 'not found'})
+        with LOCK:
+            job = JOBS.get(parts[2])
+            job = dict(job) if job else None
+        if not job:
+            return self._send(404, {'error': 'job not found'})
+        job.pop('callback_url', None)
+        self._send(200, job)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stub ASR server')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--delay', type=float, default=5.0, help='seconds until a job finishes')
+    args = parser.parse_args()
+
+    Handler.delay = args.delay
+    server = ThreadingHTTPServer(('0.0.0.0', args.port), Handler)
+    print(f"[StubASR] Listening on :{args.port} (jobs finish after {args.delay}s)")
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+import copy
+import os
+import sys
+import threading
+from collections import defaultdict
+
+import pytest
+
+# Tests import the backend modules the way app.py does (services.*)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+
+class FakeResult:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeQuery:
+    """The subset of the PostgREST query builder the services use"""
+
+    def __init__(self, db: 'FakeSupabase', table: str):
+        self.db = db
+        self.table = table
+        self.filters = []
+        self.action = 'select'
+        self.values = None
+        self.one = False
+        self.negate = False
+
+    def select(self, *columns):
+        return self
+
+    def update(self, values):
+        self.action, self.values = 'update', values
+        return self
+
+    def insert(self, values):
+        self.action, self.values = 'insert', values
+        return self
+
+    def upsert(self, values, on_conflict='id'):
+        self.action, self.values = 'upsert', values
+        return self
+
+    def delete(self):
+        self.action = 'delete'
+        return self
+
+    def _filter(self, predicate):
+        negate, self.negate = self.negate, False
+        self.filters.append((lambda row: not predicate(row)) if negate else predicate)
+        return self
+
+    def eq(self, column, value):
+        return self._filter(lambda row: row.get(column) == value)
+
+    def gte(self, column, value):
+        return self._filter(lambda row: row.get(column) is not None and row.get(column) >= value)
+
+    def lt(self, column, value):
+        return self._filter(lambda row: row.get(column) is not None and row.get(column) < value)
+
+    def in_(self, column, values):
+        return self._filter(lambda row: row.get(column) in values)
+
+    def is_(self, column, value):
+        return self._filter(lambda row: row.get(column) is None if value == 'null' else row.get(column) == value)
+
+    @property
+    def not_(self):
+        self.negate = True
+        return self
+
+    def order(self, *args, **kwargs):
+        return self
+
+    def limit(self, count):
+        return self
+
+    def single(self):
+        self.one = True
+        return self
+
+    def execute(self):
+        with self.db.lock:
+            rows = self.db.tables[self.table]
+            if self.action == 'insert':
+                rows.append(copy.deepcopy(self.values))
+                return FakeResult([copy.deepcopy(self.values)])
+            if self.action == 'upsert':
+                match = [row for row in rows if row.get('id') == self.values.get('id')]
+                if match:
+                    match[0].update(copy.deepcopy(self.values))
+                else:
+                    rows.append(copy.deepcopy(self.values))
+                return FakeResult([copy.deepcopy(self.values)])
+
+            matched = [row for row in rows if all(predicate(row) for predicate in self.filters)]
+            if self.action == 'update':
+                for row in matched:
+                    row.update(copy.deepcopy(self.values))
+            elif self.action == 'delete':
+                self.db.tables[self.table] = [row for row in rows if row not in matched]
+            data = copy.deepcopy(matched)
+        if self.one:
+            return FakeResult(data[0] if data else None)
+        return FakeResult(data)
+
+
+class FakeSupabase:
+    """In-memory supabase client: tables are lists of row dicts"""
+
+    def __init__(self):
+        self.tables = defaultdict(list)
+        self.lock = threading.Lock()
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+
+@pytest.fixture
+def supabase():
+    return FakeSupabase()
@@ -0,0 +1,199 @@
+"""
+Async ASR job lifecycle (services/asr_jobs.py) against the local stub ASR server
+
+stub_asr_server.py runs in a thread on a free port; the transcribe job
+submits to it through the stub provider, and ASRJobMonitor finalizes the
+session by polling or callback. Supabase is in memory (conftest.py), SQS
+messages are recorded instead of sent.
+
+Usage (from backend/):
+    python -m pytest tests/test_asr_jobs.py
+"""
+
+import asyncio
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import stub_asr_server
+from services import asr_jobs, background_tasks
+from services.asr_jobs import ASRJobMonitor
+from services.asr_providers.stub_provider import StubASRService
+
+SESSIONS = 'business_interview_sessions'
+SESSION_ID = '3f0c6a52-5a0e-4c55-9d0e-1b8f0f2c7a11'
+SQS_URL = 'https://sqs.example/transcriptions'
+JOB_DELAY = 0.3
+
+
+class FakeS3Client:
+    def head_object(self, Bucket, Key):
+        return {'ETag': '"etag-1"', 'ContentLength': 123456}
+
+    def generate_presigned_url(self, operation, Params, ExpiresIn):
+        return f"https://{Params['Bucket']}.s3.example/{Params['Key']}?X-Amz-Signature=test"
+
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    """Base URL of a stub ASR server whose jobs finish after JOB_DELAY seconds"""
+    monkeypatch.setattr(stub_asr_server.Handler, 'delay', JOB_DELAY)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), stub_asr_server.Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def sqs_messages(monkeypatch):
+    messages = []
+    monkeypatch.setattr(background_tasks, '_send_sqs_message', lambda queue_url, session_id: messages.append(session_id))
+    return messages
+
+
+@pytest.fixture
+def provider(stub_server, monkeypatch):
+    monkeypatch.setenv('STUB_ASR_URL', stub_server)
+    monkeypatch.setattr(asr_jobs, 'ASR_ASYNC_JOBS', True)
+    return StubASRService()
+
+
+def add_session(supabase, s3_path='recordings/f/s/2026-10-17/session.webm'):
+    supabase.tables[SESSIONS].append({
+        'id': SESSION_ID,
+        'status': 'uploaded',
+        's3_audio_path': s3_path,
+        'transcription': None,
+        'asr_job_id': None,
+    })
+    return s3_path
+
+
+def session(supabase):
+    return supabase.tables[SESSIONS][0]
+
+
+async def submit(supabase, provider, s3_path):
+    """Run the transcribe job: with async jobs it only submits and returns"""
+    await background_tasks.atranscribe_background(
+        SESSION_ID, s3_path, FakeS3Client(), 'bucket', supabase, provider, SQS_URL
+    )
+    return session(supabase)['asr_job_id']
+
+
+async def poll_until(monitor, supabase, done, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        await monitor.poll_once()
+        if done(session(supabase)):
+            return
+        await asyncio.sleep(0.1)
+    raise AssertionError(f"session did not reach the expected state: {session(supabase)}")
+
+
+def test_submit_poll_and_finalize_once(supabase, provider, sqs_messages):
+    s3_path = add_session(supabase)
+
+    async def scenario():
+        job_id = await submit(supabase, provider, s3_path)
+        assert job_id
+        assert session(supabase)['status'] == 'transcribing'
+        assert session(supabase)['asr_job_provider'] == 'stub'
+        # Submitted only: nothing finalized, no SQS yet
+        assert sqs_messages == []
+
+        monitor = ASRJobMonitor(supabase, lambda name: provider, SQS_URL)
+        await poll_until(monitor, supabase, lambda row: row['status'] == 'transcribed')
+
+        # Further polls and a late callback for the same job change nothing
+        assert await monitor.poll_once() == 0
+        assert await monitor.handle_callback(SESSION_ID, {'id': job_id, 'status': 'done'}, {}) == 'ignored'
+        await provider.aclose()
+        return monitor
+
+    monitor = asyncio.run(scenario())
+
+    row = session(supabase)
+    assert row['transcription'].startswith('えーと、本日はよろしくお願いします。')
+    assert row['transcription_version']
+    assert row['asr_job_id'] is None
+    assert sqs_messages == [SESSION_ID]
+    assert monitor.stats()['finalized'] == 1
+
+
+def test_stale_and_duplicate_callbacks_are_ignored(supabase, provider, sqs_messages):
+    s3_path = add_session(supabase)
+
+    async def scenario():
+        job_id = await submit(supabase, provider, s3_path)
+        monitor = ASRJobMonitor(supabase, lambda name: provider, SQS_URL)
+
+        # Callback of a superseded job (e.g. a resubmission replaced it)
+        assert await monitor.handle_callback(SESSION_ID, {}, {'id': 'superseded-job'}) == 'stale'
+        assert session(supabase)['status'] == 'transcribing'
+
+        await asyncio.sleep(JOB_DELAY + 0.3)
+        outcomes = await asyncio.gather(
+            monitor.handle_callback(SESSION_ID, {}, {'id': job_id, 'status': 'done'}),
+            monitor.handle_callback(SESSION_ID, {}, {'id': job_id, 'status': 'done'}),
+            monitor.poll_once(),
+        )
+        await provider.aclose()
+        return job_id, outcomes
+
+    job_id, outcomes = asyncio.run(scenario())
+
+    # Exactly one of the racing finalizers wins the compare-and-set on asr_job_id
+    finalized = outcomes[:2].count('finalized') + outcomes[2]
+    assert finalized == 1
+    assert set(outcomes[:2]) <= {'finalized', 'already_finalized', 'ignored'}
+    assert sqs_messages == [SESSION_ID]
+    # A finalizer holding the old job id cannot write again
+    assert background_tasks.finalize_asr_job(supabase, SESSION_ID, job_id, {'transcription': 'x'}, 1.0, SQS_URL) is False
+    assert sqs_messages == [SESSION_ID]
+
+
+def test_rejected_job_fails_the_session(supabase, provider, sqs_messages):
+    s3_path = add_session(supabase, 'recordings/f/s/2026-10-17/reject-me.webm')
+
+    async def scenario():
+        await submit(supabase, provider, s3_path)
+        monitor = ASRJobMonitor(supabase, lambda name: provider, SQS_URL)
+        await poll_until(monitor, supabase, lambda row: row['status'] == 'failed')
+        await provider.aclose()
+        return monitor
+
+    monitor = asyncio.run(scenario())
+
+    row = session(supabase)
+    assert row['asr_job_id'] is None
+    assert 'rejected' in row['error_message']
+    assert row['transcription'] is None
+    assert sqs_messages == []
+    assert monitor.stats()['failed'] == 1
+
+
+def test_job_past_the_timeout_is_failed(supabase, provider, sqs_messages, monkeypatch):
+    monkeypatch.setattr(stub_asr_server.Handler, 'delay', 30.0)
+    s3_path = add_session(supabase)
+
+    async def scenario():
+        job_id = await submit(supabase, provider, s3_path)
+        monitor = ASRJobMonitor(supabase, lambda name: provider, SQS_URL, timeout_seconds=0)
+        await asyncio.sleep(0.05)
+        await monitor.poll_once()
+        await provider.aclose()
+        return job_id, monitor
+
+    job_id, monitor = asyncio.run(scenario())
+
+    row = session(supabase)
+    assert row['status'] == 'failed'
+    assert row['asr_job_id'] is None
+    assert f"ASR job {job_id} did not complete" in row['error_message']
+    assert sqs_messages == []
+    assert monitor.stats()['timed_out'] == 1
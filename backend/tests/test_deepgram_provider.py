@@ -0,0 +1,166 @@
+"""
+Deepgram provider over the SDK's async REST client (services/asr_provider.py)
+
+Deepgram is replaced by an httpx.MockTransport handed to the provider's
+per-loop transport pool, so the real SDK request path runs without network.
+
+Usage (from backend/):
+    python -m pytest tests/test_deepgram_provider.py
+"""
+
+import asyncio
+import io
+import json
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import pytest
+import tenacity
+
+from services import asr_provider
+from services.asr_providers.pool import LoopClientPool
+
+AUDIO = b'\x1a' * (300 * 1024)
+TRANSCRIPT = "本日はよろしくお願いします。"
+
+PRERECORDED_RESPONSE = {
+    "metadata": {
+        "request_id": "req-transcribe",
+        "created": "2026-10-17T00:00:00.000Z",
+        "duration": 3.5,
+        "channels": 1,
+        "models": ["nova-2"],
+    },
+    "results": {
+        "channels": [{
+            "alternatives": [{
+                "transcript": TRANSCRIPT,
+                "confidence": 0.93,
+                "words": [],
+            }],
+        }],
+        "utterances": [{
+            "start": 0.0,
+            "end": 3.5,
+            "confidence": 0.93,
+            "channel": 0,
+            "transcript": TRANSCRIPT,
+            "words": [],
+            "speaker": 0,
+            "id": "u1",
+        }],
+    },
+}
+
+
+class DeepgramStub:
+    """MockTransport handler: answers with the queued statuses, then 200"""
+
+    def __init__(self, statuses=(), body=None):
+        self.statuses = list(statuses)
+        self.body = body or PRERECORDED_RESPONSE
+        self.requests = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        content = await request.aread()
+        self.requests.append({
+            'url': urlparse(str(request.url)),
+            'query': parse_qs(urlparse(str(request.url)).query),
+            'headers': request.headers,
+            'content': content,
+        })
+        status = self.statuses.pop(0) if self.statuses else 200
+        if status != 200:
+            return httpx.Response(status, json={"err_code": "UNAVAILABLE", "err_msg": "try again"})
+        return httpx.Response(200, json=self.body)
+
+
+@pytest.fixture
+def deepgram(monkeypatch):
+    """(service, install) - install(stub) routes the provider's requests to the stub"""
+    monkeypatch.setenv('DEEPGRAM_API_KEY', 'test-key')
+    # No backoff between retry attempts
+    monkeypatch.setattr(asr_provider, 'wait_exponential', lambda **kwargs: tenacity.wait_none())
+    service = asr_provider.DeepgramASRService(model='nova-2')
+
+    def install(stub: DeepgramStub) -> DeepgramStub:
+        service._transports = LoopClientPool(lambda: httpx.MockTransport(stub), lambda transport: transport.aclose())
+        return stub
+
+    return service, install
+
+
+def test_transcribe_audio_retries_503_and_restreams_the_file(deepgram):
+    service, install = deepgram
+    stub = install(DeepgramStub(statuses=[503]))
+
+    result = asyncio.run(service.transcribe_audio(io.BytesIO(AUDIO), 'recording.webm'))
+
+    assert result['transcription'] == TRANSCRIPT
+    assert [request['url'].path for request in stub.requests] == ['/v1/listen', '/v1/listen']
+    # The retry streams the whole file again from position 0
+    assert [request['content'] for request in stub.requests] == [AUDIO, AUDIO]
+    first = stub.requests[0]
+    assert first['headers']['authorization'] == 'Token test-key'
+    assert first['query']['model'] == ['nova-2']
+    assert first['query']['language'] == ['ja']
+    assert first['query']['diarize'] == ['true']
+
+
+def test_client_errors_are_not_retried(deepgram):
+    service, install = deepgram
+    stub = install(DeepgramStub(statuses=[400]))
+
+    with pytest.raises(Exception):
+        asyncio.run(service.transcribe_audio(io.BytesIO(AUDIO), 'recording.webm'))
+
+    assert len(stub.requests) == 1
+
+
+def test_transcribe_url_sends_the_url_source(deepgram):
+    service, install = deepgram
+    stub = install(DeepgramStub())
+    audio_url = 'https://bucket.s3.amazonaws.com/recordings/a.webm?X-Amz-Signature=abc'
+
+    result = asyncio.run(service.transcribe_url(audio_url, 'a.webm'))
+
+    assert result['transcription'] == TRANSCRIPT
+    assert len(stub.requests) == 1
+    assert json.loads(stub.requests[0]['content']) == {'url': audio_url}
+    assert 'callback' not in stub.requests[0]['query']
+
+
+def test_submit_job_with_callback_url(deepgram):
+    service, install = deepgram
+    stub = install(DeepgramStub(statuses=[503], body={'request_id': 'req-callback'}))
+    audio_url = 'https://bucket.s3.amazonaws.com/recordings/a.webm'
+    callback_url = 'https://api.example.com/api/asr/callback/deepgram?session_id=s1'
+
+    request_id = asyncio.run(service.submit_job('a.webm', audio_url=audio_url, callback_url=callback_url))
+
+    assert request_id == 'req-callback'
+    assert len(stub.requests) == 2
+    assert stub.requests[-1]['query']['callback'] == [callback_url]
+    assert json.loads(stub.requests[-1]['content']) == {'url': audio_url}
+
+
+def test_submit_file_job_with_callback_url(deepgram):
+    service, install = deepgram
+    stub = install(DeepgramStub(body={'request_id': 'req-file'}))
+    callback_url = 'https://api.example.com/api/asr/callback/deepgram'
+
+    request_id = asyncio.run(service.submit_job('a.webm', audio_file=io.BytesIO(AUDIO), callback_url=callback_url))
+
+    assert request_id == 'req-file'
+    assert stub.requests[0]['content'] == AUDIO
+    assert stub.requests[0]['query']['callback'] == [callback_url]
+
+
+def test_submit_job_requires_a_callback_url(deepgram):
+    service, install = deepgram
+    stub = install(DeepgramStub())
+
+    with pytest.raises(ValueError):
+        asyncio.run(service.submit_job('a.webm', audio_url='https://bucket.s3.amazonaws.com/a.webm'))
+
+    assert stub.requests == []
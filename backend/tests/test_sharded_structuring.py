@@ -0,0 +1,102 @@
+"""
+Phase 2 sharded annotation (services/sharded_structuring.py) through aexecute_llm_phase
+
+The LLM is a scripted stand-in: shard calls (agenerate) echo one annotated
+item per input fact unless told to drop one, and the single call (astream)
+returns a fixed result. Supabase is in memory (conftest.py).
+
+Usage (from backend/):
+    python -m pytest tests/test_sharded_structuring.py
+"""
+
+import asyncio
+import json
+import re
+
+from services.llm_pipeline import aexecute_llm_phase
+from services.prompts import build_fact_structuring_prompt
+from services.sharded_structuring import PHASE2_SHARD_MIN_FACTS, arun_sharded_structuring
+
+SESSIONS = 'business_interview_sessions'
+SESSION_ID = '8d2b1f7e-0c3a-4f5e-9a61-2e7c4b9d0f33'
+SINGLE_CALL_RESULT = {'annotated_facts_v1': {'child_profile': None, 'annotated_items': [], 'single_call': True}}
+
+
+class ScriptedLLM:
+    """Shard calls answer 1:1 except in shards containing `short_fact`"""
+
+    model_name = 'scripted'
+
+    def __init__(self, short_fact=None):
+        self.short_fact = short_fact
+        self.shard_calls = 0
+        self.single_calls = 0
+
+    async def agenerate(self, prompt: str) -> str:
+        self.shard_calls += 1
+        facts = re.findall(r'fact-\d+', prompt)
+        if self.short_fact in facts:
+            facts = facts[:-1]
+        items = [{'original_fact': fact} for fact in dict.fromkeys(facts)]
+        return json.dumps({'annotated_facts_v1': {'child_profile': None, 'annotated_items': items}})
+
+    async def astream(self, prompt: str):
+        self.single_calls += 1
+        yield json.dumps(SINGLE_CALL_RESULT)
+
+
+def add_session(supabase):
+    facts = iter(range(PHASE2_SHARD_MIN_FACTS * 2))
+    extraction_v1 = {
+        category: [{'fact': f"fact-{next(facts)}"} for _ in range(PHASE2_SHARD_MIN_FACTS // 2)]
+        for category in ('current_state', 'strengths', 'challenges')
+    }
+    row = {'id': SESSION_ID, 'fact_extraction_result_v1': {'extraction_v1': extraction_v1}}
+    supabase.tables[SESSIONS].append(row)
+    return row
+
+
+def run_phase2(supabase, llm):
+    return asyncio.run(aexecute_llm_phase(
+        session_id=SESSION_ID,
+        supabase=supabase,
+        llm_service=llm,
+        phase_name='fact_structuring',
+        prompt_builder=build_fact_structuring_prompt,
+        input_selector='fact_extraction_result_v1',
+        output_column='fact_structuring_result_v1',
+        prompt_column='fact_structuring_prompt_v1',
+        parallel_runner=arun_sharded_structuring
+    ))
+
+
+def test_matching_shards_are_reassembled(supabase):
+    add_session(supabase)
+    llm = ScriptedLLM()
+
+    result = run_phase2(supabase, llm)
+
+    items = result['annotated_facts_v1']['annotated_items']
+    assert [item['original_fact'] for item in items] == [f"fact-{i}" for i in range(len(items))]
+    assert len(items) == (PHASE2_SHARD_MIN_FACTS // 2) * 3
+    assert llm.single_calls == 0
+    notes = supabase.tables['business_phase_progress'][0]['notes']
+    assert notes['sharding']['items'] == len(items)
+
+
+def test_mismatch_after_retry_falls_back_to_single_call(supabase):
+    add_session(supabase)
+    llm = ScriptedLLM(short_fact='fact-0')
+
+    result = run_phase2(supabase, llm)
+
+    # The shard missing an item is not kept; the whole phase runs as one call
+    assert result == SINGLE_CALL_RESULT
+    assert llm.single_calls == 1
+    assert supabase.tables[SESSIONS][0]['fact_structuring_result_v1'] == SINGLE_CALL_RESULT
+
+    progress = supabase.tables['business_phase_progress'][0]
+    assert progress['status'] == 'completed'
+    assert progress['notes']['sharding']['fallback'] == 'single_call'
+    mismatch = progress['notes']['sharding']['mismatch']
+    assert mismatch['expected'] == mismatch['actual'] + 1
@@ -31,6 +31,18 @@ export interface InterviewSession {
   model_used_phase3?: string | null;
 }
 
+// Lightweight status (GET /api/sessions/{id}/status): versions change on every result write
+export type SessionResultPhase = 'transcription' | 'fact_extraction' | 'fact_structuring' | 'assessment';
+
+export interface SessionStatus {
+  session_id: string;
+  status: InterviewSession['status'];
+  error_message?: string | null;
+  updated_at: string;
+  versions: Record<SessionResultPhase, string | null>;
+  models: { phase1: string | null; phase2: string | null; phase3: string | null };
+}
+
 export interface SessionsResponse {
   sessions: InterviewSession[];
   count: number;
@@ -364,6 +376,14 @@ export const api = {
   getSession: (sessionId: string) =>
     apiRequest<InterviewSession>(`/api/sessions/${sessionId}`),
 
+  getSessionStatus: (sessionId: string) =>
+    apiRequest<SessionStatus>(`/api/sessions/${sessionId}/status`),
+
+  // Server-Sent Events: snapshot / status / phase_* transitions of one session
+  // (EventSource cannot send headers, so the token goes in the query string)
+  openSessionEvents: (sessionId: string) =>
+    new EventSource(`${API_BASE_URL}/api/sessions/${sessionId}/events?token=${encodeURIComponent(API_TOKEN)}`),
+
   getSessionAudioUrl: (sessionId: string, download = false) =>
     apiRequest<AudioUrlResponse>(`/api/sessions/${sessionId}/audio-url?download=${download ? '1' : '0'}`),
 
@@ -29,10 +29,21 @@ interface TranscriptMessage {
 }
 
 const REALTIME_CHUNK_MS = 2500;
+// Realtime chunks are sent in addition to the recording itself (they are standalone files, not
+// parts of it); transcription needs no more than 16 kHz mono, so they use a low Opus bitrate
+const REALTIME_AUDIO_BITS_PER_SECOND = 24000;
 const MAX_CHUNKS_PER_MESSAGE = 4;
 const SENTENCE_END_PATTERN = /[。！？!?]$/;
 const MIN_MEANINGFUL_TEXT_LENGTH = 3;
 const DUPLICATE_CHUNK_DISTANCE = 3;
+// How long the upload waits for the server to store the realtime transcript draft
+const REALTIME_FINISH_TIMEOUT_MS = 15000;
+// The full recording streams to S3 in slices while recording (no second upload at the end)
+const RECORDING_SLICE_MS = 1000;
+const RECORDING_STORE_TIMEOUT_MS = 30000;
+
+const getApiUrl = () => import.meta.env.VITE_API_BASE_URL || 'http://localhost:8052';
+const getApiToken = () => import.meta.env.VITE_API_TOKEN || 'watchme-b2b-poc-2025';
 
 const RecordingSession: React.FC<RecordingSessionProps> = ({ childName, childAvatar, subjectId, supportPlanId, attendees, subjectDetail, onClose, onUploadComplete }) => {
   const { profile } = useAuth();
@@ -63,10 +74,65 @@ const RecordingSession: React.FC<RecordingSessionProps> = ({ childName, childAva
   const lastCommittedMessageTextRef = useRef('');
   const lastCommittedChunkIndexRef = useRef(-1);
   const inFlightChunkRequestsRef = useRef(0);
+  // Realtime WebSocket: chunk indexes awaiting a transcript (server answers in send order)
+  const realtimeSocketRef = useRef<WebSocket | null>(null);
+  const socketSentChunksRef = useRef<{ chunk: Blob; chunkIndex: number }[]>([]);
+  const socketQueuedChunksRef = useRef<{ chunk: Blob; chunkIndex: number }[]>([]);
+  const socketPausedRef = useRef(false);
+  // Realtime transcript draft: stored by the server on "end", lets the upload start analysis at once
+  const draftIdRef = useRef<string | null>(null);
+  const realtimeFinishingRef = useRef(false);
+  const realtimeDraftReadyRef = useRef<Promise<boolean> | null>(null);
+  const realtimeDraftResolveRef = useRef<((saved: boolean) => void) | null>(null);
+  // Recording stream (/ws/recordings/stream): slices of the full recording, finalized instead of uploaded
+  const recordingSocketRef = useRef<WebSocket | null>(null);
+  const recordingPendingSlicesRef = useRef<Blob[]>([]);
+  const recordingFinishingRef = useRef(false);
+  const recordingStoredRef = useRef<Promise<boolean> | null>(null);
+  const recordingStoredResolveRef = useRef<((stored: boolean) => void) | null>(null);
   const isMountedRef = useRef(true);
   const isRecordingActiveRef = useRef(false);
 
+  const resolveRealtimeDraft = (saved: boolean) => {
+    realtimeDraftResolveRef.current?.(saved);
+    realtimeDraftResolveRef.current = null;
+  };
+
+  const closeRealtimeSocket = () => {
+    // A finishing socket is closed by the server once the draft is stored
+    if (realtimeFinishingRef.current) return;
+    const socket = realtimeSocketRef.current;
+    realtimeSocketRef.current = null;
+    if (socket && socket.readyState === WebSocket.OPEN) {
+      socket.send(JSON.stringify({ type: 'end' }));
+      socket.close();
+    } else if (socket && socket.readyState === WebSocket.CONNECTING) {
+      socket.close();
+    }
+    socketSentChunksRef.current = [];
+    socketQueuedChunksRef.current = [];
+    socketPausedRef.current = false;
+  };
+
+  const resolveRecordingStored = (stored: boolean) => {
+    recordingStoredResolveRef.current?.(stored);
+    recordingStoredResolveRef.current = null;
+  };
+
+  const closeRecordingSocket = () => {
+    // A finishing stream is closed by the server once the recording is stored
+    if (recordingFinishingRef.current) return;
+    const socket = recordingSocketRef.current;
+    recordingSocketRef.current = null;
+    recordingPendingSlicesRef.current = [];
+    if (socket && socket.readyState !== WebSocket.CLOSED) {
+      socket.close();
+    }
+  };
+
   const stopMediaResources = () => {
+    closeRealtimeSocket();
+    closeRecordingSocket();
     if (realtimeChunkTimerRef.current) {
       clearTimeout(realtimeChunkTimerRef.current);
       realtimeChunkTimerRef.current = null;
@@ -270,27 +336,218 @@ const RecordingSession: React.FC<RecordingSessionProps> = ({ childName, childAva
     }
   };
 
-  const transcribeChunk = async (chunk: Blob, chunkIndex: number) => {
-    if (chunk.size === 0) return;
+  const updateInFlightChunks = (delta: number) => {
+    inFlightChunkRequestsRef.current = Math.max(0, inFlightChunkRequestsRef.current + delta);
+    if (isMountedRef.current) {
+      setIsRealtimeTranscribing(inFlightChunkRequestsRef.current > 0);
+    }
+  };
+
+  const sendChunkOverSocket = (socket: WebSocket, chunk: Blob, chunkIndex: number) => {
+    socketSentChunksRef.current.push({ chunk, chunkIndex });
+    updateInFlightChunks(1);
+    socket.send(chunk);
+  };
+
+  const openRealtimeSocket = () => {
+    const draftParam = draftIdRef.current ? `&draft_id=${draftIdRef.current}` : '';
+    const wsUrl = `${getApiUrl().replace(/^http/, 'ws')}/ws/transcribe/realtime?token=${encodeURIComponent(getApiToken())}&language=ja${draftParam}`;
+    let socket: WebSocket;
+    try {
+      socket = new WebSocket(wsUrl);
+    } catch (error) {
+      console.error('Realtime socket error:', error);
+      return;
+    }
+    realtimeSocketRef.current = socket;
+    realtimeDraftReadyRef.current = new Promise<boolean>((resolve) => {
+      realtimeDraftResolveRef.current = resolve;
+    });
+
+    socket.onmessage = (event) => {
+      let data: any;
+      try {
+        data = JSON.parse(event.data);
+      } catch {
+        return;
+      }
+      if (data.type === 'transcript') {
+        const sent = socketSentChunksRef.current.shift();
+        if (sent === undefined) return;
+        updateInFlightChunks(-1);
+        pendingChunkTextsRef.current.set(sent.chunkIndex, typeof data.text === 'string' ? data.text : '');
+        flushPendingChunks();
+      } else if (data.type === 'backpressure') {
+        // Server has enough chunks in flight: hold new ones until it resumes reading
+        socketPausedRef.current = Boolean(data.paused);
+        while (!socketPausedRef.current && socketQueuedChunksRef.current.length > 0) {
+          const queued = socketQueuedChunksRef.current.shift()!;
+          sendChunkOverSocket(socket, queued.chunk, queued.chunkIndex);
+        }
+      } else if (data.type === 'done') {
+        resolveRealtimeDraft(Boolean(data.draft_saved));
+      }
+    };
+
+    socket.onclose = () => {
+      resolveRealtimeDraft(false);
+      if (realtimeSocketRef.current === socket) {
+        realtimeSocketRef.current = null;
+        realtimeFinishingRef.current = false;
+      }
+      // Chunks the socket did not answer go over HTTP instead
+      const unanswered = socketSentChunksRef.current;
+      socketSentChunksRef.current = [];
+      updateInFlightChunks(-unanswered.length);
+      const pending = [...unanswered, ...socketQueuedChunksRef.current];
+      socketQueuedChunksRef.current = [];
+      socketPausedRef.current = false;
+      if (isRecordingActiveRef.current) {
+        pending.forEach(({ chunk, chunkIndex }) => void transcribeChunkOverHttp(chunk, chunkIndex));
+      }
+    };
+  };
+
+  // Recording stopped: send the remaining chunks, then "end" (the server stores the draft and closes)
+  const finishRealtimeSocket = () => {
+    const socket = realtimeSocketRef.current;
+    if (!socket || socket.readyState !== WebSocket.OPEN) {
+      realtimeFinishingRef.current = false;
+      resolveRealtimeDraft(false);
+      closeRealtimeSocket();
+      return;
+    }
+    socketQueuedChunksRef.current.splice(0).forEach(({ chunk, chunkIndex }) => {
+      sendChunkOverSocket(socket, chunk, chunkIndex);
+    });
+    socket.send(JSON.stringify({ type: 'end' }));
+    window.setTimeout(() => {
+      if (socket.readyState === WebSocket.OPEN) {
+        socket.close();
+      }
+    }, REALTIME_FINISH_TIMEOUT_MS);
+  };
+
+  const waitForRealtimeDraft = (): Promise<boolean> => {
+    const ready = realtimeDraftReadyRef.current;
+    if (!ready) return Promise.resolve(false);
+    return Promise.race([
+      ready,
+      new Promise<boolean>((resolve) => window.setTimeout(() => resolve(false), REALTIME_FINISH_TIMEOUT_MS))
+    ]);
+  };
+
+  const openRecordingSocket = (mimeType?: string) => {
+    const draftId = draftIdRef.current;
+    const facilityId = profile?.facility_id || '00000000-0000-0000-0000-000000000001';
+    if (!draftId) return;
+    const contentType = (mimeType || 'audio/webm').split(';')[0];
+    const params = new URLSearchParams({
+      token: getApiToken(),
+      draft_id: draftId,
+      facility_id: facilityId,
+      subject_id: subjectId,
+      content_type: contentType
+    });
+    let socket: WebSocket;
+    try {
+      socket = new WebSocket(`${getApiUrl().replace(/^http/, 'ws')}/ws/recordings/stream?${params.toString()}`);
+    } catch (error) {
+      console.error('Recording stream error:', error);
+      return;
+    }
+    recordingSocketRef.current = socket;
+    recordingStoredRef.current = new Promise<boolean>((resolve) => {
+      recordingStoredResolveRef.current = resolve;
+    });
+
+    socket.onopen = () => {
+      recordingPendingSlicesRef.current.splice(0).forEach((slice) => socket.send(slice));
+    };
+
+    socket.onmessage = (event) => {
+      let data: any;
+      try {
+        data = JSON.parse(event.data);
+      } catch {
+        return;
+      }
+      if (data.type === 'stored') {
+        resolveRecordingStored(true);
+      } else if (data.type === 'error') {
+        console.error('Recording stream failed:', data.message);
+      }
+    };
+
+    socket.onclose = () => {
+      // Not stored: the recording kept locally is uploaded instead
+      resolveRecordingStored(false);
+      if (recordingSocketRef.current === socket) {
+        recordingSocketRef.current = null;
+        recordingFinishingRef.current = false;
+        recordingPendingSlicesRef.current = [];
+      }
+    };
+  };
+
+  const sendRecordingSlice = (slice: Blob) => {
+    const socket = recordingSocketRef.current;
+    if (!socket) return;
+    if (socket.readyState === WebSocket.OPEN) {
+      socket.send(slice);
+    } else if (socket.readyState === WebSocket.CONNECTING) {
+      recordingPendingSlicesRef.current.push(slice);
+    }
+  };
+
+  // Recording stopped (all slices sent): "end" makes the server upload the last part and store the upload
+  const finishRecordingSocket = (): Promise<boolean> => {
+    const socket = recordingSocketRef.current;
+    const stored = recordingStoredRef.current;
+    if (!recordingFinishingRef.current || !socket || socket.readyState !== WebSocket.OPEN || !stored) {
+      recordingFinishingRef.current = false;
+      closeRecordingSocket();
+      return Promise.resolve(false);
+    }
+    socket.send(JSON.stringify({ type: 'end' }));
+    return Promise.race([
+      stored,
+      new Promise<boolean>((resolve) => window.setTimeout(() => resolve(false), RECORDING_STORE_TIMEOUT_MS))
+    ]);
+  };
+
+  const transcribeChunk = (chunk: Blob, chunkIndex: number) => {
+    if (chunk.size === 0) {
+      pendingChunkTextsRef.current.set(chunkIndex, '');
+      flushPendingChunks();
+      return;
+    }
+
+    const socket = realtimeSocketRef.current;
+    if (socket && socket.readyState === WebSocket.OPEN) {
+      if (socketPausedRef.current) {
+        socketQueuedChunksRef.current.push({ chunk, chunkIndex });
+      } else {
+        sendChunkOverSocket(socket, chunk, chunkIndex);
+      }
+      return;
+    }
+    void transcribeChunkOverHttp(chunk, chunkIndex);
+  };
 
+  const transcribeChunkOverHttp = async (chunk: Blob, chunkIndex: number) => {
     const formData = new FormData();
     formData.append('audio', chunk, `chunk-${chunkIndex}.webm`);
     formData.append('language', 'ja');
     formData.append('chunk_index', String(chunkIndex));
 
-    const API_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8052';
-    const API_TOKEN = import.meta.env.VITE_API_TOKEN || 'watchme-b2b-poc-2025';
-
-    inFlightChunkRequestsRef.current += 1;
-    if (isMountedRef.current) {
-      setIsRealtimeTranscribing(true);
-    }
+    updateInFlightChunks(1);
 
     try {
-      const response = await fetch(`${API_URL}/api/transcribe/realtime`, {
+      const response = await fetch(`${getApiUrl()}/api/transcribe/realtime`, {
         method: 'POST',
         headers: {
-          'X-API-Token': API_TOKEN
+          'X-API-Token': getApiToken()
         },
         body: formData
       });
@@ -308,10 +565,7 @@ const RecordingSession: React.FC<RecordingSessionProps> = ({ childName, childAva
       pendingChunkTextsRef.current.set(chunkIndex, '');
       flushPendingChunks();
     } finally {
-      inFlightChunkRequestsRef.current = Math.max(0, inFlightChunkRequestsRef.current - 1);
-      if (isMountedRef.current) {
-        setIsRealtimeTranscribing(inFlightChunkRequestsRef.current > 0);
-      }
+      updateInFlightChunks(-1);
     }
   };
 
@@ -333,7 +587,10 @@ const RecordingSession: React.FC<RecordingSessionProps> = ({ childName, childAva
   const startRealtimeRecorderLoop = (stream: MediaStream, mimeType?: string) => {
     if (!isRecordingActiveRef.current) return;
 
-    const realtimeRecorder = mimeType ? new MediaRecorder(stream, { mimeType }) : new MediaRecorder(stream);
+    const realtimeRecorder = new MediaRecorder(stream, {
+      ...(mimeType ? { mimeType } : {}),
+      audioBitsPerSecond: REALTIME_AUDIO_BITS_PER_SECOND,
+    });
     realtimeRecorderRef.current = realtimeRecorder;
     const realtimeChunks: Blob[] = [];
 
@@ -347,11 +604,13 @@ const RecordingSession: React.FC<RecordingSessionProps> = ({ childName, childAva
       if (realtimeChunks.length > 0) {
         const chunkBlob = new Blob(realtimeChunks, { type: realtimeRecorder.mimeType || mimeType || 'audio/webm' });
         const chunkIndex = chunkIndexRef.current++;
-        void transcribeChunk(chunkBlob, chunkIndex);
+        transcribeChunk(chunkBlob, chunkIndex);
       }
 
       if (isRecordingActiveRef.current) {
         startRealtimeRecorderLoop(stream, mimeType);
+      } else if (realtimeFinishingRef.current) {
+        finishRealtimeSocket();
       }
     };
 
@@ -388,6 +647,7 @@ const RecordingSession: React.FC<RecordingSessionProps> = ({ childName, childAva
         lastCommittedChunkIndexRef.current = -1;
         messageIdRef.current = 1;
         isRecordingActiveRef.current = true;
+        draftIdRef.current = typeof crypto !== 'undefined' && 'randomUUID' in crypto ? crypto.randomUUID() : null;
 
         // Audio level visualization
         const audioContext = new (window.AudioContext || (window as any).webkitAudioContext)();
@@ -411,20 +671,25 @@ const RecordingSession: React.FC<RecordingSessionProps> = ({ childName, childAva
 
         mediaRecorder.ondataavailable = (event) => {
           if (event.data.size > 0) {
+            // Kept locally as well: uploaded in one piece if the stream does not get stored
             chunksRef.current.push(event.data);
+            sendRecordingSlice(event.data);
           }
         };
 
         mediaRecorder.onstop = async () => {
           const blob = new Blob(chunksRef.current, { type: 'audio/webm' });
+          const recordingStored = finishRecordingSocket();
 
           // Ensure microphone and audio resources are fully released
           stopMediaResources();
 
-          await uploadAudio(blob);
+          await saveRecording(blob, recordingStored);
         };
 
-        mediaRecorder.start();
+        openRecordingSocket(mimeType);
+        mediaRecorder.start(RECORDING_SLICE_MS);
+        openRealtimeSocket();
         startRealtimeRecorderLoop(stream, mimeType);
         setIsRecording(true);
       } catch (error) {
@@ -462,7 +727,47 @@ const RecordingSession: React.FC<RecordingSessionProps> = ({ childName, childAva
     transcriptEndRef.current?.scrollIntoView({ behavior: 'smooth' });
   }, [transcript]);
 
-  const uploadAudio = async (blob: Blob) => {
+  const saveRecording = async (blob: Blob, recordingStored: Promise<boolean>) => {
+    const [stored, draftSaved] = await Promise.all([recordingStored, waitForRealtimeDraft()]);
+    if (stored && draftIdRef.current && await finalizeStreamedRecording(draftIdRef.current)) {
+      return;
+    }
+    await uploadAudio(blob, draftSaved);
+  };
+
+  // Recording already in S3: create the session without uploading it again
+  const finalizeStreamedRecording = async (draftId: string): Promise<boolean> => {
+    try {
+      const response = await fetch(`${getApiUrl()}/api/recordings/finalize`, {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+          'X-API-Token': getApiToken()
+        },
+        body: JSON.stringify({
+          draft_id: draftId,
+          facility_id: profile?.facility_id || '00000000-0000-0000-0000-000000000001',
+          subject_id: subjectId,
+          support_plan_id: supportPlanId || null,
+          staff_id: profile?.user_id || null,
+          attendees: attendees || null,
+          duration_seconds: recordingTimeRef.current
+        })
+      });
+      if (!response.ok) {
+        throw new Error(`Finalize failed: ${response.status}`);
+      }
+      const data = await response.json();
+      console.log('Recording finalized:', data);
+      onUploadComplete(data.session_id);
+      return true;
+    } catch (error) {
+      console.error('Finalize error, uploading the recording instead:', error);
+      return false;
+    }
+  };
+
+  const uploadAudio = async (blob: Blob, draftSaved: boolean) => {
     const formData = new FormData();
     formData.append('audio', blob, 'recording.webm');
     formData.append('facility_id', profile?.facility_id || '00000000-0000-0000-0000-000000000001');
@@ -478,6 +783,10 @@ const RecordingSession: React.FC<RecordingSessionProps> = ({ childName, childAva
     if (profile?.user_id) {
       formData.append('staff_id', profile.user_id);
     }
+    // Complete realtime transcript on the server: the session starts analysis without waiting for batch ASR
+    if (draftSaved && draftIdRef.current) {
+      formData.append('draft_id', draftIdRef.current);
+    }
 
     try {
       const API_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8052';
@@ -511,11 +820,17 @@ const RecordingSession: React.FC<RecordingSessionProps> = ({ childName, childAva
       clearTimeout(realtimeChunkTimerRef.current);
       realtimeChunkTimerRef.current = null;
     }
+    // The realtime recorder's onstop sends the last chunk, then finishes the socket
+    realtimeFinishingRef.current = realtimeSocketRef.current !== null;
     if (realtimeRecorderRef.current && realtimeRecorderRef.current.state !== 'inactive') {
       realtimeRecorderRef.current.stop();
+    } else if (realtimeFinishingRef.current) {
+      finishRealtimeSocket();
     }
 
     if (mediaRecorderRef.current && mediaRecorderRef.current.state !== 'inactive') {
+      // mediaRecorder.onstop finishes the recording stream (after the last slice)
+      recordingFinishingRef.current = recordingSocketRef.current !== null;
       mediaRecorderRef.current.stop();
       setIsRecording(false);
       setIsRealtimeTranscribing(false);
@@ -6,7 +6,7 @@ import Phase2Display from '../components/Phase2Display';
 import Phase3Display from '../components/Phase3Display';
 import EditableField from '../components/EditableField';
 import EditableTableRow, { type SupportItem } from '../components/EditableTableRow';
-import { api, type InterviewSession, type SupportPlan, type SupportPlanUpdate, type LlmModelCatalog, type Subject, type User } from '../api/client';
+import { api, type InterviewSession, type SessionResultPhase, type SupportPlan, type SupportPlanUpdate, type LlmModelCatalog, type Subject, type User } from '../api/client';
 import { useAuth } from '../contexts/AuthContext';
 import { calculateAge } from '../utils/date';
 import './SupportPlanCreate.css';
@@ -289,8 +289,11 @@ const SupportPlanCreate: React.FC<SupportPlanCreateProps> = ({ initialSubjectId,
     }
   }, [selectedPlan?.id]); // Only depend on ID to prevent infinite loop
 
-  // Polling: auto-refresh when any session is in a processing state
+  // Auto-refresh when any session is in a processing state:
+  // SSE push from the backend, falling back to polling if the stream is unavailable
   const pollingRef = useRef<ReturnType<typeof setInterval> | null>(null);
+  const sessionEventsRef = useRef<{ sessionId: string; source: EventSource } | null>(null);
+  const sessionEventsUnavailableRef = useRef(false);
   const recordingToastTimerRef = useRef<ReturnType<typeof setTimeout> | null>(null);
   const manualToastTimerRef = useRef<ReturnType<typeof setTimeout> | null>(null);
   const lastAutoProcessingSessionIdRef = useRef<string | null>(null);
@@ -301,6 +304,46 @@ const SupportPlanCreate: React.FC<SupportPlanCreateProps> = ({ initialSubjectId,
     return !terminalStates.includes(status);
   };
 
+  const closeSessionEvents = () => {
+    if (sessionEventsRef.current) {
+      sessionEventsRef.current.source.close();
+      sessionEventsRef.current = null;
+    }
+  };
+
+  const startPolling = () => {
+    // Fallback: poll every 5 seconds
+    if (!pollingRef.current) {
+      pollingRef.current = setInterval(async () => {
+        try {
+          await fetchSupportPlans({ silent: true });
+        } catch (err) {
+          console.error('Polling error:', err);
+        }
+      }, 5000);
+    }
+  };
+
+  const openSessionEvents = (sessionId: string) => {
+    closeSessionEvents();
+    const source = api.openSessionEvents(sessionId);
+    const refresh = () => {
+      fetchSupportPlans({ silent: true }).catch(err => console.error('Refresh error:', err));
+    };
+    ['snapshot', 'status', 'phase_completed', 'phase_failed'].forEach(type => source.addEventListener(type, refresh));
+    source.onerror = () => {
+      // CONNECTING = browser retries with Last-Event-ID; CLOSED = give up and poll
+      if (source.readyState === EventSource.CLOSED) {
+        sessionEventsUnavailableRef.current = true;
+        closeSessionEvents();
+        startPolling();
+      }
+    };
+    sessionEventsRef.current = { sessionId, source };
+  };
+
+  useEffect(() => () => closeSessionEvents(), []);
+
   useEffect(() => {
     const hasInProgressSession = supportPlans.some(plan =>
       plan.sessions?.some(s => s.status && isSessionProcessing(s.status))
@@ -314,18 +357,16 @@ const SupportPlanCreate: React.FC<SupportPlanCreateProps> = ({ initialSubjectId,
       if (processingSessionId) {
         lastAutoProcessingSessionIdRef.current = processingSessionId;
       }
-      // Start polling every 5 seconds
-      if (!pollingRef.current) {
-        pollingRef.current = setInterval(async () => {
-          try {
-            await fetchSupportPlans({ silent: true });
-          } catch (err) {
-            console.error('Polling error:', err);
-          }
-        }, 5000);
+      if (processingSessionId && typeof EventSource !== 'undefined' && !sessionEventsUnavailableRef.current) {
+        if (sessionEventsRef.current?.sessionId !== processingSessionId) {
+          openSessionEvents(processingSessionId);
+        }
+      } else {
+        startPolling();
       }
     } else {
-      // Stop polling when no sessions are in progress
+      // Stop listening when no sessions are in progress
+      closeSessionEvents();
       if (pollingRef.current) {
         clearInterval(pollingRef.current);
         pollingRef.current = null;
@@ -572,58 +613,33 @@ const SupportPlanCreate: React.FC<SupportPlanCreateProps> = ({ initialSubjectId,
 
   // ===== Re-analysis handlers =====
 
+  // Poll the lightweight status endpoint until the version of `phase` changes
+  // (versions change on every result write, so no result payload is downloaded)
   const pollSessionField = async (
     sessionId: string,
-    field: string,
-    previousUpdatedAt?: string,
-    previousFieldValue?: unknown,
+    phase: SessionResultPhase,
+    previousVersion?: string | null,
     options?: { timeoutMs?: number; intervalMs?: number; label?: string }
   ): Promise<boolean> => {
     const timeoutMs = options?.timeoutMs ?? 60_000;
     const intervalMs = options?.intervalMs ?? 1_000;
-    const label = options?.label ?? field;
+    const label = options?.label ?? phase;
     const startedAt = Date.now();
 
-    const stringifyValue = (value: unknown): string | null => {
-      if (value === null || value === undefined) return null;
-      if (typeof value === 'string') return value;
-      try {
-        return JSON.stringify(value);
-      } catch {
-        return String(value);
-      }
-    };
-
-    const previousFieldSerialized = stringifyValue(previousFieldValue);
-
     while (Date.now() - startedAt < timeoutMs) {
       await new Promise(resolve => setTimeout(resolve, intervalMs));
 
       try {
-        const session = await api.getSession(sessionId);
-        if (session.status === 'error' || session.status === 'failed') {
-          throw new Error(session.error_message || 'Processing failed');
+        const status = await api.getSessionStatus(sessionId);
+        if (status.status === 'error' || status.status === 'failed') {
+          throw new Error(status.error_message || 'Processing failed');
         }
         // Detect spot execution errors (status stays completed but error_message is set)
-        if (session.error_message && session.error_message.includes('Spot analysis failed')) {
-          throw new Error(session.error_message);
+        if (status.error_message && status.error_message.includes('Spot analysis failed')) {
+          throw new Error(status.error_message);
         }
-        const value = (session as unknown as Record<string, unknown>)[field];
-        if (value !== null && value !== undefined) {
-          // If we have a previous updated_at, wait until it actually changes
-          if (previousUpdatedAt && session.updated_at === previousUpdatedAt) {
-            // Data exists but hasn't been updated yet - keep waiting
-            continue;
-          }
-
-          // If previous value exists, ensure this field itself changed (not just status/updated_at)
-          if (previousFieldSerialized !== null) {
-            const currentFieldSerialized = stringifyValue(value);
-            if (currentFieldSerialized === previousFieldSerialized) {
-              continue;
-            }
-          }
-
+        const version = status.versions[phase];
+        if (version && version !== (previousVersion ?? null)) {
           return true;
         }
       } catch (err) {
@@ -656,38 +672,26 @@ const SupportPlanCreate: React.FC<SupportPlanCreateProps> = ({ initialSubjectId,
     const modelLabel = `${modelConfig.provider}/${modelConfig.model}`;
 
     try {
-      // Get current updated_at before starting
-      const currentSession = await api.getSession(sessionId);
-      let previousUpdatedAt = currentSession.updated_at;
-      const previousPhase1Value = (currentSession as unknown as Record<string, unknown>).fact_extraction_result_v1;
+      // Get current result versions before starting
+      const currentStatus = await api.getSessionStatus(sessionId);
 
       // Phase 1: Fact Extraction
       setReanalysisPhase(prev => ({ ...prev, [sessionId]: '事実抽出中' }));
       showManualToast({ kind: 'loading', message: '事実抽出中' }, null);
       await api.triggerPhase1(sessionId, false, modelConfig.provider, modelConfig.model, undefined, false);
-      await pollSessionField(sessionId, 'fact_extraction_result_v1', previousUpdatedAt, previousPhase1Value, { timeoutMs: 180_000, label: '事実抽出' });
-
-      // Update previousUpdatedAt for Phase 2
-      const afterPhase1 = await api.getSession(sessionId);
-      previousUpdatedAt = afterPhase1.updated_at;
-      const previousPhase2Value = (afterPhase1 as unknown as Record<string, unknown>).fact_structuring_result_v1;
+      await pollSessionField(sessionId, 'fact_extraction', currentStatus.versions.fact_extraction, { timeoutMs: 180_000, label: '事実抽出' });
 
       // Phase 2: Fact Structuring
       setReanalysisPhase(prev => ({ ...prev, [sessionId]: '事実整理中' }));
       showManualToast({ kind: 'loading', message: '事実整理中' }, null);
       await api.triggerPhase2(sessionId, false, modelConfig.provider, modelConfig.model);
-      await pollSessionField(sessionId, 'fact_structuring_result_v1', previousUpdatedAt, previousPhase2Value, { timeoutMs: 180_000, label: '事実整理' });
-
-      // Update previousUpdatedAt for Phase 3
-      const afterPhase2 = await api.getSession(sessionId);
-      previousUpdatedAt = afterPhase2.updated_at;
-      const previousPhase3Value = (afterPhase2 as unknown as Record<string, unknown>).assessment_result_v1;
+      await pollSessionField(sessionId, 'fact_structuring', currentStatus.versions.fact_structuring, { timeoutMs: 180_000, label: '事実整理' });
 
       // Phase 3: Assessment
       setReanalysisPhase(prev => ({ ...prev, [sessionId]: '個別支援計画生成中' }));
       showManualToast({ kind: 'loading', message: '個別支援計画生成中' }, null);
       await api.triggerPhase3(sessionId, false, modelConfig.provider, modelConfig.model);
-      await pollSessionField(sessionId, 'assessment_result_v1', previousUpdatedAt, previousPhase3Value, { timeoutMs: 180_000, label: '個別支援計画生成' });
+      await pollSessionField(sessionId, 'assessment', currentStatus.versions.assessment, { timeoutMs: 180_000, label: '個別支援計画生成' });
 
       // Refresh plan data
       const elapsed = ((Date.now() - startTime) / 1000).toFixed(1);
@@ -770,24 +774,18 @@ const SupportPlanCreate: React.FC<SupportPlanCreateProps> = ({ initialSubjectId,
 
       const promptForExecution = editedPrompt !== undefined ? editedPrompt : (storedPrompt ?? undefined);
 
-      // Get current updated_at before starting, to detect actual change
-      const currentSession = await api.getSession(sessionId);
-      const previousUpdatedAt = currentSession.updated_at;
-      const previousFieldValue = phase === 1
-        ? (currentSession as unknown as Record<string, unknown>).fact_extraction_result_v1
-        : phase === 2
-          ? (currentSession as unknown as Record<string, unknown>).fact_structuring_result_v1
-          : (currentSession as unknown as Record<string, unknown>).assessment_result_v1;
+      // Get current result versions before starting, to detect actual change
+      const currentStatus = await api.getSessionStatus(sessionId);
 
       if (phase === 1) {
         await api.triggerPhase1(sessionId, true, modelConfig.provider, modelConfig.model, promptForExecution, false);
-        await pollSessionField(sessionId, 'fact_extraction_result_v1', previousUpdatedAt, previousFieldValue, { timeoutMs: 180_000, label: '事実抽出' });
+        await pollSessionField(sessionId, 'fact_extraction', currentStatus.versions.fact_extraction, { timeoutMs: 180_000, label: '事実抽出' });
       } else if (phase === 2) {
         await api.triggerPhase2(sessionId, true, modelConfig.provider, modelConfig.model, promptForExecution);
-        await pollSessionField(sessionId, 'fact_structuring_result_v1', previousUpdatedAt, previousFieldValue, { timeoutMs: 180_000, label: '事実整理' });
+        await pollSessionField(sessionId, 'fact_structuring', currentStatus.versions.fact_structuring, { timeoutMs: 180_000, label: '事実整理' });
       } else if (phase === 3) {
         await api.triggerPhase3(sessionId, true, modelConfig.provider, modelConfig.model, promptForExecution);
-        await pollSessionField(sessionId, 'assessment_result_v1', previousUpdatedAt, previousFieldValue, { timeoutMs: 180_000, label: '個別支援計画生成' });
+        await pollSessionField(sessionId, 'assessment', currentStatus.versions.assessment, { timeoutMs: 180_000, label: '個別支援計画生成' });
       }
 
       const elapsed = ((Date.now() - startTime) / 1000).toFixed(1);